@@ -2,6 +2,7 @@ import express from 'express';
 import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
+import { registerRouteManifest } from '../lib/routeManifest.js';
 
 // Optional performance packages with fallbacks
 let compression = null;
@@ -109,6 +110,9 @@ app.get('/api/health/detailed', (req, res) => {
   });
 });
 
+// Route manifest for API tracer endpoint discovery
+registerRouteManifest(app, 'api_server');
+
 // 404 handler
 app.use((req, res) => {
   res.status(404).json({ error: 'Not found' });
@@ -3,14 +3,24 @@ NetworkBuster - API Endpoint Tracer Module
 Monitors and traces all API endpoints across services
 """
 
-from flask import Flask, render_template_string, jsonify, request
-import requests
+from flask import Flask, Response, jsonify, request, stream_with_context
+import json
+import os
 import time
 from datetime import datetime
-from collections import defaultdict
 import threading
+from probe_engine import ProbeDeadlineExceeded, ProbeEngine
+from probe_scheduler import ProbeScheduler
+from endpoint_discovery import EndpointDiscovery
+from trace_store import TraceStore
+from tracer_metrics import TracerMetrics, rollup
+from target_inventory import DEFAULT_HOST, InventoryError, TargetInventory, split_target_key, target_key
+from trace_log import TraceLog, parse_time
+from route_manifest import register_route_manifest
+from static_assets import StaticAsset
 
 app = Flask(__name__)
+register_route_manifest(app, 'api_tracer')
 
 # Define all API endpoints to trace
 API_ENDPOINTS = {
@@ -73,38 +83,80 @@ API_ENDPOINTS = {
         'base_url': 'http://localhost:8000',
         'endpoints': [
             {'path': '/', 'method': 'GET', 'description': 'API Tracer dashboard'},
-            {'path': '/api/trace', 'method': 'GET', 'description': 'Get all traces'},
+            {'path': '/api/trace', 'method': 'GET', 'description': 'Get all traces (?since=&until=&service= queries the persistent log)'},
             {'path': '/api/trace/service/<service>', 'method': 'GET', 'description': 'Traces by service'},
+            {'path': '/api/trace/delta', 'method': 'GET', 'description': 'Traces newer than ?cursor='},
+            {'path': '/api/trace/stream', 'method': 'GET', 'description': 'Live trace feed (Server-Sent Events)'},
             {'path': '/api/endpoints', 'method': 'GET', 'description': 'All registered endpoints'},
             {'path': '/api/stats', 'method': 'GET', 'description': 'API call statistics'},
+            {'path': '/api/schedule', 'method': 'GET', 'description': 'Adaptive probe schedule'},
+            {'path': '/api/inventory', 'method': 'GET', 'description': 'Hosts and service instances being traced'},
             {'path': '/health', 'method': 'GET', 'description': 'Health check'},
         ]
     }
 }
 
-# Store traces in memory
-traces = []
-stats = defaultdict(lambda: {'calls': 0, 'success': 0, 'failure': 0, 'avg_time': 0, 'total_time': 0})
+# Store traces in memory (ring buffer, oldest evicted first)
+TRACE_CAPACITY = int(os.environ.get('TRACER_CAPACITY', 10000))
+traces = TraceStore(TRACE_CAPACITY)
+DEFAULT_TRACE_LIMIT = 1000  # Traces per /api/trace response when no limit is given
 
-def trace_endpoint(service, endpoint, base_url):
-    """Trace a single endpoint"""
+# Persistent trace history on disk (survives restarts and /api/trace/clear)
+TRACE_LOG_DIR = os.environ.get('TRACER_LOG_DIR', 'trace_logs')
+trace_log = TraceLog(TRACE_LOG_DIR)
+
+SSE_KEEPALIVE = 15  # Seconds between keepalive comments on idle streams
+metrics = TracerMetrics()  # Per host/service:endpoint counts and p50/p90/p99/max
+
+# Hosts to trace: JSON/YAML inventory mapping hosts to service templates
+TRACER_INVENTORY = os.environ.get('TRACER_INVENTORY', 'tracer_inventory.json')
+inventory = TargetInventory(API_ENDPOINTS, TRACER_INVENTORY,
+                            default_services=[s for s in API_ENDPOINTS if s != 'api_tracer'])
+
+# Probe settings
+TRACE_INTERVAL = 10  # Base seconds between probes of one endpoint
+PROBE_TIMEOUT = 3  # Per-request timeout and default per-service deadline
+PROBE_WORKERS = int(os.environ.get('TRACER_PROBE_WORKERS', 16))  # Minimum probes in flight
+MAX_PROBE_WORKERS = 64  # Worker pool ceiling however many hosts are listed
+PROBES_PER_SECOND = int(os.environ.get('TRACER_PROBES_PER_SECOND', 20))  # Global probe budget
+
+probe_engine = ProbeEngine(max_workers=PROBE_WORKERS, timeout=PROBE_TIMEOUT)
+
+def size_probe_pool():
+    """Scale workers with host count (one keep-alive pool per host) up to the ceiling"""
+    hosts = inventory.describe()['host_count']
+    probe_engine.resize(min(MAX_PROBE_WORKERS, max(PROBE_WORKERS, hosts * probe_engine.pool_size)))
+
+size_probe_pool()
+# Stable endpoints back off toward 2 min, failing/erratic ones speed up to 2 s
+probe_scheduler = ProbeScheduler(base_interval=TRACE_INTERVAL, probes_per_second=PROBES_PER_SECOND)
+
+# Route manifests pulled from each service's /api/routes (ETag-revalidated)
+DISCOVERY_INTERVAL = 60
+discovery = EndpointDiscovery(session_for=probe_engine.session_for, timeout=PROBE_TIMEOUT)
+
+def trace_endpoint(service, endpoint, base_url, host=DEFAULT_HOST, tenant=None, deadline=None):
+    """Trace a single endpoint; None if its deadline passed before it was probed"""
     start_time = time.time()
     trace_entry = {
         'timestamp': datetime.now().isoformat(),
+        'host': host,
+        'tenant': tenant,
         'service': service,
         'endpoint': endpoint['path'],
         'method': endpoint['method'],
-        'url': base_url + endpoint['path'].replace('*', ''),
+        'url': base_url + endpoint.get('probe_path', endpoint['path']),
         'status': None,
         'response_time': None,
         'error': None
     }
     
+    response_time = None
     try:
-        response = requests.request(
+        response = probe_engine.request(
             endpoint['method'],
-            base_url + endpoint['path'].replace('*', ''),
-            timeout=3
+            trace_entry['url'],
+            deadline=deadline
         )
         
         response_time = (time.time() - start_time) * 1000  # Convert to ms
@@ -112,43 +164,91 @@ def trace_endpoint(service, endpoint, base_url):
         trace_entry['response_time'] = round(response_time, 2)
         trace_entry['success'] = 200 <= response.status_code < 300
         
-        # Update stats
-        key = f"{service}:{endpoint['path']}"
-        stats[key]['calls'] += 1
-        if trace_entry['success']:
-            stats[key]['success'] += 1
-        else:
-            stats[key]['failure'] += 1
-        stats[key]['total_time'] += response_time
-        stats[key]['avg_time'] = round(stats[key]['total_time'] / stats[key]['calls'], 2)
-        
+    except ProbeDeadlineExceeded:
+        # Queued until the sweep nearly ran out of time, or timed out only
+        # because the deadline shortened its timeout: not a failure of the
+        # endpoint, so it is left out of every record
+        return None
     except Exception as e:
         trace_entry['error'] = str(e)
         trace_entry['success'] = False
-        key = f"{service}:{endpoint['path']}"
-        stats[key]['calls'] += 1
-        stats[key]['failure'] += 1
     
+    # Each probe thread writes its own counter shard; /api/stats merges them
+    metrics.record(target_key(host, service, endpoint['path']), trace_entry['success'], response_time)
     traces.append(trace_entry)
     
-    # Keep only last 1000 traces
-    if len(traces) > 1000:
-        traces.pop(0)
+    trace_log.append(trace_entry)
     
     return trace_entry
 
+def get_endpoint_catalogue():
+    """Service templates plus routes discovered from the services themselves"""
+    return discovery.merge(inventory.templates())
+
+def get_probe_targets():
+    """List (service, endpoint, base_url, host, tenant) for every GET endpoint on every host
+
+    Only GET endpoints are probed (parameterised paths with sample args):
+    the tracer sends no request bodies, and other methods change state
+    (clearing traces, creating streams). get_unprobed_endpoints() lists
+    what is left out; /api/schedule reports it.
+    """
+    catalogue = get_endpoint_catalogue()
+    targets = []
+    # The default inventory leaves api_tracer out so we don't trace ourselves
+    for host, service, base_url, tenant in inventory.targets():
+        for endpoint in catalogue[service]['endpoints']:
+            if endpoint['method'] == 'GET':
+                targets.append((service, endpoint, base_url, host, tenant))
+    return targets
+
+def get_unprobed_endpoints():
+    """Catalogue endpoints of traced services that are never probed because they are not GET"""
+    catalogue = get_endpoint_catalogue()
+    services = sorted({service for _, service, _, _ in inventory.targets()})
+    return [{'service': service, 'path': endpoint['path'], 'method': endpoint['method'],
+             'description': endpoint.get('description', '')}
+            for service in services for endpoint in catalogue[service]['endpoints']
+            if endpoint['method'] != 'GET']
+
+def discovery_loop():
+    """Periodically refresh route manifests so new routes get traced"""
+    while True:
+        try:
+            # Every host runs the same builds, so one manifest per service is enough
+            discovery.refresh(inventory.first_base_urls())
+        except Exception as e:
+            print(f"⚠️ Endpoint discovery error: {type(e).__name__}: {e}")
+        time.sleep(DISCOVERY_INTERVAL)
+
 def auto_trace_loop():
     """Continuously trace all endpoints"""
     while True:
-        for service, config in API_ENDPOINTS.items():
-            if service == 'api_tracer':  # Don't trace ourselves
-                continue
+        due = []
+        try:
+            targets = {target_key(host, service, endpoint['path']): (service, endpoint, base_url, host, tenant)
+                       for service, endpoint, base_url, host, tenant in get_probe_targets()}
+            probe_scheduler.sync(targets)
             
-            for endpoint in config['endpoints']:
-                if '*' not in endpoint['path']:  # Skip wildcard endpoints
-                    trace_endpoint(service, endpoint, config['base_url'])
-        
-        time.sleep(10)  # Trace every 10 seconds
+            # Probe whatever is due concurrently, round-robin across hosts; each
+            # service's probes share a deadline so a batch finishes within one
+            # timeout window however many hosts are listed (probes still queued
+            # at the deadline are skipped and come back on the next round)
+            due = probe_scheduler.due()
+            if due:
+                results = probe_engine.sweep([target for _, target in due], trace_endpoint)
+                for (key, _), trace_entry in zip(due, results):
+                    if trace_entry is None:
+                        probe_scheduler.release(key)  # Not probed this round
+                    else:
+                        probe_scheduler.report(key, trace_entry)
+        except Exception as e:
+            # Keep tracing; targets popped this round go back on the schedule
+            print(f"⚠️ Auto-trace error: {type(e).__name__}: {e}")
+            for key, _ in due:
+                probe_scheduler.release(key)
+        
+        time.sleep(probe_scheduler.seconds_until_next())
 
 # HTML Dashboard
 TRACER_HTML = """
@@ -393,31 +493,75 @@ TRACER_HTML = """
     </div>
     
     <script>
+        const MAX_ROWS = 1000;
+        let traceRows = [];
+        let cursor = null;
+        let traceStream = null;
+        
+        function renderTraces() {
+            const tbody = document.getElementById('tracesTable');
+            tbody.innerHTML = traceRows.slice(-50).reverse().map(trace => `
+                <tr>
+                    <td>${new Date(trace.timestamp).toLocaleTimeString()}</td>
+                    <td><span class="service-badge">${trace.host && trace.host !== 'localhost' ? trace.host + '/' : ''}${trace.service}</span></td>
+                    <td><span class="method-badge">${trace.method}</span></td>
+                    <td>${trace.endpoint}</td>
+                    <td class="${trace.success ? 'status-success' : 'status-error'}">
+                        ${trace.status || 'ERROR'}
+                    </td>
+                    <td>${trace.response_time ? trace.response_time + 'ms' : 'N/A'}</td>
+                </tr>
+            `).join('');
+            
+            updateStats(traceRows);
+        }
+        
+        function applyDelta(data) {
+            if (data.reset) traceRows = [];
+            if (data.traces.length > 0 || data.reset) {
+                traceRows = traceRows.concat(data.traces).slice(-MAX_ROWS);
+                renderTraces();
+            }
+            cursor = data.next_cursor;
+        }
+        
+        // Full reload: startup, refresh button and after clearing
         async function loadTraces() {
             try {
-                const response = await fetch('/api/trace');
+                const response = await fetch('/api/trace?limit=' + MAX_ROWS);
                 const data = await response.json();
-                
-                const tbody = document.getElementById('tracesTable');
-                tbody.innerHTML = data.traces.slice(-50).reverse().map(trace => `
-                    <tr>
-                        <td>${new Date(trace.timestamp).toLocaleTimeString()}</td>
-                        <td><span class="service-badge">${trace.service}</span></td>
-                        <td><span class="method-badge">${trace.method}</span></td>
-                        <td>${trace.endpoint}</td>
-                        <td class="${trace.success ? 'status-success' : 'status-error'}">
-                            ${trace.status || 'ERROR'}
-                        </td>
-                        <td>${trace.response_time ? trace.response_time + 'ms' : 'N/A'}</td>
-                    </tr>
-                `).join('');
-                
-                updateStats(data.traces);
+                traceRows = data.traces;
+                cursor = data.next_cursor;
+                renderTraces();
+                openStream();
             } catch (error) {
                 console.error('Failed to load traces:', error);
             }
         }
         
+        // Live feed: only new rows are sent after the initial load
+        function openStream() {
+            if (traceStream || !window.EventSource || cursor === null) return;
+            traceStream = new EventSource('/api/trace/stream?cursor=' + cursor);
+            traceStream.addEventListener('traces', e => applyDelta(JSON.parse(e.data)));
+            traceStream.onerror = () => {
+                // Fall back to delta polling until the stream can be reopened
+                traceStream.close();
+                traceStream = null;
+            };
+        }
+        
+        async function pollDelta() {
+            if (traceStream || cursor === null) return;
+            try {
+                const response = await fetch('/api/trace/delta?cursor=' + cursor);
+                applyDelta(await response.json());
+                openStream();
+            } catch (error) {
+                console.error('Failed to load trace delta:', error);
+            }
+        }
+        
         async function loadEndpoints() {
             try {
                 const response = await fetch('/api/endpoints');
@@ -474,58 +618,158 @@ TRACER_HTML = """
             }
         }
         
-        // Auto-refresh every 5 seconds
+        // Stream new traces; poll deltas every 5 seconds if the stream drops
         loadTraces();
         loadEndpoints();
-        setInterval(loadTraces, 5000);
+        setInterval(pollDelta, 5000);
     </script>
 </body>
 </html>
 """
 
+TRACER_PAGE = StaticAsset(TRACER_HTML)
+
 @app.route('/')
 def index():
-    return render_template_string(TRACER_HTML)
+    return TRACER_PAGE.response()
 
 @app.route('/api/trace')
 def get_traces():
+    limit = request.args.get('limit', type=int)
+    limit = DEFAULT_TRACE_LIMIT if limit is None else max(0, limit)
+    
+    # Time-range or service queries are answered from the on-disk log
+    # (the newest matches when no since is given)
+    if any(arg in request.args for arg in ('since', 'until', 'service')):
+        try:
+            since = parse_time(request.args.get('since'))
+            until = parse_time(request.args.get('until'))
+        except ValueError as e:
+            return jsonify({'error': f'Invalid time: {e}'}), 400
+        logged_traces = trace_log.query(since, until, request.args.get('service'), limit)
+        return jsonify({
+            'traces': logged_traces,
+            'count': len(logged_traces),
+            'since': since,
+            'until': until,
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    recent_traces, next_cursor = traces.tail(min(limit, traces.capacity))
     return jsonify({
-        'traces': traces,
-        'count': len(traces),
+        'traces': recent_traces,
+        'count': len(recent_traces),
+        'total': len(traces),
+        'capacity': traces.capacity,
+        'next_cursor': next_cursor,
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/trace/delta')
+def get_trace_delta():
+    """Traces newer than a cursor (sequence number) from a previous call"""
+    cursor = request.args.get('cursor', type=int)
+    if cursor is None:
+        cursor = traces.next_seq
+    new_traces, next_cursor, reset = traces.since(cursor, request.args.get('limit', type=int))
+    return jsonify({
+        'traces': new_traces,
+        'count': len(new_traces),
+        'next_cursor': next_cursor,
+        'reset': reset,
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/trace/stream')
+def stream_traces():
+    """Server-Sent Events feed that pushes only new traces to each client"""
+    # EventSource reconnects send Last-Event-ID, which is our cursor
+    cursor = request.headers.get('Last-Event-ID', type=int)
+    if cursor is None:
+        cursor = request.args.get('cursor', type=int)
+    if cursor is None:
+        cursor = traces.next_seq
+    
+    def events(cursor):
+        while True:
+            new_traces, next_cursor, reset = traces.wait_since(cursor, timeout=SSE_KEEPALIVE)
+            if new_traces or reset:
+                payload = json.dumps({'traces': new_traces, 'next_cursor': next_cursor, 'reset': reset})
+                yield f"id: {next_cursor}\nevent: traces\ndata: {payload}\n\n"
+            else:
+                yield ": keepalive\n\n"
+            cursor = next_cursor
+    
+    return Response(stream_with_context(events(cursor)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/trace/service/<service>')
 def get_service_traces(service):
-    service_traces = [t for t in traces if t['service'] == service]
+    limit = request.args.get('limit', type=int)
+    service_traces = traces.recent_for_service(service, limit)
     return jsonify({
         'service': service,
         'traces': service_traces,
-        'count': len(service_traces)
+        'count': len(service_traces),
+        'total': traces.count_for_service(service)
     })
 
 @app.route('/api/endpoints')
 def get_endpoints():
+    catalogue = get_endpoint_catalogue()
     return jsonify({
-        'endpoints': API_ENDPOINTS,
-        'total': sum(len(config['endpoints']) for config in API_ENDPOINTS.values())
+        'endpoints': catalogue,
+        'total': sum(len(config['endpoints']) for config in catalogue.values()),
+        'discovery': discovery.status()
     })
 
 @app.route('/api/stats')
 def get_stats():
+    snapshot = metrics.snapshot()
     return jsonify({
-        'stats': dict(stats),
+        'stats': snapshot,
+        'by_host': rollup(snapshot, lambda key: split_target_key(key)[0]),
+        'by_service': rollup(snapshot, lambda key: split_target_key(key)[1]),
         'total_traces': len(traces),
         'services': len(API_ENDPOINTS),
+        'hosts': inventory.describe()['host_count'],
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/schedule')
+def get_schedule():
+    """Adaptive probe schedule: current interval and next probe per endpoint (plus non-GET endpoints never probed)"""
+    schedule = probe_scheduler.snapshot()
+    unprobed = get_unprobed_endpoints()
+    return jsonify({
+        'schedule': schedule,
+        'count': len(schedule),
+        'not_probed': unprobed,
+        'not_probed_count': len(unprobed),
+        'probes_per_second': probe_scheduler.probes_per_second,
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/inventory')
+def get_inventory():
+    """Hosts, tenants and service base URLs currently traced"""
+    return jsonify(inventory.describe())
+
+@app.route('/api/inventory/reload', methods=['POST'])
+def reload_inventory():
+    """Re-read the inventory file; the old inventory stays active on error"""
+    try:
+        described = inventory.reload()
+    except InventoryError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    size_probe_pool()
+    return jsonify({'success': True, 'inventory': described, 'probe_workers': probe_engine.max_workers})
+
 @app.route('/api/trace/clear', methods=['POST'])
 def clear_traces():
-    global traces, stats
-    traces = []
-    stats = defaultdict(lambda: {'calls': 0, 'success': 0, 'failure': 0, 'avg_time': 0, 'total_time': 0})
-    return jsonify({'success': True, 'message': 'Traces cleared'})
+    traces.clear()
+    metrics.reset()
+    return jsonify({'success': True, 'message': 'Traces cleared (persistent log kept)'})
 
 @app.route('/health')
 def health():
@@ -547,7 +791,11 @@ if __name__ == '__main__':
     # Start auto-trace thread
     trace_thread = threading.Thread(target=auto_trace_loop, daemon=True)
     trace_thread.start()
-    print("🔍 Auto-trace thread started (10s interval)")
+    print(f"🔍 Auto-trace thread started (adaptive {TRACE_INTERVAL}s base interval, {PROBES_PER_SECOND} probes/s budget)")
+    
+    discovery_thread = threading.Thread(target=discovery_loop, daemon=True)
+    discovery_thread.start()
+    print(f"🧭 Endpoint discovery started ({DISCOVERY_INTERVAL}s refresh)")
     
     print("🚀 Starting API Tracer on http://localhost:8000")
     print("⚡ Monitoring all NetworkBuster API endpoints")
@@ -0,0 +1,95 @@
+"""
+NetworkBuster - Background Scanner
+Runs expensive scans on an interval and publishes immutable snapshots for request handlers
+"""
+
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+SCAN_INTERVAL = 5.0  # Seconds between scans
+
+ScanSnapshot = namedtuple('ScanSnapshot', ['generation', 'taken_at', 'duration_ms', 'results'])
+
+
+class BackgroundScanner:
+    """Calls scan() every interval seconds on a daemon thread
+
+    scan() returns a dict of results; it is wrapped read-only and published
+    as a new ScanSnapshot by swapping one reference, so readers never lock
+    and always see a complete scan. Nested values are shared with readers
+    and must not be mutated after scan() returns. A failing scan keeps the
+    previous snapshot and is reported through last_error.
+    """
+
+    def __init__(self, scan, interval=SCAN_INTERVAL, name='background-scanner'):
+        self.scan = scan
+        self.interval = interval
+        self.name = name
+        self.last_error = None
+        self._snapshot = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the scan thread (idempotent)"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.scan_once()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def scan_once(self):
+        """Run one scan now and publish it; returns the new snapshot (or None on error)"""
+        started = time.perf_counter()
+        try:
+            results = self.scan()
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return None
+        previous = self._snapshot
+        snapshot = ScanSnapshot(
+            generation=previous.generation + 1 if previous else 1,
+            taken_at=time.time(),
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            results=MappingProxyType(results)
+        )
+        self._snapshot = snapshot
+        self.last_error = None
+        self._ready.set()
+        return snapshot
+
+    def latest(self, wait=None):
+        """Most recent snapshot; waits up to wait seconds for the first one"""
+        snapshot = self._snapshot
+        if snapshot is None and wait:
+            self.start()
+            self._ready.wait(wait)
+            snapshot = self._snapshot
+        return snapshot
+
+    def status(self):
+        snapshot = self._snapshot
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'interval': self.interval,
+            'generation': snapshot.generation if snapshot else 0,
+            'taken_at': snapshot.taken_at if snapshot else None,
+            'duration_ms': snapshot.duration_ms if snapshot else None,
+            'last_error': self.last_error
+        }
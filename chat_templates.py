@@ -0,0 +1,257 @@
+"""
+NetworkBuster - Chat Response Templates
+Precompiled HTML fragments for AI chat replies, rendered from each intent's structured data
+"""
+
+from html import escape
+
+THREATS_SHOWN = 5  # Threat cards rendered in the HTML reply
+
+TAG_COLORS = {
+    'blocked': '#ef4444', 'threat': '#dc2626', 'suspicious': '#f59e0b',
+    'internal': '#3b82f6', 'trusted': '#22c55e', 'unknown': '#6b7280'
+}
+STATUS_COLORS = {'BLOCKED': '#ef4444', 'WARNING': '#f59e0b'}
+
+HELP_COMMANDS = [
+    ('system status', 'Check all services with indexed analysis'),
+    ('network scan', 'Analyze connections and protocols'),
+    ('health report', 'Comprehensive system metrics'),
+    ('security check', 'AI microdevice barrier scan 🛡️'),
+    ('diagnose', 'Troubleshoot issues'),
+    ('optimize', 'Performance tips'),
+    ('help', 'Show this message'),
+]
+
+# Static text is joined once at import. Dynamic fragments are single
+# f-strings, which compile to one string build instead of a chain of +=.
+
+DIAGNOSE_HEALTHY = (
+    "🔍 <strong>Diagnostic Report</strong><br><br>"
+    "✅ All services are running correctly!<br><br>"
+    "No issues detected. System is healthy."
+)
+DIAGNOSE_ACTIONS = (
+    "<strong>Recommended Actions:</strong><br>"
+    "1. Run <code>AUTOSTART.bat</code> to start all services<br>"
+    "2. Or use <code>nb-start</code> PowerShell command<br>"
+    "3. Check logs for any error messages<br><br>"
+    "<strong>Inactive Services:</strong><br>"
+)
+
+OPTIMIZE_TIPS = (
+    "⚡ <strong>Optimization Recommendations</strong><br><br>"
+    "<strong>Performance Tuning:</strong><br>"
+    "• Run <code>nb-autostart</code> for boot optimization<br>"
+    "• Enable high-performance power plan<br>"
+    "• Close unused background applications<br>"
+    "• Clear browser cache and temporary files<br>"
+    "• Run <code>flash_git_backup.py</code> to free space<br><br>"
+)
+
+SECURITY_NO_THREATS = "<strong>✅ NO THREATS DETECTED</strong><br>All devices are within normal parameters.<br>"
+SECURITY_FOOTER = (
+    "<br><strong>🔐 SECURITY STATUS:</strong><br>"
+    "• AI Barrier: <strong style='color:#22c55e'>ACTIVE</strong><br>"
+    "• Pattern Recognition: <strong>ENABLED</strong><br>"
+    "• Real-time Monitoring: <strong>ONLINE</strong><br>"
+    "• Historical Device Library: <strong>TRACKING</strong><br>"
+    "• Device Tagging System: <strong>OPERATIONAL</strong><br>"
+    "• Reputation Scoring: <strong>ACTIVE</strong><br>"
+    "• Indexed Threat Database: <strong>O(1) lookup</strong><br>"
+    "• CORS Protection: <strong>ENABLED</strong><br>"
+    "• Localhost Isolation: <strong>ACTIVE</strong><br><br>"
+    "<strong>📋 RECOMMENDATIONS:</strong><br>"
+    "• Monitor blocked devices regularly<br>"
+    "• Run <code>security check</code> periodically<br>"
+    "• Review historical device library<br>"
+    "• Check device tags and reputation scores<br>"
+    "• Review serialization attempt logs<br>"
+    "• Keep firewall rules updated<br>"
+    "<br><code>AI barrier with persistent historical library</code>"
+)
+
+HELP_REPLY = (
+    "📚 <strong>NetworkBuster AI Commands</strong><br><br>"
+    "<strong>Available Commands:</strong><br>"
+    + ''.join(f"• <code>{command}</code> - {description}<br>" for command, description in HELP_COMMANDS)
+    + "<br>You can also ask questions in natural language!"
+)
+
+DEFAULT_CAPABILITIES = (
+    "I'm NetworkBuster AI with <strong>Historical Device Library</strong>, specialized in:<br><br>"
+    "• System status and service health<br>"
+    "• Network analysis and connectivity<br>"
+    "• Performance optimization<br>"
+    "• Security with device tagging & tracking 🏷️<br>"
+    "• Microdevice threat detection 🛡️<br>"
+    "• Historical pattern analysis 📚<br><br>"
+    "Type <code>help</code> to see all available commands!"
+)
+
+
+def render_status(d):
+    parts = [
+        "📊 <strong>SUPERCOMPUTER SYSTEM ANALYSIS</strong><br>"
+        f"<code>Scan completed in {d['scan_time_ms']:.3f}ms</code><br><br>"
+        f"✅ <strong>SERVICE STATUS: {d['active_count']}/{d['total']} OPERATIONAL</strong><br><br>"
+    ]
+    if d['critical_down']:
+        parts.append("<strong>⚠️ CRITICAL SERVICES DOWN:</strong><br>")
+        parts.extend(f"• <code style='color:#ef4444'>{s['name']}</code> (Port {s['port']}) - CRITICAL OFFLINE<br>"
+                     for s in d['critical_down'])
+        parts.append("<br>")
+    if d['active_count']:
+        parts.append("<strong>🟢 ACTIVE SERVICES:</strong><br>")
+        if d['node_services']:
+            parts.append("<em>Node.js Services:</em><br>")
+            parts.extend(f"• <code>{s['name']}</code> → Port {s['port']} → ONLINE<br>" for s in d['node_services'])
+        if d['python_services']:
+            parts.append("<em>Python Services:</em><br>")
+            parts.extend(f"• <code>{s['name']}</code> → Port {s['port']} → ONLINE{' 🔴' if s.get('critical') else ''}<br>"
+                         for s in d['python_services'])
+    if d['inactive'] and not d['critical_down']:
+        parts.append(f"<br><strong>⚪ INACTIVE SERVICES ({len(d['inactive'])}):</strong><br>")
+        parts.extend(f"• <code>{s['name']}</code> (Port {s['port']}) - Standby<br>" for s in d['inactive'])
+    parts.append("<br><code>Index lookup time: O(1) constant time</code>")
+    return ''.join(parts)
+
+
+def render_network(d):
+    parts = [
+        "🌐 <strong>SUPERCOMPUTER NETWORK ANALYSIS</strong><br>"
+        f"<code>Analysis time: {d['analysis_time_ms']}ms</code><br><br>"
+        "<strong>📊 CONNECTION METRICS:</strong><br>"
+        f"• Total Connections: <strong>{d['total_connections']}</strong><br>"
+        f"• Listening Ports: <strong>{d['listening_ports']}</strong><br>"
+        f"• Established: <strong>{d['established']}</strong><br><br>"
+        "<strong>🔌 PROTOCOL DISTRIBUTION:</strong><br>"
+    ]
+    parts.extend(f"• {protocol}: <strong>{count}</strong> connections<br>"
+                 for protocol, count in d['protocol_distribution'].items())
+    if d['top_statuses']:
+        parts.append("<br><strong>📍 CONNECTION STATUS INDEX:</strong><br>")
+        parts.extend(f"• <code>{s['status']}</code>: {s['count']}<br>" for s in d['top_statuses'])
+    if d['service_ports']:
+        parts.append("<br><strong>🔌 SERVICE PORT USAGE:</strong><br>")
+        parts.extend(f"• Port {p['port']} (<code>{p['service']}</code>): {p['count']} connections<br>"
+                     for p in d['service_ports'])
+    parts.append("<br><code>Indexed lookup performance: O(1) hash table</code>")
+    return ''.join(parts)
+
+
+def render_health(d):
+    load = d['load_average']
+    parts = [
+        "💪 <strong>SUPERCOMPUTER HEALTH ANALYSIS</strong><br>"
+        f"<code>Metrics cached | Query time: {d['analysis_time_ms']}ms</code><br><br>"
+        "<strong>⚡ CPU METRICS:</strong><br>"
+        f"• Usage: <strong>{d['cpu_usage']}%</strong> ({d['cpu_window_seconds']}s avg, peak {d['cpu_max']}%)<br>"
+        f"• Cores: <strong>{d['cpu_cores']}</strong> physical / <strong>{d['cpu_threads']}</strong> logical<br>"
+        f"• Frequency: <strong>{d['cpu_frequency_mhz']} MHz</strong><br><br>"
+        "<strong>💾 MEMORY ANALYSIS:</strong><br>"
+        f"• RAM Usage: <strong>{d['memory_usage']}%</strong><br>"
+        f"• Used: <strong>{d['memory_used_gb']} GB</strong> / Total: <strong>{d['memory_total_gb']} GB</strong><br>"
+        f"• Available: <strong>{d['memory_available_gb']} GB</strong><br>"
+        f"• Swap: <strong>{d['swap_usage']}%</strong> ({d['swap_total_gb']} GB)<br><br>"
+        "<strong>💿 DISK I/O METRICS:</strong><br>"
+        f"• Usage: <strong>{d['disk_usage']}%</strong><br>"
+        f"• Free Space: <strong>{d['disk_free_gb']} GB</strong> / <strong>{d['disk_total_gb']} GB</strong><br>"
+        f"• Read: <strong>{d['disk_read_mb']} MB</strong> | Write: <strong>{d['disk_write_mb']} MB</strong><br><br>"
+        "<strong>🌐 NETWORK I/O:</strong><br>"
+        f"• Sent: <strong>{d['network_sent_mb']} MB</strong><br>"
+        f"• Received: <strong>{d['network_recv_mb']} MB</strong><br><br>"
+        "<strong>📊 SYSTEM LOAD:</strong><br>"
+        f"• Active Processes: <strong>{d['process_count']}</strong><br>",
+        f"• Load Average: <strong>{load[0]}</strong> (1m) / <strong>{load[1]}</strong> (5m) / "
+        f"<strong>{load[2]}</strong> (15m)<br><br>" if load[0] > 0 else "<br>"
+    ]
+    parts.extend(f"⚠️ <strong>{w['title']}</strong> - {w['advice']}<br>" for w in d['warnings'])
+    if d['optimal']:
+        parts.append("✅ <strong>System operating at optimal performance!</strong><br>")
+    parts.append("<br><code>Metrics cached with 5s TTL for performance</code>")
+    return ''.join(parts)
+
+
+def render_diagnose(d):
+    if d['healthy']:
+        return DIAGNOSE_HEALTHY
+    return ''.join([
+        f"🔍 <strong>Diagnostic Report</strong><br><br>⚠️ <strong>{len(d['inactive'])} Service(s) Not Running</strong><br><br>",
+        DIAGNOSE_ACTIONS,
+        *(f"• {s['name']} (Port {s['port']})<br>" for s in d['inactive'])
+    ])
+
+
+def render_optimize(d):
+    if d['balanced']:
+        return OPTIMIZE_TIPS + "✅ System resources are well-balanced!"
+    return OPTIMIZE_TIPS + "💡 Consider restarting services during low-usage periods."
+
+
+def render_threat(threat):
+    """One threat card"""
+    status_color = STATUS_COLORS.get(threat['status'], '#f59e0b')
+    tag = threat.get('tag') or 'unknown'
+    reasons = ''.join([f"  • {reason}<br>" for reason in threat['reasons']])
+    return (
+        "<div style='margin: 10px 0; padding: 10px; background: rgba(0,0,0,0.3); "
+        f"border-left: 3px solid {status_color}; border-radius: 5px;'>"
+        f"<strong style='color:{status_color}'>{threat['status']}</strong> | IP: <code>{threat['ip']}</code> "
+        f"| Tag: <span style='color:{TAG_COLORS.get(tag, '#6b7280')}'>🏷️ {tag.upper()}</span><br>"
+        f"Threat Score: <strong>{threat['threat_score']}/100</strong><br>"
+        f"Connections: {threat['connections']} | Ports: {threat['unique_ports']}<br>"
+        f"<em>Reasons:</em><br>{reasons}"
+        f"<strong>Action:</strong> {threat['action']}<br>"
+        "</div>"
+    )
+
+
+def render_security(d):
+    parts = [
+        "🔒 <strong>AI SECURITY BARRIER ANALYSIS</strong><br>"
+        f"<code>Deep scan completed in {d['analysis_time_ms']}ms | {d['scan_age_seconds']:.1f}s ago</code><br><br>"
+        "<strong>🛡️ MICRODEVICE DETECTION:</strong><br>"
+        f"• Total Devices Scanned: <strong>{d['total_devices']}</strong><br>"
+        f"• Threats Detected: <strong>{d['threat_count']}</strong><br>"
+        f"• Blocked Devices: <strong>{d['blocked_count']}</strong><br>"
+        f"• Serialization Attempts Logged: <strong>{d['total_attempts_logged']}</strong><br>"
+        f"• Historical Library Size: <strong>{d['library_size']}</strong> devices<br>"
+        f"• Tagged Devices: <strong>{d['tagged_devices']}</strong><br><br>"
+    ]
+    if d['threats']:
+        parts.append("<strong>⚠️ ACTIVE THREATS:</strong><br>")
+        parts.extend(map(render_threat, d['threats'][:THREATS_SHOWN]))
+        hidden = d['threat_count'] - THREATS_SHOWN
+        if hidden > 0:
+            parts.append(f"<em>...and {hidden} more threats</em><br>")
+    else:
+        parts.append(SECURITY_NO_THREATS)
+    parts.append(SECURITY_FOOTER)
+    return ''.join(parts)
+
+
+def render_help(d):
+    return HELP_REPLY
+
+
+def render_default(d):
+    # The query is the only user-supplied text that reaches a reply
+    return f"🤔 I understand you're asking about: <em>{escape(d['query'])}</em><br><br>{DEFAULT_CAPABILITIES}"
+
+
+RENDERERS = {
+    'status': render_status,
+    'network': render_network,
+    'health': render_health,
+    'diagnose': render_diagnose,
+    'optimize': render_optimize,
+    'security': render_security,
+    'help': render_help,
+    'default': render_default,
+}
+
+
+def render(intent, data):
+    """HTML reply for an intent's structured data"""
+    return RENDERERS[intent](data)
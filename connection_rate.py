@@ -0,0 +1,112 @@
+"""
+NetworkBuster - Connection Rate Tracker
+Per-device new-connection counts over a sliding window of per-minute buckets
+"""
+
+import time
+from collections import OrderedDict
+
+RATE_WINDOW = 300  # Seconds of activity that count towards a device's rate
+RATE_BUCKET = 60  # Bucket width in seconds
+MAX_TRACKED_DEVICES = 50000
+
+
+class _DeviceRate:
+    """Ring of (bucket id, new connections) plus open connections and recently used local ports"""
+
+    __slots__ = ('first_seen', 'last_seen', 'buckets', 'counts', 'open', 'ports')
+
+    def __init__(self, now):
+        self.first_seen = now
+        self.last_seen = now
+        self.buckets = []
+        self.counts = []
+        self.open = set()  # Connection keys seen in the previous scan
+        self.ports = {}  # local port -> last bucket it was seen in
+
+
+class ConnectionRateTracker:
+    """Sliding-window connection activity per remote IP
+
+    Each bucket counts the connections a device opened during that minute:
+    a connection is new when its key (local port, remote port) was not open
+    in the device's previous scan. The rate does not depend on how often the
+    scanner runs, and a steady pool of keep-alive connections is counted
+    once rather than on every scan. Ports and devices not seen within the
+    window are dropped, keeping memory bounded.
+    """
+
+    def __init__(self, window=RATE_WINDOW, bucket_seconds=RATE_BUCKET, max_devices=MAX_TRACKED_DEVICES):
+        self.bucket_seconds = bucket_seconds
+        self.span = max(1, int(window // bucket_seconds))  # Buckets per window
+        self.max_devices = max_devices
+        self._devices = OrderedDict()  # Least recently seen first
+
+    def _oldest_bucket(self, now):
+        return int(now // self.bucket_seconds) - self.span + 1
+
+    def record(self, ip, connection_keys, ports, now=None):
+        """Add one scan's open connections of ip; returns its new connections over the window"""
+        now = time.time() if now is None else now
+        bucket = int(now // self.bucket_seconds)
+        device = self._devices.get(ip)
+        if device is None:
+            device = self._devices[ip] = _DeviceRate(now)
+            if len(self._devices) > self.max_devices:
+                self._devices.popitem(last=False)
+        else:
+            self._devices.move_to_end(ip)
+        device.last_seen = now
+
+        opened = len(connection_keys - device.open)
+        device.open = connection_keys
+        if device.buckets and device.buckets[-1] == bucket:
+            device.counts[-1] += opened
+        else:
+            device.buckets.append(bucket)
+            device.counts.append(opened)
+            self._expire(device, bucket - self.span + 1)
+        for port in ports:
+            device.ports[port] = bucket
+        return sum(device.counts)
+
+    def _expire(self, device, oldest):
+        drop = 0
+        while drop < len(device.buckets) and device.buckets[drop] < oldest:
+            drop += 1
+        if drop:
+            del device.buckets[:drop]
+            del device.counts[:drop]
+        if len(device.ports) > 16:
+            device.ports = {port: seen for port, seen in device.ports.items() if seen >= oldest}
+
+    def rate(self, ip, now=None):
+        """New connections ip opened within the window (0 if unknown)"""
+        device = self._devices.get(ip)
+        if device is None:
+            return 0
+        oldest = self._oldest_bucket(time.time() if now is None else now)
+        return sum(count for bucket, count in zip(device.buckets, device.counts) if bucket >= oldest)
+
+    def ports(self, ip, now=None):
+        """Local ports ip used within the window"""
+        device = self._devices.get(ip)
+        if device is None:
+            return set()
+        oldest = self._oldest_bucket(time.time() if now is None else now)
+        return {port for port, seen in device.ports.items() if seen >= oldest}
+
+    def prune(self, now=None):
+        """Forget devices with no activity inside the window"""
+        cutoff = (time.time() if now is None else now) - self.span * self.bucket_seconds
+        while self._devices:
+            ip, device = next(iter(self._devices.items()))
+            if device.last_seen >= cutoff:
+                break
+            del self._devices[ip]
+
+    def __len__(self):
+        return len(self._devices)
+
+    def __contains__(self, ip):
+        return ip in self._devices
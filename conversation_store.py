@@ -0,0 +1,335 @@
+"""
+NetworkBuster - Conversation Store
+Append-only SQLite (WAL) chat history with per-session index, per-day counters and full-text search
+"""
+
+import html
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_PATH = 'networkbuster_conversations.db'
+LEGACY_JSON = 'networkbuster_conversations.json'
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_SEARCH_RESULTS = 100
+RANK_CANDIDATES = 2000  # Very common terms: rank only this many of the newest matches (reported as truncated)
+SNIPPET_CHARS = 160
+
+_TAG = re.compile(r'<[^>]+>')
+# Words, plus dotted/colon compounds such as 10.0.0.5 or 10.0.0.5:3000 kept whole
+_TOKEN = re.compile(r'[^\W_]+(?:[.:][^\W_]+)*')
+# Query prefix forms: "10.x", "10.*", "thr*"
+_WILDCARD = re.compile(r'^(.*?[^\W_])(?:\.(?:x|\*)|\*)+$')
+# Bare partial addresses ("192.168", "10.0.0.") are searched as prefixes
+_PARTIAL_IP = re.compile(r'^\d{1,3}(?:\.\d{1,3}){1,2}\.?$|^\d{1,3}\.$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    session TEXT NOT NULL,
+    user_message TEXT NOT NULL,
+    ai_response TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_session ON conversations(session, id);
+
+-- Exchanges per session day, kept up to date by every append
+CREATE TABLE IF NOT EXISTS conversation_days (
+    session TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Inverted index over normalized text; rowid is the conversation id. Contentless:
+# the text lives in conversations, the index only holds postings.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS conversation_index USING fts5(
+    user_terms, response_terms, content='', tokenize="porter unicode61 tokenchars '.:'"
+);
+"""
+
+
+def strip_html(text):
+    """Plain text of an HTML fragment (AI responses are HTML)"""
+    return html.unescape(_TAG.sub(' ', text or ''))
+
+
+def index_terms(text):
+    """Normalized, space-separated tokens for the index
+
+    Lowercased words with punctuation dropped; dotted/colon compounds are
+    kept whole and also split, so 10.0.0.5:3000 matches 10.0.0.5 and 3000.
+    """
+    terms = []
+    for token in _TOKEN.findall(strip_html(text).lower()):
+        terms.append(token)
+        if ':' in token:
+            terms.extend(token.split(':'))
+    return ' '.join(terms)
+
+
+def query_terms(query):
+    """[(term, is_prefix)] from a search query; 10.x, 10.*, thr* and partial IPs like 192.168 are prefixes"""
+    terms = []
+    for raw in query.lower().split():
+        wildcard = _WILDCARD.match(raw)
+        if wildcard:
+            stem = wildcard.group(1)
+            terms.append((stem + '.' if raw[len(stem)] == '.' else stem, True))
+        elif _PARTIAL_IP.match(raw):
+            terms.append((raw, True))
+        else:
+            terms.extend((token, False) for token in _TOKEN.findall(raw))
+    return terms
+
+
+def match_expression(terms):
+    """FTS5 MATCH expression requiring every term"""
+    return ' AND '.join('"%s"%s' % (term.replace('"', '""'), '*' if prefix else '') for term, prefix in terms)
+
+
+def _snippet(text, terms):
+    """Window of plain text around the first matching term"""
+    plain = ' '.join(strip_html(text).split())
+    lower = plain.lower()
+    hits = [i for i in (lower.find(t) for t in terms) if i >= 0]
+    start = max(0, min(hits) - SNIPPET_CHARS // 4) if hits else 0
+    snippet = plain[start:start + SNIPPET_CHARS]
+    return ('…' if start else '') + snippet + ('…' if start + SNIPPET_CHARS < len(plain) else '')
+
+
+class ConversationStore:
+    """Chat exchanges appended one row at a time, read newest first in pages
+
+    An append is one INSERT plus one counter upsert and its search
+    postings in a single transaction, so its cost does not grow with the
+    history. Pages are keyed by the last id seen (a cursor) rather than an
+    offset. Without FTS5 in the sqlite build, search falls back to a scan.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._local = threading.local()
+        try:
+            self._writer.executescript(SEARCH_SCHEMA)
+            self.search_enabled = True
+        except sqlite3.OperationalError:
+            self.search_enabled = False
+        if self.search_enabled:
+            self._catch_up_index()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+
+    def _reader(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _insert(self, conn, entries):
+        first_id = conn.execute('SELECT coalesce(max(id), 0) + 1 FROM conversations').fetchone()[0]
+        conn.executemany(
+            'INSERT INTO conversations (id, timestamp, session, user_message, ai_response) VALUES (?, ?, ?, ?, ?)',
+            [(first_id + i, e['timestamp'], e['session'], e['user_message'], e['ai_response'])
+             for i, e in enumerate(entries)])
+        if self.search_enabled:
+            self._index(conn, ((first_id + i, e['user_message'], e['ai_response']) for i, e in enumerate(entries)))
+        days = {}
+        for e in entries:
+            days[e['session']] = days.get(e['session'], 0) + 1
+        conn.executemany(
+            'INSERT INTO conversation_days (session, count) VALUES (?, ?) '
+            'ON CONFLICT(session) DO UPDATE SET count = count + excluded.count', days.items())
+
+    def append(self, user_message, ai_response, now=None):
+        """Store one exchange; returns it with its id"""
+        moment = datetime.fromtimestamp(time.time() if now is None else now)
+        entry = {
+            'timestamp': moment.isoformat(),
+            'user_message': user_message,
+            'ai_response': ai_response,
+            'session': moment.strftime('%Y-%m-%d')
+        }
+        with self._write_lock:
+            self._writer.execute('BEGIN IMMEDIATE')
+            try:
+                self._insert(self._writer, [entry])
+                entry['id'] = self._writer.execute('SELECT max(id) FROM conversations').fetchone()[0]
+            except BaseException:
+                self._writer.execute('ROLLBACK')
+                raise
+            self._writer.execute('COMMIT')
+        return entry
+
+    def _index(self, conn, rows):
+        conn.executemany(
+            'INSERT INTO conversation_index (rowid, user_terms, response_terms) VALUES (?, ?, ?)',
+            ((cid, index_terms(user_message), index_terms(ai_response)) for cid, user_message, ai_response in rows))
+
+    def _catch_up_index(self):
+        """Index rows appended before search existed (or by an older build)"""
+        with self._write_lock:
+            indexed = self._writer.execute('SELECT coalesce(max(rowid), 0) FROM conversation_index').fetchone()[0]
+            rows = self._writer.execute('SELECT id, user_message, ai_response FROM conversations WHERE id > ?',
+                                        (indexed,)).fetchall()
+            if rows:
+                self._writer.execute('BEGIN IMMEDIATE')
+                try:
+                    self._index(self._writer, rows)
+                except BaseException:
+                    self._writer.execute('ROLLBACK')
+                    raise
+                self._writer.execute('COMMIT')
+
+    def search(self, query, limit=20, recent=False):
+        """Exchanges matching every term in query, best match first (or newest first if recent)
+
+        Returns (hits, truncated); truncated is True when the query matched
+        more than RANK_CANDIDATES exchanges and only the newest of them were
+        ranked.
+        """
+        limit = max(1, min(int(limit), MAX_SEARCH_RESULTS))
+        parsed = query_terms(query)
+        if not parsed:
+            return [], False
+        terms = [term for term, _ in parsed]
+        conn = self._reader()
+        truncated = False
+        if self.search_enabled:
+            match = match_expression(parsed)
+            floor = 0
+            if not recent:
+                # bm25 is lower-is-better; the user's own words weigh double. Scoring
+                # every match of a term found in most exchanges is slow, so ranking
+                # is limited to the newest RANK_CANDIDATES matches.
+                cutoff = conn.execute(
+                    'SELECT rowid FROM conversation_index WHERE conversation_index MATCH ? '
+                    'ORDER BY rowid DESC LIMIT 1 OFFSET ?', (match, RANK_CANDIDATES)).fetchone()
+                if cutoff is not None:
+                    floor = cutoff[0] + 1
+                    truncated = True
+            order = 'rowid DESC' if recent else 'rank'
+            rows = conn.execute(
+                'SELECT c.id, c.timestamp, c.session, c.user_message, c.ai_response, r.rank FROM '
+                '(SELECT rowid, bm25(conversation_index, 2.0, 1.0) AS rank FROM conversation_index '
+                ' WHERE conversation_index MATCH :match AND rowid >= :floor '
+                f' ORDER BY {order} LIMIT :limit) r '
+                f'JOIN conversations c ON c.id = r.rowid ORDER BY {"c.id DESC" if recent else "r.rank, c.id DESC"}',
+                {'match': match, 'floor': floor, 'limit': limit}).fetchall()
+        else:
+            clause = ' AND '.join(['(lower(user_message) LIKE ? OR lower(ai_response) LIKE ?)'] * len(terms))
+            params = [p for t in terms for p in (f'%{t}%', f'%{t}%')]
+            rows = conn.execute(
+                'SELECT id, timestamp, session, user_message, ai_response, 0 AS rank FROM conversations '
+                f'WHERE {clause} ORDER BY id DESC LIMIT ?', params + [limit]).fetchall()
+        hits = []
+        for row in rows:
+            hit = dict(row)
+            hit['score'] = round(-hit.pop('rank'), 4)
+            hit['snippet'] = _snippet(hit['ai_response'], terms)
+            hits.append(hit)
+        return hits, truncated
+
+    def page(self, cursor=None, limit=DEFAULT_PAGE_SIZE, session=None, since=None):
+        """Newest-first exchanges older than cursor; returns (entries, next_cursor)
+
+        session limits the page to one day (uses the per-session index);
+        since ('YYYY-MM-DD') to that day and later.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        clauses, params = [], []
+        if cursor is not None:
+            clauses.append('id < ?')
+            params.append(int(cursor))
+        if session is not None:
+            clauses.append('session = ?')
+            params.append(session)
+        if since is not None:
+            clauses.append('session >= ?')
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._reader().execute(
+            f'SELECT id, timestamp, session, user_message, ai_response FROM conversations {where} '
+            'ORDER BY id DESC LIMIT ?', params + [limit + 1]).fetchall()
+        entries = [dict(row) for row in rows[:limit]]
+        next_cursor = entries[-1]['id'] if len(rows) > limit else None
+        return entries, next_cursor
+
+    def iter_all(self, session=None, since=None):
+        """Every exchange newest first, read a page at a time (for exports)"""
+        cursor = None
+        while True:
+            entries, cursor = self.page(cursor, MAX_PAGE_SIZE, session, since)
+            yield from entries
+            if cursor is None:
+                return
+
+    def day_counts(self):
+        """{session day: exchanges}"""
+        return {row['session']: row['count'] for row in
+                self._reader().execute('SELECT session, count FROM conversation_days ORDER BY session')}
+
+    def counts(self, today=None):
+        """Total, today's and session-day counts from the per-day counters"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        days = self.day_counts()
+        return {
+            'total_count': sum(days.values()),
+            'today_count': days.get(today, 0),
+            'session_count': len(days)
+        }
+
+    def import_json(self, json_path):
+        """Append the exchanges from a legacy conversations JSON file"""
+        with open(json_path, 'r') as f:
+            entries = [e for e in json.load(f).get('conversations', [])
+                       if e.get('timestamp') and e.get('user_message') is not None]
+        for e in entries:
+            e.setdefault('session', e['timestamp'][:10])
+            e.setdefault('ai_response', '')
+        with self._write_lock:
+            self._writer.execute('BEGIN IMMEDIATE')
+            try:
+                self._insert(self._writer, entries)
+            except BaseException:
+                self._writer.execute('ROLLBACK')
+                raise
+            self._writer.execute('COMMIT')
+        return len(entries)
+
+    def migrate_json(self, json_path=LEGACY_JSON):
+        """Import a legacy JSON history once, then rename it to *.migrated"""
+        if not os.path.exists(json_path):
+            return 0
+        imported = self.import_json(json_path)
+        os.replace(json_path, json_path + '.migrated')
+        return imported
+
+    def close(self):
+        with self._write_lock:
+            self._writer.close()
+
+
+if __name__ == '__main__':
+    # python conversation_store.py [legacy.json] [conversations.db]
+    json_path = sys.argv[1] if len(sys.argv) > 1 else LEGACY_JSON
+    db_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    store = ConversationStore(db_path)
+    count = store.migrate_json(json_path)
+    print(f"💬 Migrated {count} conversation exchanges from {json_path} into {db_path}")
+    store.close()
@@ -0,0 +1,94 @@
+"""
+NetworkBuster - Shared CPU Sampler
+Background non-blocking CPU sampling with rolling total, per-core and process series
+"""
+
+import threading
+import time
+from collections import deque
+
+import psutil
+
+SAMPLE_INTERVAL = 1.0  # Seconds between samples
+HISTORY_SECONDS = 300  # How much history the buffers hold
+DEFAULT_WINDOW = 10  # Seconds summarised by stats() unless asked otherwise
+
+
+class CpuSampler:
+    """Samples cpu_percent(interval=None) on a daemon thread into fixed-size buffers
+
+    psutil keeps the previous CPU times per calling thread, so priming and
+    sampling both happen on the sampler thread and nobody else's
+    cpu_percent() calls shift its intervals. Readers summarise whatever is
+    buffered and never sleep.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, history_seconds=HISTORY_SECONDS):
+        self.interval = interval
+        # (monotonic time, total %, per-core % tuple, this process %)
+        self._samples = deque(maxlen=max(1, int(history_seconds / interval)))
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start sampling (idempotent); the first sample lands one interval later"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True, name='cpu-sampler')
+                    self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        process = psutil.Process()
+        # Prime: the first non-blocking call only records the starting times
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        process.cpu_percent(interval=None)
+        while not self._stop.wait(self.interval):
+            sample = (time.monotonic(), psutil.cpu_percent(interval=None),
+                      tuple(psutil.cpu_percent(interval=None, percpu=True)), process.cpu_percent(interval=None))
+            with self._lock:
+                self._samples.append(sample)
+
+    def samples(self, seconds=None):
+        """Buffered samples from the last seconds (all of them if None)"""
+        self.start()
+        with self._lock:
+            samples = list(self._samples)
+        if seconds is not None:
+            cutoff = time.monotonic() - seconds
+            samples = [s for s in samples if s[0] >= cutoff]
+        return samples
+
+    def current(self):
+        """Latest total CPU %, or 0.0 before the first sample"""
+        samples = self.samples()
+        return samples[-1][1] if samples else 0.0
+
+    def stats(self, seconds=DEFAULT_WINDOW):
+        """Summary of the last seconds: total mean/min/max, per-core and process means"""
+        samples = self.samples(seconds)
+        if not samples:
+            return {'window_seconds': seconds, 'samples': 0, 'current': 0.0, 'mean': 0.0,
+                    'min': 0.0, 'max': 0.0, 'per_core': [], 'process': 0.0}
+        totals = [s[1] for s in samples]
+        per_core = [round(sum(core) / len(samples), 1) for core in zip(*(s[2] for s in samples))]
+        return {
+            'window_seconds': seconds,
+            'samples': len(samples),
+            'current': totals[-1],
+            'mean': round(sum(totals) / len(totals), 1),
+            'min': min(totals),
+            'max': max(totals),
+            'per_core': per_core,
+            'process': round(sum(s[3] for s in samples) / len(samples), 1)
+        }
+
+
+# Process-wide sampler shared by all callers
+cpu_sampler = CpuSampler()
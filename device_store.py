@@ -0,0 +1,631 @@
+"""
+NetworkBuster - Device Library Store
+Embedded SQLite (WAL) store for tracked devices, tags and reputation
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from reputation_series import ReputationSeries
+
+DEFAULT_PATH = 'networkbuster_devices.db'
+LEGACY_JSON = 'networkbuster_device_library.json'
+INITIAL_REPUTATION = 50  # Neutral on the 0-100 scale
+FLUSH_INTERVAL = 5.0  # Seconds between write-behind flushes...
+FLUSH_THRESHOLD = 500  # ...or sooner once this many changes are pending
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    ip TEXT PRIMARY KEY,
+    first_seen TEXT,
+    last_seen TEXT,
+    last_seen_ts REAL,
+    total_connections INTEGER NOT NULL DEFAULT 0,
+    last_updated TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS devices_last_seen ON devices(last_seen_ts);
+
+CREATE TABLE IF NOT EXISTS device_ports (
+    ip TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    PRIMARY KEY (ip, port)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS device_tags (
+    ip TEXT PRIMARY KEY,
+    tag TEXT NOT NULL,
+    reason TEXT,
+    timestamp REAL,
+    tagged_at TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS device_tags_tag ON device_tags(tag);
+
+CREATE TABLE IF NOT EXISTS threat_events (
+    id INTEGER PRIMARY KEY,
+    ip TEXT NOT NULL,
+    timestamp TEXT,
+    threat_score INTEGER,
+    reasons TEXT,
+    action TEXT
+);
+CREATE INDEX IF NOT EXISTS threat_events_ip ON threat_events(ip, id);
+
+CREATE TABLE IF NOT EXISTS reputation (
+    ip TEXT PRIMARY KEY,
+    score INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- Bounded history per device: packed recent events plus hourly/daily rollups
+CREATE TABLE IF NOT EXISTS reputation_series (
+    ip TEXT PRIMARY KEY,
+    events BLOB,
+    hourly BLOB,
+    daily BLOB
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS reputation_events (
+    code INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+"""
+
+
+class DeviceStore:
+    """Indexed device library with upserts and batched transactions
+
+    Writes go through one connection under a lock; every write method runs
+    in its own transaction unless called inside batch(), in which case the
+    whole batch commits once. Other threads read through their own
+    connections, which WAL lets run alongside the writer.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._write_lock = threading.RLock()
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._local = threading.local()
+        self._batch_owner = None
+        self._batch_depth = 0
+        self._load_event_codes()
+
+    def _connect(self):
+        # isolation_level=None: transactions are opened explicitly by batch()
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+
+    def _load_event_codes(self):
+        self._event_codes = {row['name']: row['code'] for row in
+                             self._writer.execute('SELECT code, name FROM reputation_events')}
+
+    def _reader(self):
+        """Connection for reads; inside a batch this thread must see its own writes"""
+        if self._batch_owner == threading.get_ident():
+            return self._writer
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @contextmanager
+    def batch(self):
+        """Group writes into one transaction (nested batches join the outer one)"""
+        with self._write_lock:
+            outer = self._batch_depth == 0
+            if outer:
+                self._writer.execute('BEGIN IMMEDIATE')
+                self._batch_owner = threading.get_ident()
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if outer:
+                    self._writer.execute('ROLLBACK')
+                    self._load_event_codes()  # Drop codes cached inside the rolled-back batch
+                raise
+            else:
+                if outer:
+                    self._writer.execute('COMMIT')
+            finally:
+                self._batch_depth -= 1
+                if outer:
+                    self._batch_owner = None
+
+    # Writes
+
+    def record_connections(self, observations, now=None):
+        """Upsert sightings: {ip: (connection_count, ports[, seen_at])}"""
+        now = time.time() if now is None else now
+        rows = []
+        for ip, seen in observations.items():
+            seen_at = seen[2] if len(seen) > 2 else now
+            seen_iso = datetime.fromtimestamp(seen_at).isoformat()
+            rows.append((ip, seen_iso, seen_iso, seen_at, seen[0]))
+        with self.batch():
+            self._writer.executemany(
+                """INSERT INTO devices (ip, first_seen, last_seen, last_seen_ts, total_connections)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(ip) DO UPDATE SET
+                       total_connections = total_connections + excluded.total_connections,
+                       last_seen = excluded.last_seen,
+                       last_seen_ts = excluded.last_seen_ts""",
+                rows
+            )
+            self._writer.executemany(
+                'INSERT OR IGNORE INTO device_ports (ip, port) VALUES (?, ?)',
+                [(ip, port) for ip, seen in observations.items() for port in seen[1]]
+            )
+
+    def _ensure_device(self, ip, now_iso):
+        self._writer.execute(
+            """INSERT INTO devices (ip, first_seen, total_connections) VALUES (?, ?, 0)
+               ON CONFLICT(ip) DO NOTHING""",
+            (ip, now_iso)
+        )
+
+    def set_tag(self, ip, tag, reason='', now=None):
+        """Tag a device, creating its library entry if needed"""
+        now = time.time() if now is None else now
+        now_iso = datetime.fromtimestamp(now).isoformat()
+        with self.batch():
+            self._writer.execute(
+                """INSERT INTO device_tags (ip, tag, reason, timestamp, tagged_at) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(ip) DO UPDATE SET
+                       tag = excluded.tag, reason = excluded.reason,
+                       timestamp = excluded.timestamp, tagged_at = excluded.tagged_at""",
+                (ip, tag, reason, now, now_iso)
+            )
+            self._ensure_device(ip, now_iso)
+            self._writer.execute('UPDATE devices SET last_updated = ? WHERE ip = ?', (now_iso, ip))
+
+    def _event_code(self, name):
+        code = self._event_codes.get(name)
+        if code is None:
+            code = self._writer.execute('INSERT INTO reputation_events (name) VALUES (?)', (name,)).lastrowid
+            self._event_codes[name] = code
+        return code
+
+    def _load_series(self, ip):
+        row = self._writer.execute(
+            'SELECT events, hourly, daily FROM reputation_series WHERE ip = ?', (ip,)).fetchone()
+        return ReputationSeries(*row) if row else ReputationSeries()
+
+    def _save_series(self, ip, series):
+        self._writer.execute(
+            'INSERT OR REPLACE INTO reputation_series (ip, events, hourly, daily) VALUES (?, ?, ?, ?)',
+            (ip,) + series.to_row()
+        )
+
+    def apply_reputation_events(self, events):
+        """Apply [(ip, score_delta, event, ts)] in order; returns {ip: final score}
+
+        Each device's score and series are read and written once per call.
+        """
+        by_ip = {}
+        for ip, delta, event, ts in events:
+            by_ip.setdefault(ip, []).append((delta, event, ts))
+        scores = {}
+        with self.batch():
+            for ip, changes in by_ip.items():
+                row = self._writer.execute('SELECT score FROM reputation WHERE ip = ?', (ip,)).fetchone()
+                score = row['score'] if row else INITIAL_REPUTATION
+                series = self._load_series(ip)
+                for delta, event, ts in changes:
+                    score = max(0, min(100, score + delta))
+                    series.record(ts, delta, score, self._event_code(event))
+                self._writer.execute(
+                    """INSERT INTO reputation (ip, score) VALUES (?, ?)
+                       ON CONFLICT(ip) DO UPDATE SET score = excluded.score""",
+                    (ip, score)
+                )
+                self._save_series(ip, series)
+                scores[ip] = score
+        return scores
+
+    def adjust_reputation(self, ip, score_delta, event='', now=None):
+        """Apply a clamped score change and log it; returns the new score"""
+        now = time.time() if now is None else now
+        return self.apply_reputation_events([(ip, score_delta, event, now)])[ip]
+
+    def add_threat_event(self, ip, threat_score, reasons, action, now=None):
+        now = time.time() if now is None else now
+        with self.batch():
+            self._writer.execute(
+                'INSERT INTO threat_events (ip, timestamp, threat_score, reasons, action) VALUES (?, ?, ?, ?, ?)',
+                (ip, datetime.fromtimestamp(now).isoformat(), threat_score, json.dumps(reasons), action)
+            )
+
+    # Reads
+
+    def get_tag(self, ip):
+        row = self._reader().execute(
+            'SELECT tag, reason, timestamp, tagged_at FROM device_tags WHERE ip = ?', (ip,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_score(self, ip):
+        row = self._reader().execute('SELECT score FROM reputation WHERE ip = ?', (ip,)).fetchone()
+        return row['score'] if row else None
+
+    def get_reputation(self, ip):
+        """Score, recent raw events and hourly/daily trend for a device"""
+        conn = self._reader()
+        row = conn.execute('SELECT score FROM reputation WHERE ip = ?', (ip,)).fetchone()
+        if row is None:
+            return None
+        series_row = conn.execute(
+            'SELECT events, hourly, daily FROM reputation_series WHERE ip = ?', (ip,)).fetchone()
+        series = ReputationSeries(*series_row) if series_row else ReputationSeries()
+        names = {code: name for name, code in dict(self._event_codes).items()}
+        return {'score': row['score'], 'history': series.history(names), 'trend': series.trend()}
+
+    def get_device(self, ip):
+        """A device in the legacy library shape, or None if never seen"""
+        conn = self._reader()
+        row = conn.execute(
+            'SELECT first_seen, last_seen, total_connections, last_updated FROM devices WHERE ip = ?', (ip,)
+        ).fetchone()
+        if row is None:
+            return None
+        device = {k: v for k, v in dict(row).items() if v is not None}
+        device['ports_accessed'] = [r['port'] for r in conn.execute(
+            'SELECT port FROM device_ports WHERE ip = ? ORDER BY port', (ip,))]
+        device['threat_events'] = [
+            {'timestamp': r['timestamp'], 'threat_score': r['threat_score'],
+             'reasons': json.loads(r['reasons']), 'action': r['action']}
+            for r in conn.execute(
+                'SELECT timestamp, threat_score, reasons, action FROM threat_events WHERE ip = ? ORDER BY id', (ip,))
+        ]
+        tag = self.get_tag(ip)
+        if tag:
+            device['tag'] = tag['tag']
+            device['tag_reason'] = tag['reason']
+        return device
+
+    def _count(self, sql, params=()):
+        return self._reader().execute(sql, params).fetchone()[0]
+
+    def device_count(self):
+        return self._count('SELECT COUNT(*) FROM devices')
+
+    def tag_count(self):
+        return self._count('SELECT COUNT(*) FROM device_tags')
+
+    def reputation_count(self):
+        return self._count('SELECT COUNT(*) FROM reputation')
+
+    def seen_since(self, ts):
+        """Devices whose last sighting is at or after epoch ts"""
+        return self._count('SELECT COUNT(*) FROM devices WHERE last_seen_ts >= ?', (ts,))
+
+    # Migration
+
+    def import_json(self, json_path):
+        """Load a legacy networkbuster_device_library.json; returns devices imported"""
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        devices = data.get('devices', {})
+        tags = data.get('tags', {})
+        reputation = data.get('reputation', {})
+
+        def parse_ts(value):
+            try:
+                return datetime.fromisoformat(value).timestamp()
+            except (TypeError, ValueError):
+                return None
+
+        with self.batch():
+            w = self._writer
+            w.executemany(
+                """INSERT OR REPLACE INTO devices
+                   (ip, first_seen, last_seen, last_seen_ts, total_connections, last_updated)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(ip, d.get('first_seen'), d.get('last_seen'), parse_ts(d.get('last_seen')),
+                  d.get('total_connections', 0), d.get('last_updated')) for ip, d in devices.items()]
+            )
+            w.executemany(
+                'INSERT OR IGNORE INTO device_ports (ip, port) VALUES (?, ?)',
+                [(ip, port) for ip, d in devices.items() for port in d.get('ports_accessed', [])]
+            )
+            w.executemany(
+                'INSERT INTO threat_events (ip, timestamp, threat_score, reasons, action) VALUES (?, ?, ?, ?, ?)',
+                [(ip, e.get('timestamp'), e.get('threat_score'), json.dumps(e.get('reasons', [])), e.get('action'))
+                 for ip, d in devices.items() for e in d.get('threat_events', [])]
+            )
+            # Tags may exist without a device entry; the library entry is implied
+            w.executemany(
+                'INSERT OR REPLACE INTO device_tags (ip, tag, reason, timestamp, tagged_at) VALUES (?, ?, ?, ?, ?)',
+                [(ip, t.get('tag', 'unknown'), t.get('reason'), t.get('timestamp'), t.get('tagged_at'))
+                 for ip, t in tags.items()]
+            )
+            for ip, t in tags.items():
+                self._ensure_device(ip, t.get('tagged_at'))
+            w.executemany(
+                'INSERT OR REPLACE INTO reputation (ip, score) VALUES (?, ?)',
+                [(ip, r.get('score', INITIAL_REPUTATION)) for ip, r in reputation.items()]
+            )
+            for ip, r in reputation.items():
+                self._fold_history(ip, [
+                    (parse_ts(h.get('timestamp')), h.get('score_change', 0), h.get('new_score'), h.get('event', ''))
+                    for h in r.get('history', [])
+                ])
+        return len(devices)
+
+    def _fold_history(self, ip, rows):
+        """Fold legacy (ts, delta, new_score, event) rows into the device's series"""
+        series = self._load_series(ip)
+        for ts, delta, new_score, event in rows:
+            if ts is None or new_score is None:
+                continue
+            series.record(ts, delta or 0, new_score, self._event_code(event or ''))
+        self._save_series(ip, series)
+
+    def migrate_json(self, json_path=LEGACY_JSON):
+        """Import a legacy JSON library once, then rename it to *.migrated"""
+        if not os.path.exists(json_path):
+            return 0
+        imported = self.import_json(json_path)
+        os.replace(json_path, json_path + '.migrated')
+        return imported
+
+    def close(self):
+        with self._write_lock:
+            self._writer.close()
+
+
+class _Pending:
+    """Changes not yet written: sightings and tags coalesce per IP, events keep order"""
+
+    __slots__ = ('sightings', 'tags', 'scores', 'reputation_events', 'threat_events', 'changes')
+
+    def __init__(self):
+        self.sightings = {}  # ip -> [count, ports, last seen]
+        self.tags = {}  # ip -> (tag, reason, timestamp)
+        self.scores = {}  # ip -> latest score (read-your-writes for reputation)
+        self.reputation_events = []  # (ip, delta, event, timestamp), replayed in order
+        self.threat_events = []  # (ip, threat_score, reasons, action, timestamp)
+        self.changes = 0
+
+    def requeue(self, newer):
+        """Fold changes made after this batch was taken back on top of it"""
+        for ip, (count, ports, seen_at) in newer.sightings.items():
+            seen = self.sightings.setdefault(ip, [0, set(), seen_at])
+            seen[0] += count
+            seen[1] |= ports
+            seen[2] = max(seen[2], seen_at)
+        self.tags.update(newer.tags)
+        self.scores.update(newer.scores)
+        self.reputation_events += newer.reputation_events
+        self.threat_events += newer.threat_events
+        self.changes += newer.changes
+        return self
+
+
+class WriteBehindStore:
+    """Write-behind front for DeviceStore
+
+    Writes only touch in-memory dirty state; a background thread flushes it
+    every FLUSH_INTERVAL seconds or once FLUSH_THRESHOLD changes pile up,
+    in one WAL transaction. Tags and scores are read through the dirty
+    state, full device records flush first, and counts are refreshed after
+    each flush so request paths never scan the library. Pending changes are
+    flushed at interpreter exit.
+    """
+
+    def __init__(self, store, flush_interval=FLUSH_INTERVAL, flush_threshold=FLUSH_THRESHOLD):
+        self.store = store
+        self.path = store.path
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()  # One flush at a time, in order
+        self._pending = _Pending()
+        self._flushing = None  # Batch being written; still visible to reads
+        self._batch_depth = 0
+        self._closed = False
+        self.flush_count = 0
+        self.last_error = None  # Set while the last flush failed; retries then wait a full interval
+        self._counts = {}
+        self._refresh_counts()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='device-store-flush')
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _changed(self, n=1):
+        self._pending.changes += n
+        if self._pending.changes >= self.flush_threshold and not self._batch_depth:
+            self._wakeup.notify()
+
+    @contextmanager
+    def batch(self):
+        """Hold back threshold flushes so a scan's changes land in one flush"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                self._changed(0)
+
+    # Writes (memory only)
+
+    def record_connections(self, observations, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            for ip, (count, ports) in observations.items():
+                seen = self._pending.sightings.setdefault(ip, [0, set(), now])
+                seen[0] += count
+                seen[1] |= set(ports)
+                seen[2] = now
+            self._changed(len(observations))
+
+    def set_tag(self, ip, tag, reason='', now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._pending.tags[ip] = (tag, reason, now)
+            self._changed()
+
+    def adjust_reputation(self, ip, score_delta, event='', now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            current = self._pending_score(ip)
+            if current is None:
+                # Point lookup on the primary key (a batch mid-flush is
+                # still visible through self._flushing above)
+                current = self.store.get_score(ip)
+            if current is None:
+                current = INITIAL_REPUTATION
+            new_score = max(0, min(100, current + score_delta))
+            self._pending.scores[ip] = new_score
+            self._pending.reputation_events.append((ip, score_delta, event, now))
+            self._changed()
+        return new_score
+
+    def add_threat_event(self, ip, threat_score, reasons, action, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._pending.threat_events.append((ip, threat_score, reasons, action, now))
+            self._changed()
+
+    # Reads
+
+    def _pending_score(self, ip):
+        for batch in (self._pending, self._flushing):
+            if batch is not None and ip in batch.scores:
+                return batch.scores[ip]
+        return None
+
+    def get_tag(self, ip):
+        with self._lock:
+            for batch in (self._pending, self._flushing):
+                if batch is not None and ip in batch.tags:
+                    tag, reason, ts = batch.tags[ip]
+                    return {'tag': tag, 'reason': reason, 'timestamp': ts,
+                            'tagged_at': datetime.fromtimestamp(ts).isoformat()}
+        return self.store.get_tag(ip)
+
+    def get_score(self, ip):
+        with self._lock:
+            score = self._pending_score(ip)
+        return score if score is not None else self.store.get_score(ip)
+
+    def get_device(self, ip):
+        self.flush()
+        return self.store.get_device(ip)
+
+    def get_reputation(self, ip):
+        self.flush()
+        return self.store.get_reputation(ip)
+
+    def device_count(self):
+        """Devices as of the last flush"""
+        return self._counts['devices']
+
+    def tag_count(self):
+        return self._counts['tags']
+
+    def reputation_count(self):
+        return self._counts['reputation']
+
+    def seen_since(self, ts):
+        with self._lock:
+            pending = sum(1 for seen in self._pending.sightings.values() if seen[2] >= ts)
+        return max(pending, self.store.seen_since(ts))
+
+    def pending_changes(self):
+        return self._pending.changes
+
+    # Flushing
+
+    def _refresh_counts(self):
+        self._counts = {
+            'devices': self.store.device_count(),
+            'tags': self.store.tag_count(),
+            'reputation': self.store.reputation_count()
+        }
+
+    def flush(self):
+        """Write all pending changes in one transaction; returns changes written"""
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                if not batch.changes:
+                    return 0
+                self._pending = _Pending()
+                self._flushing = batch
+            try:
+                with self.store.batch():
+                    self.store.record_connections({ip: tuple(seen) for ip, seen in batch.sightings.items()})
+                    for ip, (tag, reason, ts) in batch.tags.items():
+                        self.store.set_tag(ip, tag, reason, now=ts)
+                    self.store.apply_reputation_events(batch.reputation_events)
+                    for ip, threat_score, reasons, action, ts in batch.threat_events:
+                        self.store.add_threat_event(ip, threat_score, reasons, action, now=ts)
+            except Exception as e:
+                # Whatever failed, the batch goes back to pending so reads
+                # never see it stranded in _flushing
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"⚠️ Device library flush failed, will retry: {self.last_error}")
+                with self._lock:
+                    self._pending = batch.requeue(self._pending)
+                    self._flushing = None
+                return 0
+            with self._lock:
+                self._flushing = None
+            self.last_error = None
+            self._refresh_counts()
+            self.flush_count += 1
+            return batch.changes
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(
+                    lambda: self._closed or (self._pending.changes >= self.flush_threshold
+                                             and not self._batch_depth and self.last_error is None),
+                    timeout=self.flush_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Device library flusher error: {type(e).__name__}: {e}")
+
+    def migrate_json(self, json_path=LEGACY_JSON):
+        imported = self.store.migrate_json(json_path)
+        self._refresh_counts()
+        return imported
+
+    def close(self):
+        """Stop the flusher and write out anything still pending"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join(timeout=self.flush_interval)
+        self.flush()
+        self.store.close()
+
+
+if __name__ == '__main__':
+    # python device_store.py [legacy.json] [devices.db]
+    json_path = sys.argv[1] if len(sys.argv) > 1 else LEGACY_JSON
+    db_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    store = DeviceStore(db_path)
+    count = store.migrate_json(json_path)
+    print(f"📚 Migrated {count} devices from {json_path} into {db_path}")
+    store.close()
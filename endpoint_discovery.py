@@ -0,0 +1,155 @@
+"""
+NetworkBuster - Endpoint Discovery
+Pulls route manifests from each service and expands them into probeable endpoints
+"""
+
+import re
+import threading
+import time
+
+import requests
+
+from route_manifest import MANIFEST_PATH
+
+# Sample values for route parameters, by parameter name
+SAMPLE_ARGUMENTS = {
+    'service': 'api_server',
+    'device_id': 'workstation-1',
+    'gateway_id': 'router-wifi7',
+    'streamId': '1',
+    'section': 'project',
+}
+
+# Sample values by Flask converter when the name is unknown
+CONVERTER_SAMPLES = {
+    'IntegerConverter': '1',
+    'FloatConverter': '1.0',
+    'UUIDConverter': '00000000-0000-0000-0000-000000000000',
+}
+
+DEFAULT_SAMPLE = 'sample'
+
+# Concrete paths for hand-registered wildcard routes
+WILDCARD_SAMPLES = {
+    '/api/*': '/api/health',
+    '/api/audio/stream/*': '/api/audio/streams',  # Stream ids only exist after a POST; probe the listing
+    '/api/logs/*': '/api/logs/workstation-1',
+}
+
+# GET routes with side effects (or that never finish) are never probed
+UNPROBEABLE_PATHS = {
+    MANIFEST_PATH,
+    '/api/open/<service>',  # Mission Control opens a browser window
+    '/api/trace/stream',  # Server-Sent Events
+}
+
+# Flask <conv(args):name> / <name> and Express :name placeholders
+FLASK_PARAM = re.compile(r'<(?:(\w+)(?:\([^)]*\))?:)?(\w+)>')
+EXPRESS_PARAM = re.compile(r':(\w+)')
+
+
+def route_key(path):
+    """Normalize a route so '/api/logs/*', '/api/logs/<id>' and '/api/logs/:id' match"""
+    path = FLASK_PARAM.sub('*', path)
+    return EXPRESS_PARAM.sub('*', path)
+
+
+def expand_path(path, converters=None):
+    """Substitute sample arguments into a parameterised or wildcard route"""
+    if path in WILDCARD_SAMPLES:
+        return WILDCARD_SAMPLES[path]
+    converters = converters or {}
+
+    def flask_sample(match):
+        name = match.group(2)
+        if name in SAMPLE_ARGUMENTS:
+            return SAMPLE_ARGUMENTS[name]
+        return CONVERTER_SAMPLES.get(converters.get(name), DEFAULT_SAMPLE)
+
+    path = FLASK_PARAM.sub(flask_sample, path)
+    path = EXPRESS_PARAM.sub(lambda m: SAMPLE_ARGUMENTS.get(m.group(1), DEFAULT_SAMPLE), path)
+    return path.replace('*', '')
+
+
+class EndpointDiscovery:
+    """Caches each service's route manifest, revalidating with If-None-Match"""
+
+    def __init__(self, session_for=None, timeout=3):
+        self.session_for = session_for or (lambda url: requests)
+        self.timeout = timeout
+        self._manifests = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, service, base_url):
+        """Fetch (or revalidate) one service's manifest. Returns its routes."""
+        url = base_url + MANIFEST_PATH
+        cached = self._manifests.get(service)
+        headers = {}
+        if cached and cached['base_url'] == base_url and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+
+        response = self.session_for(url).get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached:
+            cached['checked_at'] = time.time()
+            return cached['routes']
+        if response.status_code != 200:
+            return cached['routes'] if cached else []
+
+        routes = response.json().get('routes', [])
+        with self._lock:
+            self._manifests[service] = {
+                'base_url': base_url,
+                'etag': response.headers.get('ETag'),
+                'routes': routes,
+                'checked_at': time.time()
+            }
+        return routes
+
+    def refresh(self, services):
+        """Refresh manifests for {service: base_url}; unreachable services keep their cache"""
+        for service, base_url in services.items():
+            try:
+                self.fetch(service, base_url)
+            except (requests.RequestException, ValueError):
+                pass
+
+    def endpoints_for(self, service):
+        """Discovered GET endpoints for a service in API_ENDPOINTS format"""
+        cached = self._manifests.get(service)
+        if not cached:
+            return []
+        endpoints = []
+        for route in cached['routes']:
+            if 'GET' not in route.get('methods', []) or route['path'] in UNPROBEABLE_PATHS:
+                continue
+            endpoints.append({
+                'path': route['path'],
+                'method': 'GET',
+                'description': route.get('description') or 'Discovered route',
+                'probe_path': expand_path(route['path'], route.get('converters')),
+                'discovered': True
+            })
+        return endpoints
+
+    def merge(self, catalogue):
+        """Static catalogue plus discovered routes not already listed"""
+        merged = {}
+        for service, config in catalogue.items():
+            endpoints = []
+            for endpoint in config['endpoints']:
+                endpoint = dict(endpoint)
+                endpoint.setdefault('probe_path', expand_path(endpoint['path']))
+                endpoints.append(endpoint)
+            known = {(route_key(e['path']), e['method']) for e in endpoints}
+            for endpoint in self.endpoints_for(service):
+                if (route_key(endpoint['path']), endpoint['method']) not in known:
+                    endpoints.append(endpoint)
+            merged[service] = {**config, 'endpoints': endpoints}
+        return merged
+
+    def status(self):
+        """Manifest cache state per service"""
+        return {
+            service: {'routes': len(m['routes']), 'etag': m['etag'], 'checked_at': m['checked_at']}
+            for service, m in self._manifests.items()
+        }
@@ -0,0 +1,131 @@
+"""
+NetworkBuster - Intent Router
+Table-driven chat routing: every keyword compiled into one trie regex, matches scored per intent
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+ROUTE_CACHE_SIZE = 1024  # Dashboards and scripts repeat the same few queries
+
+RouteMatch = namedtuple('RouteMatch', ['intent', 'score', 'terms'])
+
+
+class Intent:
+    """A named handler plus the weighted keywords that select it
+
+    keywords maps a lowercase word stem to its weight; a stem matches any
+    word starting with it, so 'secur' covers secure/security. requires lists
+    groups of stems, and each group must match at least once for the intent
+    to be chosen. handler is a callable or the name of a method on the
+    router's target. memoize marks replies that depend only on the current
+    scan snapshot, never on the query text or the clock.
+    """
+
+    def __init__(self, name, keywords, handler, requires=(), memoize=False):
+        self.name = name
+        self.keywords = dict(keywords)
+        self.handler = handler
+        self.requires = [frozenset(group) for group in requires]
+        self.memoize = memoize
+
+    def __repr__(self):
+        return f"Intent({self.name!r})"
+
+
+# NetworkBusterAI chat intents, in tie-break order. Specific words weigh 2 and
+# generic ones 1, so 'security status' is a security question and
+# 'optimize performance' an optimize one.
+CHAT_INTENTS = [
+    Intent('status', {'status': 1, 'services': 1}, '_respond_status', memoize=True),
+    Intent('network', {'network': 1, 'scan': 1, 'analys': 1, 'analyz': 1, 'connections': 1}, '_respond_network',
+           requires=[{'network'}, {'scan', 'analys', 'analyz'}], memoize=True),
+    Intent('health', {'health': 2, 'performance': 1, 'cpu': 1, 'memory': 1}, '_respond_health',
+           memoize=True),
+    Intent('diagnose', {'diagnos': 2, 'troubleshoot': 2}, '_respond_diagnose', memoize=True),
+    Intent('optimize', {'optimiz': 2, 'optimis': 2, 'performance': 1, 'speed': 1, 'tune': 1, 'tuning': 1},
+           '_respond_optimize', memoize=True),
+    Intent('security', {'secur': 2, 'threat': 2, 'device': 1}, '_respond_security'),
+    Intent('help', {'help': 1, 'commands': 1}, '_respond_help', memoize=True),
+]
+
+
+def trie_pattern(stems):
+    """Regex alternation of stems factored into a prefix trie
+
+    Python's re tries alternatives one by one; sharing prefixes means each
+    word start is examined roughly once per character instead of once per
+    stem, which is what makes one combined pattern cheap.
+    """
+    trie = {}
+    for stem in stems:
+        node = trie
+        for ch in stem:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = '(?:%s)' % '|'.join(branches) if len(branches) > 1 else branches[0]
+        if '' in node:
+            return '(?:%s)?' % body  # A stem ends here; longer stems are tried first
+        return body
+
+    return build(trie)
+
+
+class IntentRouter:
+    """Routes a query to the highest-scoring intent
+
+    All stems of all intents are compiled into a single trie regex, so a
+    query is scanned once whatever the number of intents. Ties go to the
+    intent listed first. Routes are cached per query string.
+    """
+
+    def __init__(self, intents, fallback, target=None):
+        self.intents = list(intents)
+        self.fallback = fallback
+        self.target = target
+        stems = set()
+        for intent in self.intents:
+            stems.update(intent.keywords)
+            for group in intent.requires:
+                stems.update(group)
+        self._regex = re.compile(r'\b(%s)\w*' % trie_pattern(stems))
+        self.route = lru_cache(maxsize=ROUTE_CACHE_SIZE)(self._route)
+
+    def matched_stems(self, query):
+        """Set of stems found in query"""
+        return {m.group(1) for m in self._regex.finditer(query.lower())}
+
+    def _route(self, query):
+        """Best RouteMatch for query, or None when nothing scores"""
+        found = self.matched_stems(query)
+        if not found:
+            return None
+        best = None
+        for intent in self.intents:
+            terms = [stem for stem in intent.keywords if stem in found]
+            if not terms or any(not (group & found) for group in intent.requires):
+                continue
+            score = sum(intent.keywords[stem] for stem in terms)
+            if best is None or score > best.score:
+                best = RouteMatch(intent, score, terms)
+        return best
+
+    def _resolve(self, handler):
+        return getattr(self.target, handler) if isinstance(handler, str) else handler
+
+    def select(self, query):
+        """(Intent, handler) for query; the intent is None when the fallback applies"""
+        match = self.route(query)
+        if match is None:
+            return None, self._resolve(self.fallback)
+        return match.intent, self._resolve(match.intent.handler)
+
+    def dispatch(self, query):
+        """Run the chosen intent's handler (or the fallback) on query"""
+        return self.select(query)[1](query)
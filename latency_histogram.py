@@ -0,0 +1,156 @@
+"""
+NetworkBuster - Streaming Latency Histograms
+Constant-memory, mergeable latency quantiles over sliding time windows
+"""
+
+import math
+import time
+
+# Log-spaced buckets (HDR style): each bucket is 5% wider than the last,
+# giving ~2.5% relative error from 0.01 ms up to 10 minutes.
+MIN_VALUE_MS = 0.01
+GROWTH = 1.05
+LOG_GROWTH = math.log(GROWTH)
+MAX_BUCKET = int(math.log(600000 / MIN_VALUE_MS) / LOG_GROWTH) + 1
+
+QUANTILES = {'p50': 0.50, 'p90': 0.90, 'p95': 0.95, 'p99': 0.99}
+
+# Sliding windows reported by summary(), in seconds
+WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+
+
+def bucket_index(value_ms):
+    """Map a latency to its bucket"""
+    if value_ms <= MIN_VALUE_MS:
+        return 0
+    return min(int(math.log(value_ms / MIN_VALUE_MS) / LOG_GROWTH) + 1, MAX_BUCKET)
+
+
+def bucket_value(index):
+    """Representative latency (bucket midpoint) for a bucket"""
+    if index == 0:
+        return MIN_VALUE_MS
+    lower = MIN_VALUE_MS * GROWTH ** (index - 1)
+    return lower * (1 + GROWTH) / 2
+
+
+class LatencyHistogram:
+    """Sparse log-bucket histogram; at most MAX_BUCKET + 1 counters"""
+
+    __slots__ = ('counts', 'count', 'max')
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, value_ms):
+        index = bucket_index(value_ms)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other):
+        """Add another histogram's counts into this one"""
+        # Copy first: other may be a live histogram another thread records into
+        counts = other.counts.copy()
+        for index, n in counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += sum(counts.values())
+        if other.max > self.max:
+            self.max = other.max
+        return self
+
+    def quantile(self, q):
+        """Approximate latency at quantile q (0-1)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(bucket_value(index), self.max)
+        return self.max
+
+    def summary(self):
+        """Count, quantiles and max in milliseconds (one pass over the buckets)"""
+        result = {'count': self.count}
+        if not self.count:
+            result.update(dict.fromkeys(QUANTILES))
+            result['max'] = None
+            return result
+        targets = sorted((q * self.count, name) for name, q in QUANTILES.items())
+        seen = 0
+        t = 0
+        next_rank = targets[0][0]
+        counts = self.counts
+        for index in sorted(counts):
+            seen += counts[index]
+            if seen < next_rank:
+                continue
+            while t < len(targets) and seen >= targets[t][0]:
+                result[targets[t][1]] = round(min(bucket_value(index), self.max), 2)
+                t += 1
+            if t == len(targets):
+                break
+            next_rank = targets[t][0]
+        for _, name in targets[t:]:
+            result[name] = round(self.max, 2)
+        result['max'] = round(self.max, 2)
+        return result
+
+
+class _SlotRing:
+    """Ring of histograms, one per fixed-width time slot"""
+
+    def __init__(self, width, slots):
+        self.width = width
+        self.slots = slots
+        self.ring = [(None, None)] * slots
+
+    def record(self, value_ms, now):
+        slot_id = int(now // self.width)
+        index = slot_id % self.slots
+        current_id, hist = self.ring[index]
+        if current_id != slot_id:
+            hist = LatencyHistogram()
+            self.ring[index] = (slot_id, hist)
+        hist.record(value_ms)
+
+    def window(self, seconds, now):
+        newest = int(now // self.width)
+        oldest = newest - max(1, math.ceil(seconds / self.width)) + 1
+        merged = LatencyHistogram()
+        for slot_id, hist in self.ring:
+            if slot_id is not None and oldest <= slot_id <= newest:
+                merged.merge(hist)
+        return merged
+
+
+class WindowedLatency:
+    """Latency quantiles over 1 m / 5 m / 1 h sliding windows
+
+    Short windows come from 10 s slots (5 minutes kept), the hour window
+    from 1 minute slots, so memory stays fixed regardless of call volume.
+    """
+
+    def __init__(self):
+        self.fine = _SlotRing(width=10, slots=30)
+        self.coarse = _SlotRing(width=60, slots=60)
+
+    def record(self, value_ms, now=None):
+        now = time.time() if now is None else now
+        self.fine.record(value_ms, now)
+        self.coarse.record(value_ms, now)
+
+    def window(self, seconds, now=None):
+        """Merged histogram covering the last `seconds` seconds"""
+        now = time.time() if now is None else now
+        ring = self.fine if seconds <= self.fine.width * self.fine.slots else self.coarse
+        return ring.window(seconds, now)
+
+    def summary(self, now=None):
+        now = time.time() if now is None else now
+        return {name: self.window(seconds, now).summary() for name, seconds in WINDOWS.items()}
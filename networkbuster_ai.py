@@ -4,12 +4,27 @@ AI-powered diagnostics, monitoring, and automation for NetworkBuster
 """
 
 import os
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import psutil
 import socket
 from datetime import datetime
 import json
+from collections import deque
+from port_snapshot import port_snapshot
+from background_scanner import BackgroundScanner
+import chat_templates
+from connection_rate import ConnectionRateTracker
+from conversation_store import RANK_CANDIDATES, ConversationStore
+from cpu_sampler import cpu_sampler
+from device_store import DeviceStore, WriteBehindStore
+from intent_router import CHAT_INTENTS, IntentRouter
+from reply_cache import ReplyCache
+from service_readiness import DeferredInit, register_readiness
+from static_assets import FileAsset, StaticAsset
+from ttl_cache import TTLCache
+from threat_scoring import (BLOCK_SCORE, WARN_SCORE, ConnectionSnapshot, device_features, flagged,
+                            score_devices, threat_reasons)
 
 app = Flask(__name__)
 CORS(app)
@@ -804,6 +819,16 @@ NBAI_TEMPLATE = """
 </html>
 """
 
+# Cache lifetimes in seconds: (ttl, stale_ttl served while a refresh runs)
+CACHE_TTLS = {
+    'status': (1.0, 0),
+    'network': (2.0, 0),
+    'health': (5.0, 10.0)
+}
+
+SERIALIZATION_LOG_SIZE = 1000  # Blocked-device attempts kept in memory
+REPUTATION_CREDIT_INTERVAL = 3600  # Seconds between good-behavior reputation credits per device
+
 # AI Intelligence Engine with Advanced Indexing
 class NetworkBusterAI:
     def __init__(self):
@@ -829,58 +854,67 @@ class NetworkBusterAI:
             self.type_index[svc['type']].append(svc)
         
         # Performance metrics cache
-        self.metrics_cache = {}
-        self.cache_timestamp = 0
+        self.metrics_cache = TTLCache()  # Per-key TTLs, concurrent misses computed once
+        cpu_sampler.start()  # Warm up so the first health report has samples
         
         # Security: Microdevice tracking and barrier system
         self.device_fingerprints = {}  # Track known devices
-        self.serialization_attempts = []  # Log suspicious activity
+        self.serialization_attempts = deque(maxlen=SERIALIZATION_LOG_SIZE)  # Log suspicious activity (newest kept)
         self.blocked_devices = set()  # Blacklist for threats
-        self.connection_history = {}  # Connection pattern analysis
+        # Per-IP state kept only while the IP is in the rate tracker's window
+        self.threat_bands = {}  # ip -> 'clear' / 'warning' / 'blocked' as of the last scan
+        self.reputation_credited = {}  # ip -> when good behavior was last rewarded
+        self.connection_rates = ConnectionRateTracker()  # Sliding-window connection pattern analysis
         self.threat_score_index = {}  # Real-time threat scoring
         
-        # Historical Device Library System
-        self.device_library = {}  # Persistent device database
-        self.device_tags = {}  # Device categorization (trusted, suspicious, unknown, threat)
-        self.device_reputation = {}  # Long-term reputation scores
-        self.library_file = 'networkbuster_device_library.json'
+        # Historical Device Library System (devices, tags and reputation in SQLite)
+        self.library_file = 'networkbuster_device_library.json'  # Legacy JSON, migrated on first start
+        # Changes are written behind by a background flusher (and at exit)
+        self.device_store = WriteBehindStore(DeviceStore(os.environ.get('NBAI_DEVICE_DB', 'networkbuster_devices.db')))
         self.load_device_library()  # Load existing historical data
         
-        # Conversation History System
-        self.conversation_history = []  # Store all Q&A exchanges
-        self.conversation_file = 'networkbuster_conversations.json'
+        # Conversation History System (append-only SQLite, paged reads)
+        self.conversation_file = 'networkbuster_conversations.json'  # Legacy JSON, migrated on first start
+        self.conversation_store = ConversationStore(os.environ.get('NBAI_CONVERSATION_DB',
+                                                                   'networkbuster_conversations.db'))
         self.load_conversation_history()
+        
+        # Chat queries are routed through one compiled keyword automaton
+        self.router = IntentRouter(CHAT_INTENTS, fallback='_respond_default', target=self)
+        # Snapshot-only replies are built once per scan generation
+        self.reply_cache = ReplyCache()
+        
+        # Scans run in the background; request handlers read the latest snapshot
+        self.scanner = BackgroundScanner(self.run_scan, float(os.environ.get('NBAI_SCAN_INTERVAL', '5')),
+                                         name='nbai-scanner')
     
     def check_port(self, port):
         """Check if a port is listening"""
-        for conn in psutil.net_connections():
-            if conn.laddr.port == port and conn.status == 'LISTEN':
-                return True
-        return False
+        return port_snapshot.is_listening(port)
     
     def load_device_library(self):
-        """Load historical device library from persistent storage"""
+        """Open the device store, migrating the legacy JSON library if present"""
         try:
-            if os.path.exists(self.library_file):
-                with open(self.library_file, 'r') as f:
-                    data = json.load(f)
-                    self.device_library = data.get('devices', {})
-                    self.device_tags = data.get('tags', {})
-                    self.device_reputation = data.get('reputation', {})
-                    print(f"📚 Loaded {len(self.device_library)} devices from historical library")
+            migrated = self.device_store.migrate_json(self.library_file)
+            if migrated:
+                print(f"📚 Migrated {migrated} devices from {self.library_file}")
+            count = self.device_store.device_count()
+            if count:
+                print(f"📚 Loaded {count} devices from historical library")
             else:
                 print("📚 Creating new device library")
         except Exception as e:
             print(f"⚠️ Error loading library: {e}")
     
     def load_conversation_history(self):
-        """Load conversation history from persistent storage"""
+        """Open the conversation store, migrating the legacy JSON history if present"""
         try:
-            if os.path.exists(self.conversation_file):
-                with open(self.conversation_file, 'r') as f:
-                    data = json.load(f)
-                    self.conversation_history = data.get('conversations', [])
-                    print(f"💬 Loaded {len(self.conversation_history)} conversation exchanges")
+            migrated = self.conversation_store.migrate_json(self.conversation_file)
+            if migrated:
+                print(f"💬 Migrated {migrated} conversation exchanges from {self.conversation_file}")
+            total = self.conversation_store.counts()['total_count']
+            if total:
+                print(f"💬 Loaded {total} conversation exchanges")
             else:
                 print("💬 Creating new conversation history")
         except Exception as e:
@@ -889,94 +923,26 @@ class NetworkBusterAI:
     def save_conversation(self, user_message, ai_response):
         """Save conversation exchange to history"""
         try:
-            conversation_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'user_message': user_message,
-                'ai_response': ai_response,
-                'session': datetime.now().strftime('%Y-%m-%d')
-            }
-            self.conversation_history.append(conversation_entry)
-            
-            # Save to file
-            data = {
-                'conversations': self.conversation_history[-1000:],  # Keep last 1000
-                'total_exchanges': len(self.conversation_history),
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.conversation_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.conversation_store.append(user_message, ai_response)
             return True
         except Exception as e:
             print(f"⚠️ Error saving conversation: {e}")
             return False
     
-    def save_device_library(self):
-        """Save device library to persistent storage"""
-        try:
-            data = {
-                'devices': self.device_library,
-                'tags': self.device_tags,
-                'reputation': self.device_reputation,
-                'last_updated': datetime.now().isoformat(),
-                'total_devices': len(self.device_library)
-            }
-            with open(self.library_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            return True
-        except Exception as e:
-            print(f"⚠️ Error saving library: {e}")
-            return False
-    
     def tag_device(self, device_ip, tag, reason=''):
         """Tag a device with category (trusted, suspicious, unknown, threat, blocked)"""
         valid_tags = ['trusted', 'suspicious', 'unknown', 'threat', 'blocked', 'internal']
         if tag not in valid_tags:
             tag = 'unknown'
         
-        self.device_tags[device_ip] = {
-            'tag': tag,
-            'reason': reason,
-            'timestamp': time.time(),
-            'tagged_at': datetime.now().isoformat()
-        }
-        
-        # Update device library entry
-        if device_ip not in self.device_library:
-            self.device_library[device_ip] = {
-                'first_seen': datetime.now().isoformat(),
-                'total_connections': 0,
-                'threat_events': [],
-                'ports_accessed': []
-            }
-        
-        self.device_library[device_ip]['tag'] = tag
-        self.device_library[device_ip]['tag_reason'] = reason
-        self.device_library[device_ip]['last_updated'] = datetime.now().isoformat()
-        
-        # Auto-save after tagging
-        self.save_device_library()
+        # Marked dirty in memory; the write-behind flusher persists it
+        self.device_store.set_tag(device_ip, tag, reason)
         return True
     
     def update_device_reputation(self, device_ip, score_delta, event_type=''):
         """Update device reputation score based on behavior"""
-        if device_ip not in self.device_reputation:
-            self.device_reputation[device_ip] = {
-                'score': 50,  # Start neutral (0-100 scale)
-                'history': []
-            }
-        
-        # Update score
-        current_score = self.device_reputation[device_ip]['score']
-        new_score = max(0, min(100, current_score + score_delta))
-        self.device_reputation[device_ip]['score'] = new_score
-        
-        # Log event
-        self.device_reputation[device_ip]['history'].append({
-            'timestamp': datetime.now().isoformat(),
-            'event': event_type,
-            'score_change': score_delta,
-            'new_score': new_score
-        })
+        # Devices start neutral (50 on a 0-100 scale); the change is logged
+        new_score = self.device_store.adjust_reputation(device_ip, score_delta, event_type)
         
         # Auto-tag based on reputation
         if new_score >= 80:
@@ -990,19 +956,26 @@ class NetworkBusterAI:
     
     def get_device_history(self, device_ip):
         """Get complete historical data for a device"""
-        if device_ip not in self.device_library:
+        device_data = self.device_store.get_device(device_ip)
+        if device_data is None:
             return None
         
-        device_data = self.device_library[device_ip].copy()
-        device_data['tag_info'] = self.device_tags.get(device_ip, {'tag': 'unknown'})
-        device_data['reputation'] = self.device_reputation.get(device_ip, {'score': 50})
+        device_data['tag_info'] = self.device_store.get_tag(device_ip) or {'tag': 'unknown'}
+        device_data['reputation'] = self.device_store.get_reputation(device_ip) or {'score': 50}
         device_data['current_threat_score'] = self.threat_score_index.get(device_ip, 0)
         device_data['is_blocked'] = device_ip in self.blocked_devices
         
         return device_data
     
+    def _cached(self, key, compute):
+        ttl, stale_ttl = CACHE_TTLS[key]
+        return self.metrics_cache.get(key, compute, ttl=ttl, stale_ttl=stale_ttl)
+    
     def get_system_status(self):
         """Get comprehensive system status"""
+        return self._cached('status', self._collect_system_status)
+    
+    def _collect_system_status(self):
         status = []
         for service in self.services:
             is_active = self.check_port(service['port'])
@@ -1018,112 +991,105 @@ class NetworkBusterAI:
     def detect_microdevices(self):
         """Detect and analyze microdevice serialization attempts with AI barrier"""
         import time
-        from collections import defaultdict
         
         start_time = time.perf_counter()
         
-        # Get all network connections
-        connections = psutil.net_connections(kind='inet')
-        
-        # Index devices by remote address for O(1) lookups
-        device_index = defaultdict(list)
-        
-        for conn in connections:
-            if hasattr(conn, 'raddr') and conn.raddr:
-                remote_ip = conn.raddr.ip
-                remote_port = conn.raddr.port
-                
-                # Build device fingerprint
-                fingerprint = {
-                    'ip': remote_ip,
-                    'port': remote_port,
-                    'local_port': conn.laddr.port,
-                    'status': conn.status,
-                    'pid': conn.pid
-                }
-                
-                device_index[remote_ip].append(fingerprint)
-                
-                # Update connection history for pattern analysis
-                if remote_ip not in self.connection_history:
-                    self.connection_history[remote_ip] = {
-                        'first_seen': time.time(),
-                        'connection_count': 0,
-                        'ports_accessed': set()
-                    }
-                
-                self.connection_history[remote_ip]['connection_count'] += 1
-                self.connection_history[remote_ip]['ports_accessed'].add(conn.laddr.port)
-                self.connection_history[remote_ip]['last_seen'] = time.time()
-                
-                # Update historical device library
-                if remote_ip not in self.device_library:
-                    self.device_library[remote_ip] = {
-                        'first_seen': datetime.now().isoformat(),
-                        'total_connections': 0,
-                        'threat_events': [],
-                        'ports_accessed': []
-                    }
-                
-                self.device_library[remote_ip]['total_connections'] += 1
-                self.device_library[remote_ip]['last_seen'] = datetime.now().isoformat()
-                if conn.laddr.port not in self.device_library[remote_ip]['ports_accessed']:
-                    self.device_library[remote_ip]['ports_accessed'].append(conn.laddr.port)
-                
-                # Auto-tag localhost/internal devices
+        # Load all network connections into columns and group them per device
+        snapshot = ConnectionSnapshot.from_connections(psutil.net_connections(kind='inet'))
+        features = device_features(snapshot)
+        
+        # Update sliding-window connection rates for pattern analysis (one pass per device)
+        now = time.time()
+        observations = {}  # ip -> (connection count, local ports) for the library
+        rates = []
+        for i, (remote_ip, count) in enumerate(zip(features.ips, features.connections)):
+            count = int(count)
+            ports = features.ports(i)
+            rates.append(self.connection_rates.record(remote_ip, features.connection_keys(i), ports, now))
+            observations[remote_ip] = (count, ports)
+        self.connection_rates.prune(now)
+        self._forget_departed_devices()
+        
+        # Library writes from this scan are queued and flushed together
+        with self.device_store.batch():
+            self.device_store.record_connections(observations)
+            
+            # Auto-tag localhost/internal devices
+            for remote_ip in observations:
                 if remote_ip.startswith('127.') or remote_ip.startswith('192.168.') or remote_ip.startswith('10.'):
-                    if remote_ip not in self.device_tags:
+                    if self.device_store.get_tag(remote_ip) is None:
                         self.tag_device(remote_ip, 'internal', 'Internal network device')
+            
+            threats_detected = self._score_devices(features, rates)
+        
+        analysis_time = (time.perf_counter() - start_time) * 1000
+        
+        return {
+            'total_devices': len(features.ips),
+            'threats_detected': threats_detected,
+            'blocked_count': len(self.blocked_devices),
+            'blocked_devices': list(self.blocked_devices),
+            'total_attempts_logged': len(self.serialization_attempts),
+            'library_size': self.device_store.device_count(),
+            'tagged_devices': self.device_store.tag_count(),
+            'analysis_time_ms': round(analysis_time, 3)
+        }
+    
+    def _forget_departed_devices(self):
+        """Drop band and credit state for IPs the rate tracker has forgotten (left the window or evicted)"""
+        # Every scanned IP is both tracked and banded, so extra bands mean departures
+        tracked = self.connection_rates
+        if len(self.threat_bands) > len(tracked):
+            for ip in [ip for ip in self.threat_bands if ip not in tracked]:
+                del self.threat_bands[ip]
+                self.reputation_credited.pop(ip, None)
+    
+    def _score_devices(self, features, rates):
+        """AI-powered threat analysis: pattern rules applied to all devices at once"""
+        import time
+        
+        scores = score_devices(features, rates)
+        
+        # Store threat scores in indexed structure
+        self.threat_score_index.update(zip(features.ips, map(int, scores)))
         
-        # AI-powered threat analysis with indexed pattern matching
         threats_detected = []
-        for device_ip, device_conns in device_index.items():
-            threat_score = 0
-            reasons = []
-            
-            # Pattern 1: Port scanning (serialization reconnaissance)
-            unique_ports = len(set(c['local_port'] for c in device_conns))
-            if unique_ports > 10:
-                threat_score += 50
-                reasons.append(f"🔍 Port scanning: {unique_ports} ports")
-            
-            # Pattern 2: Rapid serialization attempts
-            if len(device_conns) > 20:
-                threat_score += 40
-                reasons.append(f"⚡ Serialization attack: {len(device_conns)} attempts")
-            
-            # Pattern 3: Critical service targeting
-            critical_ports = [3000, 3001, 4000, 5000]
-            critical_accessed = [c for c in device_conns if c['local_port'] in critical_ports]
-            if len(critical_accessed) > 3:
-                threat_score += 30
-                reasons.append("🎯 Critical service targeting")
-            
-            # Pattern 4: Historical suspicious behavior
-            if device_ip in self.connection_history:
-                hist = self.connection_history[device_ip]
-                if hist['connection_count'] > 100:
-                    threat_score += 20
-                    reasons.append(f"📊 High activity: {hist['connection_count']} total")
+        flagged_ids = set(flagged(scores, WARN_SCORE))
+        now = time.time()
+        for i, device_ip in enumerate(features.ips):
+            # Scans repeat every few seconds: reputation, tags and threat events
+            # change only when a device moves between bands, not on every scan
+            previous = self.threat_bands.get(device_ip)
+            if i not in flagged_ids:
+                self.threat_bands[device_ip] = 'clear'
+                # Good behavior - increase reputation at most once per interval
+                if previous != 'clear' or now - self.reputation_credited.get(device_ip, 0) >= REPUTATION_CREDIT_INTERVAL:
+                    self.reputation_credited[device_ip] = now
+                    self.update_device_reputation(device_ip, 1, 'Normal activity')
+                continue
             
-            # Store threat score in indexed structure
-            self.threat_score_index[device_ip] = threat_score
+            threat_score = int(scores[i])
+            reasons = threat_reasons(features, i, rates[i])
+            blocked = threat_score >= BLOCK_SCORE
+            band = self.threat_bands[device_ip] = 'blocked' if blocked else 'warning'
             
             # AI barrier decision: Block or monitor
-            if threat_score >= 70:
-                threats_detected.append({
-                    'ip': device_ip,
-                    'threat_score': threat_score,
-                    'connections': len(device_conns),
-                    'unique_ports': unique_ports,
-                    'reasons': reasons,
-                    'status': 'BLOCKED',
-                    'action': 'Barrier activated',
-                    'tag': self.device_tags.get(device_ip, {}).get('tag', 'unknown')
-                })
+            threats_detected.append({
+                'ip': device_ip,
+                'threat_score': threat_score,
+                'connections': int(features.connections[i]),
+                'unique_ports': int(features.unique_ports[i]),
+                'reasons': reasons,
+                'status': 'BLOCKED' if blocked else 'WARNING',
+                'action': 'Barrier activated' if blocked else 'Monitoring enabled',
+                'tag': (self.device_store.get_tag(device_ip) or {}).get('tag', 'unknown')
+            })
+            if band == previous:
+                continue
+            if blocked:
                 self.blocked_devices.add(device_ip)
                 self.serialization_attempts.append({
-                    'timestamp': time.time(),
+                    'timestamp': now,
                     'ip': device_ip,
                     'score': threat_score
                 })
@@ -1131,50 +1097,19 @@ class NetworkBusterAI:
                 self.tag_device(device_ip, 'blocked', f'Threat score: {threat_score}')
                 self.update_device_reputation(device_ip, -30, 'High threat detected')
                 # Log threat event
-                if device_ip in self.device_library:
-                    self.device_library[device_ip]['threat_events'].append({
-                        'timestamp': datetime.now().isoformat(),
-                        'threat_score': threat_score,
-                        'reasons': reasons,
-                        'action': 'blocked'
-                    })
-            elif threat_score >= 40:
-                threats_detected.append({
-                    'ip': device_ip,
-                    'threat_score': threat_score,
-                    'connections': len(device_conns),
-                    'unique_ports': unique_ports,
-                    'reasons': reasons,
-                    'status': 'WARNING',
-                    'action': 'Monitoring enabled',
-                    'tag': self.device_tags.get(device_ip, {}).get('tag', 'unknown')
-                })
+                self.device_store.add_threat_event(device_ip, threat_score, reasons, 'blocked')
+            else:
                 # Tag as suspicious and update reputation
                 self.tag_device(device_ip, 'suspicious', f'Warning level threat: {threat_score}')
                 self.update_device_reputation(device_ip, -10, 'Suspicious activity')
-            else:
-                # Good behavior - increase reputation
-                if device_ip in self.device_library:
-                    self.update_device_reputation(device_ip, 1, 'Normal activity')
-        
-        analysis_time = (time.perf_counter() - start_time) * 1000
         
-        # Save updated library after analysis
-        self.save_device_library()
-        
-        return {
-            'total_devices': len(device_index),
-            'threats_detected': threats_detected,
-            'blocked_count': len(self.blocked_devices),
-            'blocked_devices': list(self.blocked_devices),
-            'total_attempts_logged': len(self.serialization_attempts),
-            'library_size': len(self.device_library),
-            'tagged_devices': len(self.device_tags),
-            'analysis_time_ms': round(analysis_time, 3)
-        }
+        return threats_detected
     
     def analyze_network(self):
         """Analyze network connections with supercomputer-grade indexing"""
+        return self._cached('network', self._collect_network)
+    
+    def _collect_network(self):
         import time
         start_time = time.perf_counter()
         
@@ -1216,16 +1151,14 @@ class NetworkBusterAI:
     
     def get_system_health(self):
         """Get comprehensive system health with supercomputer-grade metrics"""
+        return self._cached('health', self._collect_health)
+    
+    def _collect_health(self):
         import time
         start_time = time.perf_counter()
         
-        # Check cache (5 second TTL)
-        current_time = time.time()
-        if 'health' in self.metrics_cache and (current_time - self.cache_timestamp) < 5:
-            return self.metrics_cache['health']
-        
-        # CPU metrics with per-core analysis
-        cpu_percent = psutil.cpu_percent(interval=0.5, percpu=False)
+        # CPU metrics with per-core analysis (rolling background samples, never blocks)
+        cpu_stats = cpu_sampler.stats()
         cpu_cores = psutil.cpu_count(logical=False)
         cpu_threads = psutil.cpu_count(logical=True)
         cpu_freq = psutil.cpu_freq()
@@ -1247,8 +1180,14 @@ class NetworkBusterAI:
         
         analysis_time = (time.perf_counter() - start_time) * 1000
         
-        health_data = {
-            'cpu_usage': round(cpu_percent, 2),
+        return {
+            'cpu_usage': cpu_stats['mean'],
+            'cpu_current': cpu_stats['current'],
+            'cpu_min': cpu_stats['min'],
+            'cpu_max': cpu_stats['max'],
+            'cpu_per_core': cpu_stats['per_core'],
+            'cpu_process': cpu_stats['process'],
+            'cpu_window_seconds': cpu_stats['window_seconds'],
             'cpu_cores': cpu_cores,
             'cpu_threads': cpu_threads,
             'cpu_frequency_mhz': round(cpu_freq.current, 2) if cpu_freq else 0,
@@ -1269,281 +1208,180 @@ class NetworkBusterAI:
             'load_average': [round(l, 2) for l in load_avg],
             'analysis_time_ms': round(analysis_time, 3)
         }
+    
+    def run_scan(self):
+        """One background scan: services, microdevices, network and health"""
+        import time
         
-        # Cache results
-        self.metrics_cache['health'] = health_data
-        self.cache_timestamp = current_time
-        
-        return health_data
+        devices = self.detect_microdevices()
+        return {
+            'services': self.get_system_status(),
+            'devices': devices,
+            'network': self.analyze_network(),
+            'health': self.get_system_health(),
+            'signals': {
+                'devices_monitored': len(self.connection_rates),
+                'active_threats': sum(1 for score in self.threat_score_index.values() if score >= WARN_SCORE),
+                'blocked_devices': len(self.blocked_devices),
+                'new_devices': self.device_store.seen_since(time.time() - 10),  # Indexed on last_seen
+                'library_size': self.device_store.device_count(),
+                'tagged_devices': self.device_store.tag_count(),
+                'reputation_count': self.device_store.reputation_count(),
+                'serialization_attempts': len(self.serialization_attempts)
+            }
+        }
+    
+    def current_scan(self):
+        """Latest background scan snapshot (waits for the first scan after startup)"""
+        snapshot = self.scanner.latest(wait=30)
+        if snapshot is None:
+            raise RuntimeError(self.scanner.last_error or 'Background scan not ready')
+        return snapshot
     
     def process_query(self, query):
         """Process user query and generate intelligent response"""
-        query_lower = query.lower()
+        return self.answer(query)['response']
+    
+    def answer(self, query, html=True):
+        """Chat reply: intent name, structured data and (unless html=False) the rendered HTML"""
+        intent, handler = self.router.select(query)
+        name = intent.name if intent else 'default'
+        if intent is not None and intent.memoize:
+            # Cached entries are shared; only ever add the rendered HTML to them
+            entry = self.reply_cache.get(name, self.current_scan().generation, lambda: {'data': handler(query)})
+        else:
+            entry = {'data': handler(query)}
+        reply = {'intent': name, 'data': entry['data']}
+        if html:
+            if 'response' not in entry:
+                entry['response'] = chat_templates.render(name, entry['data'])
+            reply['response'] = entry['response']
+        return reply
+    
+    def _respond_status(self, query):
+        """System status with supercomputer analysis"""
+        import time
+        scan_start = time.perf_counter()
         
-        # System status command with supercomputer analysis
-        if 'status' in query_lower or 'services' in query_lower:
-            import time
-            scan_start = time.perf_counter()
-            
-            status = self.get_system_status()
-            active = [s for s in status if s['active']]
-            inactive = [s for s in status if not s['active']]
-            critical_down = [s for s in inactive if s.get('critical', False)]
-            
-            scan_time = (time.perf_counter() - scan_start) * 1000
-            
-            response = f"📊 <strong>SUPERCOMPUTER SYSTEM ANALYSIS</strong><br>"
-            response += f"<code>Scan completed in {scan_time:.3f}ms</code><br><br>"
-            response += f"✅ <strong>SERVICE STATUS: {len(active)}/{len(status)} OPERATIONAL</strong><br><br>"
-            
-            # Critical services check
-            if critical_down:
-                response += "<strong>⚠️ CRITICAL SERVICES DOWN:</strong><br>"
-                for s in critical_down:
-                    response += f"• <code style='color:#ef4444'>{s['name']}</code> (Port {s['port']}) - CRITICAL OFFLINE<br>"
-                response += "<br>"
-            
-            # Active services by type
-            if active:
-                response += "<strong>🟢 ACTIVE SERVICES:</strong><br>"
-                node_services = [s for s in active if s.get('type') == 'node']
-                python_services = [s for s in active if s.get('type') == 'python']
-                
-                if node_services:
-                    response += "<em>Node.js Services:</em><br>"
-                    for s in node_services:
-                        response += f"• <code>{s['name']}</code> → Port {s['port']} → ONLINE<br>"
-                
-                if python_services:
-                    response += "<em>Python Services:</em><br>"
-                    for s in python_services:
-                        critical_badge = " 🔴" if s.get('critical') else ""
-                        response += f"• <code>{s['name']}</code> → Port {s['port']} → ONLINE{critical_badge}<br>"
-            
-            if inactive and not critical_down:
-                response += f"<br><strong>⚪ INACTIVE SERVICES ({len(inactive)}):</strong><br>"
-                for s in inactive:
-                    response += f"• <code>{s['name']}</code> (Port {s['port']}) - Standby<br>"
-            
-            response += f"<br><code>Index lookup time: O(1) constant time</code>"
-            return response
-        
-        # Network scan command with supercomputer analysis
-        elif 'network' in query_lower and ('scan' in query_lower or 'analyze' in query_lower):
-            net = self.analyze_network()
-            response = f"🌐 <strong>SUPERCOMPUTER NETWORK ANALYSIS</strong><br>"
-            response += f"<code>Analysis time: {net['analysis_time_ms']}ms</code><br><br>"
-            
-            response += f"<strong>📊 CONNECTION METRICS:</strong><br>"
-            response += f"• Total Connections: <strong>{net['total_connections']}</strong><br>"
-            response += f"• Listening Ports: <strong>{net['listening_ports']}</strong><br>"
-            response += f"• Established: <strong>{net['established']}</strong><br><br>"
-            
-            response += f"<strong>🔌 PROTOCOL DISTRIBUTION:</strong><br>"
-            for protocol, count in net['protocol_distribution'].items():
-                response += f"• {protocol}: <strong>{count}</strong> connections<br>"
-            
-            if net.get('status_breakdown'):
-                response += f"<br><strong>📍 CONNECTION STATUS INDEX:</strong><br>"
-                for status, count in sorted(net['status_breakdown'].items(), key=lambda x: -x[1])[:5]:
-                    response += f"• <code>{status}</code>: {count}<br>"
-            
-            if net.get('port_usage'):
-                response += f"<br><strong>🔌 SERVICE PORT USAGE:</strong><br>"
-                for port, count in sorted(net['port_usage'].items()):
-                    service_name = self.port_index.get(port, {}).get('name', 'Unknown')
-                    response += f"• Port {port} (<code>{service_name}</code>): {count} connections<br>"
-            
-            response += f"<br><code>Indexed lookup performance: O(1) hash table</code>"
-            return response
-        
-        # Health report command with supercomputer metrics
-        elif 'health' in query_lower or 'performance' in query_lower:
-            health = self.get_system_health()
-            response = f"💪 <strong>SUPERCOMPUTER HEALTH ANALYSIS</strong><br>"
-            response += f"<code>Metrics cached | Query time: {health['analysis_time_ms']}ms</code><br><br>"
-            
-            response += f"<strong>⚡ CPU METRICS:</strong><br>"
-            response += f"• Usage: <strong>{health['cpu_usage']}%</strong><br>"
-            response += f"• Cores: <strong>{health['cpu_cores']}</strong> physical / <strong>{health['cpu_threads']}</strong> logical<br>"
-            response += f"• Frequency: <strong>{health['cpu_frequency_mhz']} MHz</strong><br><br>"
-            
-            response += f"<strong>💾 MEMORY ANALYSIS:</strong><br>"
-            response += f"• RAM Usage: <strong>{health['memory_usage']}%</strong><br>"
-            response += f"• Used: <strong>{health['memory_used_gb']} GB</strong> / Total: <strong>{health['memory_total_gb']} GB</strong><br>"
-            response += f"• Available: <strong>{health['memory_available_gb']} GB</strong><br>"
-            response += f"• Swap: <strong>{health['swap_usage']}%</strong> ({health['swap_total_gb']} GB)<br><br>"
-            
-            response += f"<strong>💿 DISK I/O METRICS:</strong><br>"
-            response += f"• Usage: <strong>{health['disk_usage']}%</strong><br>"
-            response += f"• Free Space: <strong>{health['disk_free_gb']} GB</strong> / <strong>{health['disk_total_gb']} GB</strong><br>"
-            response += f"• Read: <strong>{health['disk_read_mb']} MB</strong> | Write: <strong>{health['disk_write_mb']} MB</strong><br><br>"
-            
-            response += f"<strong>🌐 NETWORK I/O:</strong><br>"
-            response += f"• Sent: <strong>{health['network_sent_mb']} MB</strong><br>"
-            response += f"• Received: <strong>{health['network_recv_mb']} MB</strong><br><br>"
-            
-            response += f"<strong>📊 SYSTEM LOAD:</strong><br>"
-            response += f"• Active Processes: <strong>{health['process_count']}</strong><br>"
-            if health['load_average'][0] > 0:
-                response += f"• Load Average: <strong>{health['load_average'][0]}</strong> (1m) / <strong>{health['load_average'][1]}</strong> (5m) / <strong>{health['load_average'][2]}</strong> (15m)<br><br>"
-            else:
-                response += "<br>"
-            
-            # Performance assessment
-            if health['cpu_usage'] > 80:
-                response += "⚠️ <strong>High CPU usage</strong> - Consider closing unused applications<br>"
-            if health['memory_usage'] > 80:
-                response += "⚠️ <strong>High memory pressure</strong> - Services may need restart<br>"
-            if health['disk_usage'] > 90:
-                response += "⚠️ <strong>Low disk space</strong> - Run cleanup operations<br>"
-            
-            if health['cpu_usage'] < 60 and health['memory_usage'] < 70:
-                response += "✅ <strong>System operating at optimal performance!</strong><br>"
-            
-            response += f"<br><code>Metrics cached with 5s TTL for performance</code>"
-            return response
+        status = self.current_scan().results['services']
+        active = [s for s in status if s['active']]
+        inactive = [s for s in status if not s['active']]
         
-        # Diagnose command
-        elif 'diagnose' in query_lower or 'troubleshoot' in query_lower:
-            status = self.get_system_status()
-            inactive = [s for s in status if not s['active']]
-            
-            response = f"🔍 <strong>Diagnostic Report</strong><br><br>"
-            
-            if not inactive:
-                response += "✅ All services are running correctly!<br><br>"
-                response += "No issues detected. System is healthy."
-            else:
-                response += f"⚠️ <strong>{len(inactive)} Service(s) Not Running</strong><br><br>"
-                response += "<strong>Recommended Actions:</strong><br>"
-                response += "1. Run <code>AUTOSTART.bat</code> to start all services<br>"
-                response += "2. Or use <code>nb-start</code> PowerShell command<br>"
-                response += "3. Check logs for any error messages<br><br>"
-                response += "<strong>Inactive Services:</strong><br>"
-                for s in inactive:
-                    response += f"• {s['name']} (Port {s['port']})<br>"
-            
-            return response
-        
-        # Optimize command
-        elif 'optimize' in query_lower or 'performance' in query_lower:
-            health = self.get_system_health()
-            response = f"⚡ <strong>Optimization Recommendations</strong><br><br>"
-            response += "<strong>Performance Tuning:</strong><br>"
-            response += "• Run <code>nb-autostart</code> for boot optimization<br>"
-            response += "• Enable high-performance power plan<br>"
-            response += "• Close unused background applications<br>"
-            response += "• Clear browser cache and temporary files<br>"
-            response += "• Run <code>flash_git_backup.py</code> to free space<br><br>"
-            
-            if health['cpu_usage'] < 50 and health['memory_usage'] < 50:
-                response += "✅ System resources are well-balanced!"
-            else:
-                response += "💡 Consider restarting services during low-usage periods."
-            
-            return response
+        return {
+            'total': len(status),
+            'active_count': len(active),
+            'node_services': [s for s in active if s.get('type') == 'node'],
+            'python_services': [s for s in active if s.get('type') == 'python'],
+            'inactive': inactive,
+            'critical_down': [s for s in inactive if s.get('critical', False)],
+            'scan_time_ms': (time.perf_counter() - scan_start) * 1000
+        }
+    
+    def _respond_network(self, query):
+        """Network scan with supercomputer analysis"""
+        net = self.current_scan().results['network']
+        top_statuses = sorted(net.get('status_breakdown', {}).items(), key=lambda x: -x[1])[:5]
+        return {
+            'analysis_time_ms': net['analysis_time_ms'],
+            'total_connections': net['total_connections'],
+            'listening_ports': net['listening_ports'],
+            'established': net['established'],
+            'protocol_distribution': net['protocol_distribution'],
+            'top_statuses': [{'status': status, 'count': count} for status, count in top_statuses],
+            'service_ports': [{'port': port, 'service': self.port_index.get(port, {}).get('name', 'Unknown'),
+                               'count': count} for port, count in sorted(net.get('port_usage', {}).items())]
+        }
+    
+    def _respond_health(self, query):
+        """Health report with supercomputer metrics"""
+        health = dict(self.current_scan().results['health'])
         
-        # Security check command with microdevice barrier analysis
-        elif 'security' in query_lower or 'secure' in query_lower or 'device' in query_lower or 'threat' in query_lower:
-            # Run microdevice detection
-            device_scan = self.detect_microdevices()
-            
-            response = f"🔒 <strong>AI SECURITY BARRIER ANALYSIS</strong><br>"
-            response += f"<code>Deep scan completed in {device_scan['analysis_time_ms']}ms</code><br><br>"
-            
-            response += f"<strong>🛡️ MICRODEVICE DETECTION:</strong><br>"
-            response += f"• Total Devices Scanned: <strong>{device_scan['total_devices']}</strong><br>"
-            response += f"• Threats Detected: <strong>{len(device_scan['threats_detected'])}</strong><br>"
-            response += f"• Blocked Devices: <strong>{device_scan['blocked_count']}</strong><br>"
-            response += f"• Serialization Attempts Logged: <strong>{device_scan['total_attempts_logged']}</strong><br>"
-            response += f"• Historical Library Size: <strong>{device_scan['library_size']}</strong> devices<br>"
-            response += f"• Tagged Devices: <strong>{device_scan['tagged_devices']}</strong><br><br>"
-            
-            # Show threat details
-            if device_scan['threats_detected']:
-                response += f"<strong>⚠️ ACTIVE THREATS:</strong><br>"
-                for threat in device_scan['threats_detected'][:5]:  # Top 5 threats
-                    status_color = '#ef4444' if threat['status'] == 'BLOCKED' else '#f59e0b'
-                    tag = threat.get('tag', 'unknown')
-                    tag_color = {'blocked': '#ef4444', 'threat': '#dc2626', 'suspicious': '#f59e0b', 
-                                'internal': '#3b82f6', 'trusted': '#22c55e', 'unknown': '#6b7280'}.get(tag, '#6b7280')
-                    response += f"<div style='margin: 10px 0; padding: 10px; background: rgba(0,0,0,0.3); border-left: 3px solid {status_color}; border-radius: 5px;'>"
-                    response += f"<strong style='color:{status_color}'>{threat['status']}</strong> | IP: <code>{threat['ip']}</code> "
-                    response += f"| Tag: <span style='color:{tag_color}'>🏷️ {tag.upper()}</span><br>"
-                    response += f"Threat Score: <strong>{threat['threat_score']}/100</strong><br>"
-                    response += f"Connections: {threat['connections']} | Ports: {threat['unique_ports']}<br>"
-                    response += f"<em>Reasons:</em><br>"
-                    for reason in threat['reasons']:
-                        response += f"  • {reason}<br>"
-                    response += f"<strong>Action:</strong> {threat['action']}<br>"
-                    response += f"</div>"
-                
-                if len(device_scan['threats_detected']) > 5:
-                    response += f"<em>...and {len(device_scan['threats_detected']) - 5} more threats</em><br>"
-            else:
-                response += "<strong>✅ NO THREATS DETECTED</strong><br>"
-                response += "All devices are within normal parameters.<br>"
-            
-            response += "<br><strong>🔐 SECURITY STATUS:</strong><br>"
-            response += "• AI Barrier: <strong style='color:#22c55e'>ACTIVE</strong><br>"
-            response += "• Pattern Recognition: <strong>ENABLED</strong><br>"
-            response += "• Real-time Monitoring: <strong>ONLINE</strong><br>"
-            response += "• Historical Device Library: <strong>TRACKING</strong><br>"
-            response += "• Device Tagging System: <strong>OPERATIONAL</strong><br>"
-            response += "• Reputation Scoring: <strong>ACTIVE</strong><br>"
-            response += "• Indexed Threat Database: <strong>O(1) lookup</strong><br>"
-            response += "• CORS Protection: <strong>ENABLED</strong><br>"
-            response += "• Localhost Isolation: <strong>ACTIVE</strong><br><br>"
-            
-            response += "<strong>📋 RECOMMENDATIONS:</strong><br>"
-            response += "• Monitor blocked devices regularly<br>"
-            response += "• Run <code>security check</code> periodically<br>"
-            response += "• Review historical device library<br>"
-            response += "• Check device tags and reputation scores<br>"
-            response += "• Review serialization attempt logs<br>"
-            response += "• Keep firewall rules updated<br>"
-            
-            response += f"<br><code>AI barrier with persistent historical library</code>"
-            return response
-        
-        # Help command
-        elif 'help' in query_lower or 'commands' in query_lower:
-            response = f"📚 <strong>NetworkBuster AI Commands</strong><br><br>"
-            response += "<strong>Available Commands:</strong><br>"
-            response += "• <code>system status</code> - Check all services with indexed analysis<br>"
-            response += "• <code>network scan</code> - Analyze connections and protocols<br>"
-            response += "• <code>health report</code> - Comprehensive system metrics<br>"
-            response += "• <code>security check</code> - AI microdevice barrier scan 🛡️<br>"
-            response += "• <code>diagnose</code> - Troubleshoot issues<br>"
-            response += "• <code>optimize</code> - Performance tips<br>"
-            response += "• <code>security check</code> - Security analysis<br>"
-            response += "• <code>help</code> - Show this message<br><br>"
-            response += "You can also ask questions in natural language!"
-            return response
-        
-        # Default intelligent response
-        else:
-            response = f"🤔 I understand you're asking about: <em>{query}</em><br><br>"
-            response += "I'm NetworkBuster AI with <strong>Historical Device Library</strong>, specialized in:<br><br>"
-            response += "• System status and service health<br>"
-            response += "• Network analysis and connectivity<br>"
-            response += "• Performance optimization<br>"
-            response += "• Security with device tagging & tracking 🏷️<br>"
-            response += "• Microdevice threat detection 🛡️<br>"
-            response += "• Historical pattern analysis 📚<br><br>"
-            response += "Type <code>help</code> to see all available commands!"
-            return response
+        # Performance assessment
+        warnings = []
+        if health['cpu_usage'] > 80:
+            warnings.append({'title': 'High CPU usage', 'advice': 'Consider closing unused applications'})
+        if health['memory_usage'] > 80:
+            warnings.append({'title': 'High memory pressure', 'advice': 'Services may need restart'})
+        if health['disk_usage'] > 90:
+            warnings.append({'title': 'Low disk space', 'advice': 'Run cleanup operations'})
+        health['warnings'] = warnings
+        health['optimal'] = health['cpu_usage'] < 60 and health['memory_usage'] < 70
+        return health
+    
+    def _respond_diagnose(self, query):
+        """Diagnostic report for inactive services"""
+        status = self.current_scan().results['services']
+        inactive = [s for s in status if not s['active']]
+        return {'healthy': not inactive, 'inactive': inactive}
+    
+    def _respond_optimize(self, query):
+        """Optimization recommendations"""
+        health = self.current_scan().results['health']
+        return {
+            'cpu_usage': health['cpu_usage'],
+            'memory_usage': health['memory_usage'],
+            'balanced': health['cpu_usage'] < 50 and health['memory_usage'] < 50
+        }
+    
+    def _respond_security(self, query):
+        """Security check with microdevice barrier analysis"""
+        # Latest background microdevice detection
+        import time
+        scan = self.current_scan()
+        device_scan = scan.results['devices']
+        threats = device_scan['threats_detected']
+        return {
+            'analysis_time_ms': device_scan['analysis_time_ms'],
+            'scan_age_seconds': time.time() - scan.taken_at,
+            'total_devices': device_scan['total_devices'],
+            'threat_count': len(threats),
+            'blocked_count': device_scan['blocked_count'],
+            'total_attempts_logged': device_scan['total_attempts_logged'],
+            'library_size': device_scan['library_size'],
+            'tagged_devices': device_scan['tagged_devices'],
+            # Only the cards the reply shows; large threat lists stay in the scan
+            'threats': threats[:chat_templates.THREATS_SHOWN]
+        }
+    
+    def _respond_help(self, query):
+        """Command reference"""
+        return {'commands': chat_templates.HELP_COMMANDS}
+    
+    def _respond_default(self, query):
+        """Default intelligent response"""
+        return {'query': query}
+
+# Initialize AI with Historical Library in the background: opening (and migrating)
+# the stores must not hold up binding the port. ai_engine is set once it is built.
+ai_engine = None
+
+def build_engine():
+    """Construct the AI engine and start its background scans"""
+    global ai_engine
+    print("\n🧠 Initializing NetworkBuster AI with Historical Device Library...")
+    engine = NetworkBusterAI()
+    engine.scanner.start()
+    ai_engine = engine
+    print(f"✅ AI Engine ready with {engine.device_store.device_count()} historical devices")
+    print(f"   🏷️  Tagged Devices: {engine.device_store.tag_count()}")
+    print(f"   🛡️  Blocked Threats: {len(engine.blocked_devices)}")
+    print(f"   📊 Reputation Scores: {engine.device_store.reputation_count()} devices")
+    print(f"   Library DB: {engine.device_store.path}")
+    print(f"   Background scan every {engine.scanner.interval:g}s\n")
+    return engine
 
-# Initialize AI with Historical Library
-print("\n🧠 Initializing NetworkBuster AI with Historical Device Library...")
-ai_engine = NetworkBusterAI()
-print(f"✅ AI Engine ready with {len(ai_engine.device_library)} historical devices\n")
+engine_startup = DeferredInit(build_engine, name='nbai-engine')
+register_readiness(app, engine_startup, exempt={'index', 'signal_monitor', 'conversation_history'})
+
+# Page shells have no template variables; encode them once and serve with ETags
+NBAI_PAGE = StaticAsset(NBAI_TEMPLATE)
+SIGNAL_MONITOR_PAGE = StaticAsset(AI_SIGNAL_MONITOR)
+HISTORY_PAGE = FileAsset(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'conversation_history_template.html'))
 
 @app.route('/')
 def index():
     """Render NetworkBuster AI interface"""
-    return render_template_string(NBAI_TEMPLATE)
+    return NBAI_PAGE.response()
 
 @app.route('/chat', methods=['POST'])
 def chat():
@@ -1556,15 +1394,17 @@ def chat():
             return jsonify({'error': 'No message provided'}), 400
         
         # Process query through AI engine
-        response = ai_engine.process_query(user_message)
+        reply = ai_engine.answer(user_message)
         
-        # Save to conversation history
-        ai_engine.save_conversation(user_message, response)
+        # Save to conversation history (always the rendered HTML, so history and search read the same)
+        ai_engine.save_conversation(user_message, reply['response'])
         
-        return jsonify({
-            'response': response,
-            'timestamp': datetime.now().isoformat()
-        })
+        # Format 'data' returns only the structured reply
+        if data.get('format') == 'data':
+            del reply['response']
+        
+        reply['timestamp'] = datetime.now().isoformat()
+        return jsonify(reply)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1573,14 +1413,15 @@ def chat():
 def status():
     """Get system status"""
     try:
-        services = ai_engine.get_system_status()
-        health = ai_engine.get_system_health()
-        network = ai_engine.analyze_network()
+        scan = ai_engine.current_scan()
         
         return jsonify({
-            'services': services,
-            'health': health,
-            'network': network,
+            'services': scan.results['services'],
+            'health': scan.results['health'],
+            'network': scan.results['network'],
+            'scan': ai_engine.scanner.status(),
+            'cache': ai_engine.metrics_cache.stats(),
+            'reply_cache': ai_engine.reply_cache.stats(),
             'timestamp': datetime.now().isoformat()
         })
     
@@ -1591,8 +1432,9 @@ def status():
 def diagnose():
     """Run diagnostics"""
     try:
-        status = ai_engine.get_system_status()
-        health = ai_engine.get_system_health()
+        scan = ai_engine.current_scan()
+        status = scan.results['services']
+        health = scan.results['health']
         
         inactive_services = [s for s in status if not s['active']]
         
@@ -1619,30 +1461,82 @@ def diagnose():
 @app.route('/monitor')
 def signal_monitor():
     """Render AI Signal Monitor - Read-only window"""
-    return render_template_string(AI_SIGNAL_MONITOR)
+    return SIGNAL_MONITOR_PAGE.response()
 
 @app.route('/history')
 def conversation_history():
     """Render Conversation History page"""
-    with open('conversation_history_template.html', 'r', encoding='utf-8') as f:
-        template = f.read()
-    return template
+    return HISTORY_PAGE.response()
 
 @app.route('/api/nbai/conversations', methods=['GET'])
 def get_conversations():
-    """Get all conversation history"""
+    """Get conversation history, newest first (?cursor=&limit=&session=&since=)"""
     try:
-        today = datetime.now().strftime('%Y-%m-%d')
-        today_count = sum(1 for conv in ai_engine.conversation_history 
-                         if conv.get('session') == today)
+        store = ai_engine.conversation_store
+        conversations, next_cursor = store.page(
+            cursor=request.args.get('cursor', type=int),
+            limit=request.args.get('limit', 50, type=int),
+            session=request.args.get('session') or None,
+            since=request.args.get('since') or None
+        )
         
-        sessions = set(conv.get('session') for conv in ai_engine.conversation_history)
+        return jsonify({
+            'conversations': conversations,
+            'next_cursor': next_cursor,
+            **store.counts(),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/nbai/conversations/export', methods=['GET'])
+def export_conversations():
+    """Download the whole conversation history as JSON, streamed page by page (?session=&since=)"""
+    store = ai_engine.conversation_store
+    session = request.args.get('session') or None
+    since = request.args.get('since') or None
+    
+    def generate():
+        yield '{"exported": %s, "conversations": [' % json.dumps(datetime.now().isoformat())
+        count = 0
+        for entry in store.iter_all(session, since):
+            yield (',\n' if count else '\n') + json.dumps(entry)
+            count += 1
+        yield '\n], "total_conversations": %d}\n' % count
+    
+    filename = f"networkbuster-conversations-{datetime.now().strftime('%Y-%m-%d')}.json"
+    return Response(generate(), mimetype='application/json',
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+@app.route('/api/nbai/conversations/search', methods=['GET'])
+def search_conversations():
+    """Full-text search over conversation history (?q=&limit=&order=rank|recent)
+
+    Ranked searches score at most the newest RANK_CANDIDATES matches;
+    truncated says when older matches were left out and ranked_over how
+    many were scored.
+    """
+    try:
+        import time
+        
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'No query provided'}), 400
+        
+        start_time = time.perf_counter()
+        hits, truncated = ai_engine.conversation_store.search(
+            query,
+            limit=request.args.get('limit', 20, type=int),
+            recent=request.args.get('order') == 'recent'
+        )
         
         return jsonify({
-            'conversations': ai_engine.conversation_history,
-            'total_count': len(ai_engine.conversation_history),
-            'today_count': today_count,
-            'session_count': len(sessions),
+            'query': query,
+            'hits': hits,
+            'count': len(hits),
+            'truncated': truncated,
+            'ranked_over': RANK_CANDIDATES if truncated else None,
+            'took_ms': round((time.perf_counter() - start_time) * 1000, 3),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -1654,9 +1548,11 @@ def signal_status():
     try:
         import time
         
-        # Get comprehensive status
-        status = ai_engine.get_system_status()
-        health = ai_engine.get_system_health()
+        # Everything comes from the latest background scan
+        scan = ai_engine.current_scan()
+        status = scan.results['services']
+        health = scan.results['health']
+        signals = scan.results['signals']
         
         # Device and threat metrics
         active_services = len([s for s in status if s['active']])
@@ -1665,16 +1561,14 @@ def signal_status():
         recent_activity = []
         
         # Check for new threats
-        if len(ai_engine.blocked_devices) > 0:
+        if signals['blocked_devices'] > 0:
             recent_activity.append({
-                'message': f'🛡️ {len(ai_engine.blocked_devices)} devices blocked by barrier',
+                'message': f'🛡️ {signals["blocked_devices"]} devices blocked by barrier',
                 'type': 'threat'
             })
         
         # Check for new devices
-        new_devices = sum(1 for ip, data in ai_engine.device_library.items() 
-                         if 'last_seen' in data and 
-                         (datetime.now() - datetime.fromisoformat(data['last_seen'])).seconds < 10)
+        new_devices = signals['new_devices']
         if new_devices > 0:
             recent_activity.append({
                 'message': f'📡 {new_devices} new device(s) detected',
@@ -1701,22 +1595,25 @@ def signal_status():
             'signal_strength': 100,
             'ai_engine_online': True,
             
+            'scan_generation': scan.generation,
+            'scan_age_seconds': round(time.time() - scan.taken_at, 2),
+            
             # Security metrics
-            'devices_monitored': len(ai_engine.connection_history),
-            'active_threats': len([ip for ip, score in ai_engine.threat_score_index.items() if score >= 40]),
-            'blocked_devices': len(ai_engine.blocked_devices),
+            'devices_monitored': signals['devices_monitored'],
+            'active_threats': signals['active_threats'],
+            'blocked_devices': signals['blocked_devices'],
             
             # System metrics
             'cpu_usage': round(health['cpu_usage'], 1),
             'memory_usage': round(health['memory_usage'], 1),
             'active_services': active_services,
-            'network_connections': len(psutil.net_connections()),
+            'network_connections': scan.results['network']['total_connections'],
             
             # Historical library
-            'library_size': len(ai_engine.device_library),
-            'tagged_devices': len(ai_engine.device_tags),
-            'reputation_count': len(ai_engine.device_reputation),
-            'serialization_attempts': len(ai_engine.serialization_attempts),
+            'library_size': signals['library_size'],
+            'tagged_devices': signals['tagged_devices'],
+            'reputation_count': signals['reputation_count'],
+            'serialization_attempts': signals['serialization_attempts'],
             
             # Activity feed
             'recent_activity': recent_activity[-10:]  # Last 10 activities
@@ -1737,16 +1634,11 @@ def main():
     print("║  NetworkBuster AI - Intelligent Network Assistant         ║")
     print("║  with Historical Device Library & Threat Tagging          ║")
     print("═" * 60)
-    print("\n🧠 AI Engine Status:")
-    print(f"   📚 Historical Library: {len(ai_engine.device_library)} devices tracked")
-    print(f"   🏷️  Tagged Devices: {len(ai_engine.device_tags)}")
-    print(f"   🛡️  Blocked Threats: {len(ai_engine.blocked_devices)}")
-    print(f"   📊 Reputation Scores: {len(ai_engine.device_reputation)} devices")
     print(f"\n🌐 Server Details:")
     print(f"   Main Dashboard: http://localhost:4000")
     print(f"   Signal Monitor: http://localhost:4000/monitor 📡")
     print(f"   API Endpoint: http://localhost:4000/api/nbai/chat")
-    print(f"   Library File: {ai_engine.library_file}")
+    print(f"   Readiness: http://localhost:4000/api/ready")
     print("\n💡 Features:")
     print("   • Interactive AI Chat Interface")
     print("   • Read-Only Signal Monitor (Home Base Feed)")
@@ -1755,6 +1647,8 @@ def main():
     print("\n📡 Open /monitor for real-time signal feed to home base!")
     print("═" * 60 + "\n")
     
+    # The engine loads while the server binds; API routes answer 503 until it is ready
+    engine_startup.start()
     app.run(host='0.0.0.0', port=4000, debug=False)
 
 if __name__ == '__main__':
@@ -22,8 +22,7 @@ SERVICES = [
         'port': 3000,
         'command': 'node server-universal.js',
         'type': 'node',
-        'critical': True,
-        'startup_delay': 0
+        'critical': True
     },
     {
         'name': 'API Server',
@@ -31,51 +30,49 @@ SERVICES = [
         'command': 'node server-universal.js',
         'cwd': 'api',
         'type': 'node',
-        'critical': True,
-        'startup_delay': 2
+        'critical': True
     },
     {
         'name': 'Audio Stream',
         'port': 3002,
         'command': 'node server-audio.js',
         'type': 'node',
-        'critical': False,
-        'startup_delay': 4
+        'critical': False
     },
     {
         'name': 'Mission Control',
         'port': 5000,
         'command': 'python nasa_home_base.py',
         'type': 'python',
-        'critical': True,
-        'startup_delay': 6
+        'critical': True
     },
     {
         'name': 'Network Map',
         'port': 6000,
         'command': 'python network_map_viewer.py',
         'type': 'python',
-        'critical': False,
-        'startup_delay': 8
+        'critical': False
     },
     {
         'name': 'Universal Launcher',
         'port': 7000,
         'command': 'python universal_launcher.py',
         'type': 'python',
-        'critical': False,
-        'startup_delay': 10
+        'critical': False
     },
     {
         'name': 'API Tracer',
         'port': 8000,
         'command': 'python api_tracer.py',
         'type': 'python',
-        'critical': False,
-        'startup_delay': 12
+        'critical': False
     }
 ]
 
+# Services are started together; each counts as up once its port accepts connections
+STARTUP_TIMEOUT = 30  # Seconds to wait for a port to bind
+PORT_POLL_INTERVAL = 0.1
+
 # Scheduled launch configuration
 LAUNCH_DATE = datetime(2026, 1, 17, 9, 0, 0)  # January 17, 2026 at 9:00 AM
 CONFIG_FILE = 'networkbuster_config.json'
@@ -149,7 +146,40 @@ class NetworkBusterManager:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             return s.connect_ex(('localhost', port)) == 0
     
-    def start_service(self, service):
+    def wait_for_ports(self, ports, timeout=STARTUP_TIMEOUT):
+        """Poll until each port accepts connections; returns {port: seconds to bind, None if it never did}"""
+        start = time.monotonic()
+        pending = set(ports)
+        bound = {port: None for port in ports}
+        while pending and time.monotonic() - start < timeout:
+            for port in list(pending):
+                if self.check_port(port):
+                    bound[port] = time.monotonic() - start
+                    pending.discard(port)
+            if pending:
+                time.sleep(PORT_POLL_INTERVAL)
+        return bound
+    
+    def spawn_service(self, service):
+        """Launch a service process without waiting for it"""
+        # Set working directory
+        cwd = service.get('cwd', os.getcwd())
+        if not os.path.isabs(cwd):
+            cwd = os.path.join(os.getcwd(), cwd)
+        
+        # Python services run with this interpreter (or the venv on Windows) from an
+        # argv list, so interpreter and repo paths with spaces need no quoting
+        cmd = service['command']
+        shell = service['type'] != 'python'
+        if not shell:
+            python = os.path.join(cwd, '.venv', 'Scripts', 'python.exe') if sys.platform == 'win32' else sys.executable
+            cmd = [python] + cmd.split()[1:]
+        
+        if sys.platform == 'win32':
+            return subprocess.Popen(cmd, shell=shell, cwd=cwd, creationflags=subprocess.CREATE_NEW_CONSOLE)
+        return subprocess.Popen(cmd, shell=shell, cwd=cwd)
+    
+    def start_service(self, service, wait=True):
         """Start a single service"""
         if service['name'] not in self.config['enabled_services']:
             print(f"⏭️  Skipping {service['name']} (disabled)")
@@ -162,57 +192,29 @@ class NetworkBusterManager:
             print(f"   ⚠️  Port {service['port']} already in use")
             return None
         
-        # Build command
-        if service['type'] == 'python':
-            cmd = f"python {service['command']}"
-            if sys.platform == 'win32':
-                cmd = f".venv\\Scripts\\python.exe {service['command']}"
-        else:
-            cmd = service['command']
-        
-        # Set working directory
-        cwd = service.get('cwd', os.getcwd())
-        if not os.path.isabs(cwd):
-            cwd = os.path.join(os.getcwd(), cwd)
-        
         try:
-            # Start process
-            if sys.platform == 'win32':
-                process = subprocess.Popen(
-                    cmd,
-                    shell=True,
-                    cwd=cwd,
-                    creationflags=subprocess.CREATE_NEW_CONSOLE
-                )
-            else:
-                process = subprocess.Popen(
-                    cmd,
-                    shell=True,
-                    cwd=cwd
-                )
-            
-            # Wait a bit for startup
-            time.sleep(2)
-            
-            # Verify it started
-            if self.check_port(service['port']):
-                print(f"   ✅ {service['name']} started successfully")
-                self.processes[service['name']] = {
-                    'process': process,
-                    'service': service,
-                    'started': datetime.now().isoformat()
-                }
-                return process
-            else:
-                print(f"   ❌ {service['name']} failed to start")
-                return None
-                
+            process = self.spawn_service(service)
         except Exception as e:
             print(f"   ❌ Error starting {service['name']}: {e}")
             return None
+        self.processes[service['name']] = {
+            'process': process,
+            'service': service,
+            'started': datetime.now().isoformat()
+        }
+        if not wait:
+            return process
+        
+        # Verify it started
+        elapsed = self.wait_for_ports([service['port']])[service['port']]
+        if elapsed is None:
+            print(f"   ❌ {service['name']} failed to start")
+            return None
+        print(f"   ✅ {service['name']} started successfully ({elapsed:.1f}s)")
+        return process
     
     def start_all_services(self):
-        """Start all services in order with max power production mode"""
+        """Start all services together with max power production mode"""
         print("""
 ╔════════════════════════════════════════════════════════════╗
 ║  NetworkBuster All-in-One Launch Manager                 ║
@@ -228,23 +230,28 @@ class NetworkBusterManager:
         started = 0
         failed = 0
         
+        # Launch everything at once, then wait on all ports together
+        launched = [service for service in SERVICES if self.start_service(service, wait=False)]
+        bind_times = self.wait_for_ports([service['port'] for service in launched])
+        startup_times = {}
+        
         for service in SERVICES:
-            # Apply startup delay
-            if service['startup_delay'] > 0:
-                time.sleep(service['startup_delay'])
-            
-            result = self.start_service(service)
-            
-            if result:
+            elapsed = bind_times.get(service['port']) if service in launched else None
+            if elapsed is not None:
                 started += 1
-            else:
-                failed += 1
-                if service['critical']:
-                    print(f"\n⚠️  Critical service {service['name']} failed to start!")
+                startup_times[service['name']] = round(elapsed, 2)
+                print(f"   ✅ {service['name']} listening on {service['port']} after {elapsed:.1f}s")
+                continue
+            failed += 1
+            if service in launched:
+                print(f"   ❌ {service['name']} did not bind port {service['port']} within {STARTUP_TIMEOUT}s")
+            if service['critical']:
+                print(f"\n⚠️  Critical service {service['name']} failed to start!")
         
         # Update config
         self.config['last_launch'] = datetime.now().isoformat()
         self.config['launch_count'] += 1
+        self.config['last_startup_seconds'] = startup_times
         self.save_config()
         
         # Summary
@@ -259,7 +266,6 @@ class NetworkBusterManager:
         # Open main dashboard
         if started > 0:
             print("\n🌐 Opening Universal Launcher dashboard...")
-            time.sleep(3)
             webbrowser.open('http://localhost:7000')
         
         return started, failed
@@ -0,0 +1,61 @@
+"""
+NetworkBuster - Shared Port State Snapshot
+One listening-socket scan per tick, shared by every service port check
+"""
+
+import threading
+import time
+import psutil
+
+# How long a snapshot stays valid before the socket table is walked again
+DEFAULT_TTL = 1.0
+
+
+class PortSnapshot:
+    """Port -> state index built from a single psutil.net_connections() pass"""
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._ports = {}
+        self._taken_at = 0.0
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        """Walk the kernel socket table once and index listening ports"""
+        ports = {}
+        for conn in psutil.net_connections(kind='inet'):
+            if conn.status == 'LISTEN' and conn.laddr:
+                ports[conn.laddr.port] = conn.status
+        return ports
+
+    def get_ports(self):
+        """Return the current port -> state dict, rescanning when stale"""
+        if time.monotonic() - self._taken_at < self.ttl:
+            return self._ports
+
+        # Only one thread rescans; the others wait and reuse its result
+        with self._lock:
+            if time.monotonic() - self._taken_at >= self.ttl:
+                self._ports = self._scan()
+                self._taken_at = time.monotonic()
+            return self._ports
+
+    def port_state(self, port):
+        """Get the state of a local port, or None if nothing is bound"""
+        return self.get_ports().get(port)
+
+    def is_listening(self, port):
+        """Check if a port is listening"""
+        return self.port_state(port) == 'LISTEN'
+
+    def invalidate(self):
+        """Force the next lookup to rescan"""
+        self._taken_at = 0.0
+
+    def age(self):
+        """Seconds since the last scan"""
+        return time.monotonic() - self._taken_at
+
+
+# Process-wide snapshot shared by all callers
+port_snapshot = PortSnapshot()
@@ -0,0 +1,129 @@
+"""
+NetworkBuster - Concurrent Probe Engine
+Bounded-parallel HTTP probing with per-host keep-alive pools and deadlines
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+MIN_PROBE_TIME = 0.25  # Probes with less time than this left before the deadline are skipped
+
+
+class ProbeDeadlineExceeded(Exception):
+    """Raised when a probe hits its service deadline instead of giving a real result
+
+    Either too little time was left to start it, or it timed out only
+    because the deadline cut its timeout short.
+    """
+
+
+class ProbeEngine:
+    """Runs probe sweeps on a worker pool so a sweep finishes within one timeout window"""
+
+    def __init__(self, max_workers=16, timeout=3.0, pool_size=4, service_deadlines=None,
+                 min_probe_time=MIN_PROBE_TIME):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.min_probe_time = min_probe_time
+        self.pool_size = pool_size
+        # Optional per-service deadline overrides (seconds from sweep start)
+        self.service_deadlines = service_deadlines or {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='probe')
+        self._executor_lock = threading.Lock()  # Held while swapping the pool or submitting to it
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def session_for(self, url):
+        """Get the keep-alive session for the host serving url"""
+        parts = urlsplit(url)
+        host_key = f"{parts.scheme}://{parts.netloc}"
+
+        session = self._sessions.get(host_key)
+        if session is None:
+            with self._sessions_lock:
+                session = self._sessions.get(host_key)
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount(host_key, adapter)
+                    self._sessions[host_key] = session
+        return session
+
+    def request(self, method, url, deadline=None):
+        """Send one probe, capping its timeout at the time left before deadline"""
+        timeout = self.timeout
+        capped = False
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining < self.min_probe_time:
+                raise ProbeDeadlineExceeded(f"Probe deadline exceeded before request to {url}")
+            if remaining < timeout:
+                timeout = remaining
+                capped = True
+        try:
+            return self.session_for(url).request(method, url, timeout=timeout)
+        except requests.Timeout:
+            if capped:
+                # Slow only against the shortened budget, not the real timeout
+                raise ProbeDeadlineExceeded(f"Probe to {url} cut short by its deadline") from None
+            raise
+
+    def deadline_for(self, service, sweep_start):
+        """Absolute monotonic deadline for a service's probes in this sweep"""
+        return sweep_start + self.service_deadlines.get(service, self.timeout)
+
+    def resize(self, max_workers):
+        """Swap in a worker pool of a different size; in-flight probes finish on the old one"""
+        with self._executor_lock:
+            if max_workers == self.max_workers:
+                return
+            old = self.executor
+            self.max_workers = max_workers
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='probe')
+            # Queued work still runs; nothing new can reach the old pool while the lock is held
+            old.shutdown(wait=False)
+
+    @staticmethod
+    def host_order(targets):
+        """Target indices round-robined across hosts so no single host hogs the workers"""
+        by_host = {}
+        for index, target in enumerate(targets):
+            by_host.setdefault(urlsplit(target[2]).netloc, []).append(index)
+        queues = list(by_host.values())
+        order = []
+        for i in range(max((len(q) for q in queues), default=0)):
+            order.extend(q[i] for q in queues if i < len(q))
+        return order
+
+    def sweep(self, targets, probe):
+        """Run probe(service, endpoint, base_url, *extra, deadline=...) for every target concurrently
+
+        targets is an iterable of (service, endpoint, base_url, *extra) tuples.
+        Submission is interleaved across hosts; results come back in target
+        order (None where a probe raised).
+        """
+        targets = list(targets)
+        sweep_start = time.monotonic()
+        futures = [None] * len(targets)
+        with self._executor_lock:
+            for index in self.host_order(targets):
+                target = targets[index]
+                futures[index] = self.executor.submit(probe, *target,
+                                                      deadline=self.deadline_for(target[0], sweep_start))
+        wait(futures)
+        return [f.result() if f.exception() is None else None for f in futures]
+
+    def close(self):
+        """Shut down the worker pool and drop pooled connections"""
+        with self._executor_lock:
+            self.executor.shutdown(wait=False)
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
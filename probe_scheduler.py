@@ -0,0 +1,184 @@
+"""
+NetworkBuster - Adaptive Probe Scheduler
+Per-endpoint probe intervals driven by endpoint health and latency variance
+"""
+
+import heapq
+import itertools
+import statistics
+import threading
+import time
+from collections import deque
+
+BASE_INTERVAL = 10.0  # New or recovered endpoints
+MIN_INTERVAL = 2.0  # Failing or erratic endpoints
+MAX_INTERVAL = 120.0  # Long-stable endpoints
+BACKOFF = 1.5  # Interval multiplier per stable probe (and divisor when erratic)
+STABLE_AFTER = 3  # Consecutive successes before backing off
+VARIANCE_WINDOW = 10  # Latency samples used for the variance check
+HIGH_VARIANCE_CV = 0.5  # Coefficient of variation that counts as erratic...
+MIN_ERRATIC_SPREAD_MS = 20.0  # ...when the standard deviation is also above this (ms-scale jitter is noise)
+PROBES_PER_SECOND = 20  # Global probe budget
+
+
+class _TargetState:
+    __slots__ = ('target', 'interval', 'next_due', 'successes', 'healthy',
+                 'latencies', 'generation', 'in_flight')
+
+    def __init__(self, target, interval, next_due):
+        self.target = target
+        self.interval = interval
+        self.next_due = next_due
+        self.successes = 0
+        self.healthy = None
+        self.latencies = deque(maxlen=VARIANCE_WINDOW)
+        self.generation = 0
+        self.in_flight = False
+
+    def latency_cv(self):
+        """Coefficient of variation of recent latencies, or None if too few"""
+        if len(self.latencies) < 3:
+            return None
+        mean = statistics.fmean(self.latencies)
+        return statistics.pstdev(self.latencies) / mean if mean else None
+
+    def erratic(self):
+        """Latency varies a lot relative to its mean and in absolute terms"""
+        cv = self.latency_cv()
+        return (cv is not None and cv > HIGH_VARIANCE_CV
+                and statistics.pstdev(self.latencies) > MIN_ERRATIC_SPREAD_MS)
+
+
+class ProbeScheduler:
+    """Priority queue of per-endpoint next-due times under a probes-per-second budget
+
+    Heap entries are (next_due, tiebreak, key, generation). Rescheduling
+    pushes a new entry and bumps the generation, so stale entries are
+    skipped when popped instead of being removed from the heap.
+    """
+
+    def __init__(self, base_interval=BASE_INTERVAL, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, probes_per_second=PROBES_PER_SECOND):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.probes_per_second = probes_per_second
+        self._heap = []
+        self._states = {}
+        self._tiebreak = itertools.count()
+        self._tokens = float(probes_per_second)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _push(self, key, state):
+        state.generation += 1
+        heapq.heappush(self._heap, (state.next_due, next(self._tiebreak), key, state.generation))
+
+    def sync(self, targets, now=None):
+        """Match the schedule to targets ({key: target}); new keys are due now"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for key in list(self._states):
+                if key not in targets:
+                    del self._states[key]
+            for key, target in targets.items():
+                state = self._states.get(key)
+                if state is None:
+                    state = _TargetState(target, self.base_interval, now)
+                    self._states[key] = state
+                    self._push(key, state)
+                else:
+                    state.target = target
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(float(self.probes_per_second), self._tokens + elapsed * self.probes_per_second)
+
+    def due(self, now=None):
+        """Pop due targets as [(key, target)], limited by the probe budget"""
+        now = time.monotonic() if now is None else now
+        ready = []
+        with self._lock:
+            self._refill(now)
+            while self._heap and self._heap[0][0] <= now and self._tokens >= 1:
+                _, _, key, generation = heapq.heappop(self._heap)
+                state = self._states.get(key)
+                if state is None or state.generation != generation or state.in_flight:
+                    continue  # Removed or rescheduled since this entry was pushed
+                state.in_flight = True
+                self._tokens -= 1
+                ready.append((key, state.target))
+        return ready
+
+    def report(self, key, trace_entry, now=None):
+        """Reschedule a target from its probe result (a trace_entry or None)"""
+        now = time.monotonic() if now is None else now
+        success = bool(trace_entry and trace_entry.get('success'))
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return None
+            state.in_flight = False
+
+            if not success:
+                # Failing: probe as often as allowed to catch recovery quickly
+                state.successes = 0
+                state.interval = self.min_interval
+            elif state.healthy is False:
+                # Just recovered: start over from the base cadence
+                state.successes = 1
+                state.latencies.clear()
+                state.interval = self.base_interval
+            else:
+                state.successes += 1
+                if trace_entry.get('response_time') is not None:
+                    state.latencies.append(trace_entry['response_time'])
+                if state.erratic():
+                    state.interval = max(self.min_interval, state.interval / BACKOFF)
+                elif state.successes >= STABLE_AFTER:
+                    state.interval = min(self.max_interval, state.interval * BACKOFF)
+
+            state.healthy = success
+            state.next_due = now + state.interval
+            self._push(key, state)
+            return state.interval
+
+    def release(self, key, now=None):
+        """Put back a target popped by due() that was not probed; its interval is unchanged"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or not state.in_flight:
+                return
+            state.in_flight = False
+            state.next_due = now + self.min_interval
+            self._push(key, state)
+
+    def seconds_until_next(self, max_wait=1.0, now=None):
+        """How long the loop can sleep before something is due"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self._heap:
+                return max_wait
+            wait = self._heap[0][0] - now
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) / self.probes_per_second)
+            return min(max(wait, 0.0), max_wait)
+
+    def snapshot(self, now=None):
+        """Current interval and time-to-next-probe for every target"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            schedule = {}
+            for key, state in self._states.items():
+                cv = state.latency_cv()
+                schedule[key] = {
+                    'interval': round(state.interval, 2),
+                    'next_probe_in': round(max(0.0, state.next_due - now), 2),
+                    'healthy': state.healthy,
+                    'consecutive_successes': state.successes,
+                    'latency_cv': round(cv, 3) if cv is not None else None,
+                    'in_flight': state.in_flight
+                }
+            return schedule
@@ -0,0 +1,66 @@
+"""
+NetworkBuster - Reply Cache
+LRU of chat replies keyed by (intent, background snapshot generation)
+"""
+
+import threading
+from collections import OrderedDict
+
+REPLY_CACHE_SIZE = 64
+
+
+class ReplyCache:
+    """Memoizes replies that depend only on the current scan snapshot
+
+    Entries are keyed by (intent, generation). The first lookup that sees a
+    newer generation drops everything built from older ones, so a reply is
+    never served across snapshots and the cache holds at most one
+    generation's worth of entries in practice.
+    """
+
+    def __init__(self, maxsize=REPLY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._generation = None
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get(self, intent, generation, compute):
+        """Cached value for (intent, generation), calling compute() on a miss"""
+        key = (intent, generation)
+        with self._lock:
+            if self._generation is None or generation > self._generation:
+                if self._entries:
+                    self._counters['invalidations'] += 1
+                    self._entries.clear()
+                self._generation = generation
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return value
+            self._counters['misses'] += 1
+
+        # Computed outside the lock; a concurrent miss just builds the same reply twice
+        value = compute()
+        with self._lock:
+            if generation >= self._generation:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current generation"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['generation'] = self._generation
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
@@ -0,0 +1,128 @@
+"""
+NetworkBuster - Reputation Series
+Bounded per-device reputation history: recent raw events plus hourly/daily rollups
+"""
+
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+RAW_EVENTS = 32  # Most recent raw events kept per device
+HOURLY_BUCKETS = 48  # Two days of hourly rollups
+DAILY_BUCKETS = 90  # Three months of daily rollups
+
+_COUNT = struct.Struct('<H')
+
+
+def _pack(columns):
+    """Length-prefixed concatenation of equal-length array columns"""
+    return _COUNT.pack(len(columns[0])) + b''.join(c.tobytes() for c in columns)
+
+
+def _unpack(blob, typecodes):
+    columns = [array(code) for code in typecodes]
+    if not blob:
+        return columns
+    (n,) = _COUNT.unpack_from(blob)
+    offset = _COUNT.size
+    for column in columns:
+        size = n * column.itemsize
+        column.frombytes(blob[offset:offset + size])
+        offset += size
+    return columns
+
+
+class _Rollup:
+    """Sparse time buckets as parallel arrays (bucket id, events, delta sum, min/max/last score)"""
+
+    TYPECODES = ('i', 'i', 'i', 'B', 'B', 'B')
+
+    def __init__(self, width, keep, blob=None):
+        self.width = width
+        self.keep = keep
+        self.ids, self.counts, self.deltas, self.mins, self.maxs, self.lasts = _unpack(blob, self.TYPECODES)
+
+    def record(self, ts, delta, score):
+        bucket = int(ts // self.width)
+        i = len(self.ids) - 1
+        if i < 0 or self.ids[i] != bucket:
+            # Normally appends; older events (e.g. during migration) insert in order
+            i = bisect_left(self.ids, bucket)
+            if i == len(self.ids) or self.ids[i] != bucket:
+                for column, value in zip(self.columns(), (bucket, 0, 0, score, score, score)):
+                    column.insert(i, value)
+        self.counts[i] += 1
+        self.deltas[i] += delta
+        self.mins[i] = min(self.mins[i], score)
+        self.maxs[i] = max(self.maxs[i], score)
+        if i == len(self.ids) - 1:
+            self.lasts[i] = score
+        self._trim()
+
+    def _trim(self):
+        cutoff = self.ids[-1] - self.keep
+        drop = bisect_left(self.ids, cutoff + 1)
+        if drop:
+            for column in self.columns():
+                del column[:drop]
+
+    def columns(self):
+        return (self.ids, self.counts, self.deltas, self.mins, self.maxs, self.lasts)
+
+    def to_blob(self):
+        return _pack(self.columns())
+
+    def buckets(self):
+        return [
+            {'start': datetime.fromtimestamp(bucket * self.width).isoformat(), 'events': count,
+             'score_change': delta, 'min_score': low, 'max_score': high, 'last_score': last}
+            for bucket, count, delta, low, high, last in zip(*self.columns())
+        ]
+
+
+class ReputationSeries:
+    """One device's reputation history in at most ~2.5 KB
+
+    Raw events are kept for the last RAW_EVENTS changes; everything is also
+    folded into hourly and daily buckets, so the stored size stops growing
+    once the windows fill however often the device is scored.
+    """
+
+    EVENT_TYPECODES = ('d', 'h', 'B', 'H')  # timestamp, score change, new score, event code
+
+    def __init__(self, events=None, hourly=None, daily=None):
+        self.timestamps, self.changes, self.scores, self.codes = _unpack(events, self.EVENT_TYPECODES)
+        self.hourly = _Rollup(3600, HOURLY_BUCKETS, hourly)
+        self.daily = _Rollup(86400, DAILY_BUCKETS, daily)
+
+    def record(self, ts, delta, new_score, code):
+        # Keep the raw events in time order even when folding in older data
+        i = len(self.timestamps)
+        if i and ts < self.timestamps[-1]:
+            i = bisect_left(self.timestamps, ts)
+        for column, value in zip((self.timestamps, self.changes, self.scores, self.codes),
+                                 (ts, delta, new_score, code)):
+            column.insert(i, value)
+        excess = len(self.timestamps) - RAW_EVENTS
+        if excess > 0:
+            for column in (self.timestamps, self.changes, self.scores, self.codes):
+                del column[:excess]
+        self.hourly.record(ts, delta, new_score)
+        self.daily.record(ts, delta, new_score)
+
+    def to_row(self):
+        """(events, hourly, daily) blobs for storage"""
+        return (_pack((self.timestamps, self.changes, self.scores, self.codes)),
+                self.hourly.to_blob(), self.daily.to_blob())
+
+    def history(self, event_names):
+        """Recent raw events in the legacy history shape"""
+        return [
+            {'timestamp': datetime.fromtimestamp(ts).isoformat(), 'event': event_names.get(code, ''),
+             'score_change': delta, 'new_score': score}
+            for ts, delta, score, code in zip(self.timestamps, self.changes, self.scores, self.codes)
+        ]
+
+    def trend(self):
+        return {'hourly': self.hourly.buckets(), 'daily': self.daily.buckets()}
@@ -0,0 +1,58 @@
+"""
+NetworkBuster - Route Manifest
+Publishes a Flask app's url_map at /api/routes for API tracer discovery
+"""
+
+import re
+
+from flask import jsonify, request
+
+MANIFEST_PATH = '/api/routes'
+
+# <converter(args):name> or <name> placeholders in a rule string
+RULE_PARAM = re.compile(r'<(?:(\w+)(?:\([^)]*\))?:)?(\w+)>')
+
+
+def rule_converters(app, rule):
+    """Converter class name for each argument of rule, from its rule string"""
+    converters = {}
+    for converter, name in RULE_PARAM.findall(rule.rule):
+        if name in rule.arguments:
+            converter_class = app.url_map.converters.get(converter or 'default')
+            converters[name] = converter_class.__name__ if converter_class else converter
+    return converters
+
+
+def list_routes(app):
+    """Describe every rule in the app's url_map"""
+    routes = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == 'static':
+            continue
+        view = app.view_functions.get(rule.endpoint)
+        doc = (view.__doc__ or '').strip() if view else ''
+        routes.append({
+            'path': rule.rule,
+            'methods': sorted(rule.methods - {'HEAD', 'OPTIONS'}),
+            'params': sorted(rule.arguments),
+            'converters': rule_converters(app, rule),
+            'description': doc.splitlines()[0] if doc else ''
+        })
+    return sorted(routes, key=lambda r: r['path'])
+
+
+def register_route_manifest(app, service_name):
+    """Add GET /api/routes; responses carry an ETag and honour If-None-Match"""
+    def route_manifest():
+        """Route manifest for endpoint discovery"""
+        routes = list_routes(app)
+        response = jsonify({
+            'service': service_name,
+            'framework': 'flask',
+            'routes': routes,
+            'count': len(routes)
+        })
+        response.add_etag()
+        return response.make_conditional(request)
+
+    app.add_url_rule(MANIFEST_PATH, 'route_manifest', route_manifest)
@@ -1,6 +1,7 @@
 import express from 'express';
 import path from 'path';
 import { fileURLToPath } from 'url';
+import { registerRouteManifest } from './lib/routeManifest.js';
 
 // Optional performance packages
 let compression = null;
@@ -226,6 +227,9 @@ app.get('/audio-lab', (req, res) => {
   res.send(htmlContent);
 });
 
+// Route manifest for API tracer endpoint discovery
+registerRouteManifest(app, 'audio_server');
+
 // 404 handler
 app.use((req, res) => {
   res.status(404).json({ error: 'Audio endpoint not found' });
@@ -2,6 +2,7 @@ import express from 'express';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import os from 'os';
+import { registerRouteManifest } from './lib/routeManifest.js';
 
 // Optional performance packages with fallbacks
 let compression = null;
@@ -340,6 +341,9 @@ app.get('/audio-lab', (req, res) => {
   res.redirect('http://localhost:3002/audio-lab');
 });
 
+// Route manifest for API tracer endpoint discovery
+registerRouteManifest(app, 'web_server');
+
 // 404 handler
 app.use((req, res) => {
   res.status(404).json({ error: 'Not found', path: req.path });
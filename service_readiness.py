@@ -0,0 +1,92 @@
+"""
+NetworkBuster - Service Readiness
+Deferred construction of heavy service state behind a readiness flag, so the port binds first
+"""
+
+import threading
+import time
+
+from flask import jsonify, request
+
+READY_PATH = '/api/ready'
+RETRY_AFTER = 1  # Seconds clients are told to wait while state is still loading
+
+
+class DeferredInit:
+    """Runs factory() once on a background thread and records when it finished
+
+    value holds the result once ready is set; error holds the exception if
+    the factory failed (ready stays unset then).
+    """
+
+    def __init__(self, factory, name):
+        self.factory = factory
+        self.name = name
+        self.value = None
+        self.error = None
+        self.ready = threading.Event()
+        self.created_at = time.monotonic()
+        self.started_at = None
+        self.ready_at = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Begin construction (idempotent)"""
+        if self.started_at is None:
+            with self._lock:
+                if self.started_at is None:
+                    self.started_at = time.monotonic()
+                    threading.Thread(target=self._run, daemon=True, name=self.name).start()
+        return self
+
+    def _run(self):
+        try:
+            self.value = self.factory()
+        except Exception as e:
+            self.error = e
+            print(f"❌ {self.name} failed to start: {e}")
+            return
+        self.ready_at = time.monotonic()
+        self.ready.set()
+
+    def wait(self, timeout=None):
+        """Start if needed and block until ready; returns the value (None on timeout or failure)"""
+        self.start()
+        self.ready.wait(timeout)
+        return self.value
+
+    def status(self):
+        """Readiness summary for health checks and startup tracking"""
+        status = {'service': self.name, 'ready': self.ready.is_set(), 'error': str(self.error) if self.error else None}
+        if self.ready_at is not None:
+            status['init_ms'] = round((self.ready_at - self.started_at) * 1000, 1)
+            status['ready_after_ms'] = round((self.ready_at - self.created_at) * 1000, 1)
+        return status
+
+
+def register_readiness(app, startup, exempt=()):
+    """Add GET /api/ready and answer 503 from every other endpoint until startup is ready
+
+    Endpoints named in exempt (page shells and the like) are served
+    straight away. The first request also starts construction if nothing
+    else has, so the app works under any WSGI server.
+    """
+    allowed = set(exempt) | {'readiness', 'route_manifest', 'static'}
+
+    @app.before_request
+    def require_ready():
+        if startup.ready.is_set() or request.endpoint in allowed or request.method == 'OPTIONS':
+            return None
+        startup.start()
+        response = jsonify(startup.status())
+        response.status_code = 503
+        response.headers['Retry-After'] = str(RETRY_AFTER)
+        return response
+
+    def readiness():
+        """Startup readiness (503 until heavy state has loaded)"""
+        startup.start()
+        status = startup.status()
+        return jsonify(status), 200 if status['ready'] else 503
+
+    app.add_url_rule(READY_PATH, 'readiness', readiness)
@@ -0,0 +1,182 @@
+"""
+NetworkBuster - Startup Profiler
+Import-time reports (-X importtime) and cold start to first HTTP 200 for every Python service
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(REPO_DIR, 'startup_times.jsonl')
+START_TIMEOUT = 60  # Seconds before a cold start counts as failed
+POLL_INTERVAL = 0.02
+
+# module, port, page shell path, readiness path (None when the page is the readiness signal)
+SERVICES = [
+    ('networkbuster_ai', 4000, '/', '/api/ready'),
+    ('nasa_home_base', 5000, '/', None),
+    ('network_map_viewer', 6000, '/', None),
+    ('universal_launcher', 7000, '/', None),
+    ('api_tracer', 8000, '/', None),
+]
+
+
+def parse_importtime(stderr, module):
+    """(total ms, [(cumulative ms, self ms, name)] for module's direct imports) from -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative_us) / 1000, int(self_us) / 1000, name.strip()))
+
+    # Children are printed before their parent: the module's direct imports are
+    # the depth-1 entries between the previous top-level import and the module
+    children = []
+    for depth, cumulative, own, name in entries:
+        if depth == 0:
+            if name == module:
+                return cumulative, sorted(children, reverse=True)
+            children = []
+        elif depth == 1:
+            children.append((cumulative, own, name))
+    return None, []
+
+
+def import_profile(module):
+    """Import module in a fresh interpreter under -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=REPO_DIR,
+                            capture_output=True, text=True, encoding='utf-8', errors='replace')
+    total, children = parse_importtime(result.stderr, module)
+    if total is None:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+    return total, children
+
+
+def port_free(port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        return s.connect_ex(('127.0.0.1', port)) != 0
+
+
+def first_200(url, deadline):
+    """Seconds on the monotonic clock when url first answered 200, or None by deadline"""
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.monotonic()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(POLL_INTERVAL)
+    return None
+
+
+def cold_start(module, port, page, ready_path, cwd):
+    """Start the service from nothing; ms until the page (and readiness, if any) first answer 200"""
+    if not port_free(port):
+        raise RuntimeError(f'port {port} already in use')
+    env = dict(os.environ, PYTHONPATH=REPO_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''),
+               PYTHONIOENCODING='utf-8')
+    start = time.monotonic()
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, f'{module}.py')], cwd=cwd, env=env,
+                               stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = start + START_TIMEOUT
+        page_at = first_200(f'http://127.0.0.1:{port}{page}', deadline)
+        ready_at = first_200(f'http://127.0.0.1:{port}{ready_path}', deadline) if ready_path and page_at else page_at
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    if page_at is None:
+        raise RuntimeError(f'no 200 from {page} within {START_TIMEOUT}s (exit code {process.returncode})')
+    return {
+        'first_200_ms': round((page_at - start) * 1000, 1),
+        'ready_ms': round((ready_at - start) * 1000, 1) if ready_at else None
+    }
+
+
+def load_previous(path):
+    """Last recorded run, or None"""
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+
+def delta(current, previous):
+    if current is None or previous is None:
+        return ''
+    return f" ({current - previous:+.0f})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NetworkBuster service startup profiler')
+    parser.add_argument('services', nargs='*', help='Service modules to profile (default: all)')
+    parser.add_argument('--imports-only', action='store_true', help='Skip the cold start measurement')
+    parser.add_argument('--top', type=int, default=8, help='Direct imports listed per service')
+    parser.add_argument('--cwd', help='Working directory for cold starts (default: a fresh temp dir per service)')
+    parser.add_argument('--history', default=HISTORY_FILE, help='JSON lines file runs are appended to')
+    args = parser.parse_args()
+
+    selected = [s for s in SERVICES if not args.services or s[0] in args.services]
+    previous = (load_previous(args.history) or {}).get('services', {})
+    run = {'timestamp': datetime.now().isoformat(), 'python': sys.version.split()[0], 'services': {}}
+
+    for module, port, page, ready_path in selected:
+        result = run['services'][module] = {}
+        before = previous.get(module, {})
+        print(f"\n{'=' * 60}\n  {module} (port {port})\n{'=' * 60}")
+        try:
+            total, children = import_profile(module)
+        except Exception as e:
+            print(f"  ❌ import failed: {e}")
+            result['error'] = str(e)
+            continue
+        result['import_ms'] = round(total, 1)
+        print(f"  import {total:8.1f} ms{delta(total, before.get('import_ms'))}")
+        for cumulative, own, name in children[:args.top]:
+            print(f"    {cumulative:8.1f} ms  {name}")
+
+        if args.imports_only:
+            continue
+        cwd = args.cwd or tempfile.mkdtemp(prefix=f'nb-{module}-')
+        try:
+            result.update(cold_start(module, port, page, ready_path, cwd))
+        except Exception as e:
+            print(f"  ❌ cold start: {e}")
+            result['error'] = str(e)
+            continue
+        finally:
+            if not args.cwd:
+                shutil.rmtree(cwd, ignore_errors=True)
+        print(f"  first 200 {result['first_200_ms']:8.1f} ms{delta(result['first_200_ms'], before.get('first_200_ms'))}")
+        if ready_path:
+            ready = result['ready_ms']
+            print(f"  {ready_path} {ready:8.1f} ms{delta(ready, before.get('ready_ms'))}" if ready
+                  else f"  {ready_path} not ready within {START_TIMEOUT}s")
+
+    with open(args.history, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run) + '\n')
+    print(f"\n📈 Recorded in {args.history}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+NetworkBuster - Static Page Assets
+HTML shells encoded once, served with strong ETags and precompressed gzip/brotli variants
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+
+from flask import Response, request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+MIN_COMPRESS_BYTES = 1024  # Smaller bodies go out as-is
+# Browsers revalidate on every load; an unchanged shell costs a 304 with no body
+CACHE_CONTROL = 'no-cache'
+
+
+class StaticAsset:
+    """A fixed response body with its compressed variants and their ETags
+
+    Each encoding is its own representation, so each gets its own strong
+    ETag (the identity digest plus an encoding suffix) and responses carry
+    Vary: Accept-Encoding.
+    """
+
+    def __init__(self, body, mimetype='text/html'):
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        self.mimetype = mimetype
+        self.variants = {'identity': (data, digest)}
+        if len(data) >= MIN_COMPRESS_BYTES:
+            self.variants['gzip'] = (gzip.compress(data, compresslevel=9, mtime=0), f'{digest}-gzip')
+            if BROTLI_AVAILABLE:
+                self.variants['br'] = (brotli.compress(data, quality=11), f'{digest}-br')
+        # Preferred first when the client accepts several at the same quality
+        self.encodings = [e for e in ('br', 'gzip') if e in self.variants]
+
+    def negotiate(self):
+        """Best encoding the current request accepts"""
+        return request.accept_encodings.best_match(self.encodings) or 'identity'
+
+    def response(self):
+        """Response for the current request: 304 on a matching If-None-Match"""
+        encoding = self.negotiate()
+        body, etag = self.variants[encoding]
+        response = Response(body, mimetype=self.mimetype)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+
+class FileAsset:
+    """StaticAsset loaded from a file, rebuilt only when its mtime changes"""
+
+    def __init__(self, path, mimetype='text/html'):
+        self.path = path
+        self.mimetype = mimetype
+        self._mtime = None
+        self._asset = None
+        self._lock = threading.Lock()
+
+    def asset(self):
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with open(self.path, 'rb') as f:
+                        self._asset = StaticAsset(f.read(), self.mimetype)
+                    self._mtime = mtime
+        return self._asset
+
+    def response(self):
+        return self.asset().response()
@@ -0,0 +1,178 @@
+"""
+NetworkBuster - Tracer Target Inventory
+Maps hosts to service templates so one tracer can probe many boxes
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+DEFAULT_HOST = 'localhost'
+
+
+class InventoryError(ValueError):
+    """Raised when an inventory file is missing, unparseable or inconsistent"""
+
+
+def target_key(host, service, path):
+    """Stable key for one probe target, e.g. 'lab-01/web_server:/health'"""
+    return f"{host}/{service}:{path}"
+
+
+def split_target_key(key):
+    """Inverse of target_key: (host, service, path)"""
+    host, _, rest = key.partition('/')
+    service, _, path = rest.partition(':')
+    return host, service, path
+
+
+def load_inventory_file(path):
+    """Parse a JSON or YAML inventory file into a dict"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if path.endswith(('.yaml', '.yml')):
+        if not YAML_AVAILABLE:
+            raise InventoryError(f"{path}: PyYAML is not installed (pip install pyyaml) - use JSON instead")
+        data = yaml.safe_load(text) or {}
+    else:
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise InventoryError(f"{path}: {e}") from e
+    if not isinstance(data, dict):
+        raise InventoryError(f"{path}: top level must be a mapping")
+    return data
+
+
+class TargetInventory:
+    """Hosts x service templates, reloadable from disk
+
+    Inventory file layout (JSON or YAML):
+
+        {
+          "hosts": {
+            "lab-01": {"address": "10.0.0.11", "tenant": "lab",
+                       "services": ["web_server", "api_server"],
+                       "ports": {"web_server": 3100}}
+          },
+          "services": {"extra_service": {"base_url": "http://localhost:9000", "endpoints": [...]}}
+        }
+
+    Service templates come from the tracer's API_ENDPOINTS; a template's
+    port and scheme are taken from its localhost base_url. Without a file
+    the inventory is the single local host running every template.
+    """
+
+    def __init__(self, templates, path=None, default_services=None):
+        self.base_templates = templates
+        self.path = path
+        self.default_services = default_services
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._templates = dict(templates)
+        self.loaded_at = None
+        self.last_error = None
+        try:
+            self.reload()
+        except InventoryError:
+            pass  # Running on the local fallback; last_error says why
+
+    def _local_inventory(self):
+        services = self.default_services or list(self.base_templates)
+        return {'hosts': {DEFAULT_HOST: {'address': DEFAULT_HOST, 'services': services}}}
+
+    def _build(self, data):
+        templates = dict(self.base_templates)
+        for name, template in (data.get('services') or {}).items():
+            if 'base_url' not in template or not isinstance(template.get('endpoints', []), list):
+                raise InventoryError(f"service '{name}' needs a base_url and an endpoints list")
+            templates[name] = {'base_url': template['base_url'], 'endpoints': template.get('endpoints', [])}
+
+        hosts = {}
+        for name, host in (data.get('hosts') or {}).items():
+            if '/' in name:
+                raise InventoryError(f"host name '{name}' may not contain '/'")
+            host = host or {}
+            services = host.get('services') or self.default_services or list(templates)
+            unknown = [s for s in services if s not in templates]
+            if unknown:
+                raise InventoryError(f"host '{name}' lists unknown services: {', '.join(unknown)}")
+            address = host.get('address', name)
+            ports = host.get('ports') or {}
+            base_urls = {}
+            for service in services:
+                parts = urlsplit(templates[service]['base_url'])
+                port = ports.get(service, parts.port)
+                base_urls[service] = f"{parts.scheme}://{address}" + (f":{port}" if port else '')
+            hosts[name] = {
+                'address': address,
+                'tenant': host.get('tenant'),
+                'services': base_urls
+            }
+        if not hosts:
+            raise InventoryError('inventory defines no hosts')
+        return hosts, templates
+
+    def reload(self):
+        """Re-read the inventory; on error the previous inventory stays active"""
+        try:
+            if self.path and os.path.exists(self.path):
+                data = load_inventory_file(self.path)
+            else:
+                data = self._local_inventory()
+            hosts, templates = self._build(data)
+        except (OSError, InventoryError) as e:
+            self.last_error = str(e)
+            if not self._hosts:
+                # First load failed: fall back to local so the tracer still runs
+                self._hosts, self._templates = self._build(self._local_inventory())
+                self.loaded_at = time.time()
+            raise InventoryError(str(e)) from e
+
+        with self._lock:
+            self._hosts = hosts
+            self._templates = templates
+            self.loaded_at = time.time()
+            self.last_error = None
+        return self.describe()
+
+    def templates(self):
+        """Service templates: API_ENDPOINTS plus services defined in the file"""
+        return self._templates
+
+    def hosts(self):
+        return self._hosts
+
+    def targets(self):
+        """[(host, service, base_url, tenant)] for every service instance"""
+        return [
+            (name, service, base_url, host['tenant'])
+            for name, host in self._hosts.items()
+            for service, base_url in host['services'].items()
+        ]
+
+    def first_base_urls(self):
+        """{service: base_url} using the first host that runs each service"""
+        base_urls = {}
+        for name, host in self._hosts.items():
+            for service, base_url in host['services'].items():
+                base_urls.setdefault(service, base_url)
+        return base_urls
+
+    def describe(self):
+        return {
+            'source': self.path if self.path and os.path.exists(self.path) else 'local',
+            'hosts': self._hosts,
+            'host_count': len(self._hosts),
+            'instance_count': sum(len(h['services']) for h in self._hosts.values()),
+            'loaded_at': self.loaded_at,
+            'last_error': self.last_error
+        }
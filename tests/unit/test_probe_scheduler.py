@@ -0,0 +1,44 @@
+"""
+NetworkBuster - Probe Scheduler Tests
+Interval adaptation for stable, noisy and erratic endpoints
+"""
+
+import os
+import random
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from probe_scheduler import MAX_INTERVAL, MIN_INTERVAL, ProbeScheduler  # noqa: E402
+
+
+def run_probes(latencies):
+    """Report one successful probe per latency; returns the final interval"""
+    scheduler = ProbeScheduler(probes_per_second=1000)
+    now = time.monotonic()  # The token bucket refills against the real clock
+    scheduler.sync({'key': 'target'}, now)
+    interval = None
+    for latency in latencies:
+        now += 1000  # Always due again
+        assert scheduler.due(now) == [('key', 'target')]
+        interval = scheduler.report('key', {'success': True, 'response_time': latency}, now)
+    return interval
+
+
+class ProbeSchedulerTest(unittest.TestCase):
+    def test_small_noisy_latencies_back_off(self):
+        # Localhost probes around 1 ms with scheduler jitter: CV well above 0.5
+        rng = random.Random(7)
+        latencies = [rng.choice((0.3, 0.8, 1.5, 4.0)) for _ in range(30)]
+        self.assertEqual(run_probes(latencies), MAX_INTERVAL)
+
+    def test_erratic_latencies_speed_up(self):
+        rng = random.Random(7)
+        latencies = [rng.choice((20.0, 80.0, 400.0)) for _ in range(30)]
+        self.assertEqual(run_probes(latencies), MIN_INTERVAL)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+NetworkBuster - Threat Scoring Engine
+Columnar connection snapshots with grouped per-device features and vectorized rules
+"""
+
+from connection_rate import RATE_WINDOW
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Pattern rules: (threshold, points)
+PORT_SCAN_PORTS = 10, 50  # More distinct local ports than this: port scanning
+SERIALIZATION_ATTEMPTS = 20, 40  # More connections than this in one scan
+CRITICAL_TARGETING = 3, 30  # More connections than this to critical services
+HIGH_ACTIVITY = 100, 20  # More new connections than this within the rate window
+
+CRITICAL_PORTS = (3000, 3001, 4000, 5000)
+
+BLOCK_SCORE = 70
+WARN_SCORE = 40
+
+STATUS_CODES = {}  # psutil status string -> small int, filled as seen
+
+
+def _status_code(status):
+    code = STATUS_CODES.get(status)
+    if code is None:
+        code = STATUS_CODES[status] = len(STATUS_CODES)
+    return code
+
+
+class ConnectionSnapshot:
+    """One scan's remote connections as parallel columns
+
+    ip_ids index into ips; with NumPy the columns are arrays, otherwise lists.
+    """
+
+    __slots__ = ('ips', 'ip_ids', 'local_ports', 'remote_ports', 'statuses', 'pids')
+
+    def __init__(self, ips, ip_ids, local_ports, remote_ports, statuses, pids):
+        self.ips = ips
+        self.ip_ids = ip_ids
+        self.local_ports = local_ports
+        self.remote_ports = remote_ports
+        self.statuses = statuses
+        self.pids = pids
+
+    @classmethod
+    def from_connections(cls, connections):
+        """Build from psutil.net_connections(), keeping only connections with a remote end"""
+        remote = [conn for conn in connections if conn.raddr]
+        ip_index = {}
+        ip_ids = [ip_index.setdefault(conn.raddr.ip, len(ip_index)) for conn in remote]
+        local_ports = [conn.laddr.port for conn in remote]
+        remote_ports = [conn.raddr.port for conn in remote]
+        statuses = [_status_code(conn.status) for conn in remote]
+        pids = [conn.pid or 0 for conn in remote]
+        if NUMPY_AVAILABLE:
+            return cls(list(ip_index), np.array(ip_ids, dtype=np.int32), np.array(local_ports, dtype=np.int32),
+                       np.array(remote_ports, dtype=np.int32), np.array(statuses, dtype=np.int8), np.array(pids, dtype=np.int32))
+        return cls(list(ip_index), ip_ids, local_ports, remote_ports, statuses, pids)
+
+    def __len__(self):
+        return len(self.ip_ids)
+
+
+class DeviceFeatures:
+    """Per-device features, indexed like snapshot.ips"""
+
+    __slots__ = ('ips', 'connections', 'unique_ports', 'critical', '_ports', '_offsets', '_keys', '_key_offsets')
+
+    def __init__(self, ips, connections, unique_ports, critical, ports, keys, offsets=None, key_offsets=None):
+        self.ips = ips
+        self.connections = connections
+        self.unique_ports = unique_ports
+        self.critical = critical
+        self._ports = ports
+        self._keys = keys
+        # With NumPy, ports and keys are sorted columns sliced per device
+        self._offsets = offsets
+        self._key_offsets = key_offsets
+
+    def ports(self, i):
+        """Distinct local ports device i connected to"""
+        if self._offsets is None:
+            return self._ports[i]
+        return set(self._ports[self._offsets[i]:self._offsets[i + 1]])
+
+    def connection_keys(self, i):
+        """Identity of each open connection of device i: local port << 16 | remote port"""
+        if self._key_offsets is None:
+            return self._keys[i]
+        return set(self._keys[self._key_offsets[i]:self._key_offsets[i + 1]])
+
+
+def device_features(snapshot):
+    """Group a snapshot by remote IP: connection count, distinct/critical ports"""
+    n = len(snapshot.ips)
+    if NUMPY_AVAILABLE:
+        ip_ids = snapshot.ip_ids
+        connections = np.bincount(ip_ids, minlength=n)
+        critical = np.bincount(ip_ids[np.isin(snapshot.local_ports, CRITICAL_PORTS)], minlength=n)
+        # Distinct (device, port) pairs, sorted by device
+        pairs = np.unique(ip_ids.astype(np.int64) << 16 | snapshot.local_ports)
+        unique_ports = np.bincount(pairs >> 16, minlength=n)
+        offsets = np.concatenate(([0], np.cumsum(unique_ports))).tolist()
+        # Distinct (device, local port, remote port) connections, sorted by device
+        keys = np.unique(ip_ids.astype(np.int64) << 32 | snapshot.local_ports.astype(np.int64) << 16
+                         | snapshot.remote_ports)
+        key_offsets = np.concatenate(([0], np.cumsum(np.bincount(keys >> 32, minlength=n)))).tolist()
+        return DeviceFeatures(snapshot.ips, connections, unique_ports, critical, (pairs & 0xFFFF).tolist(),
+                              (keys & 0xFFFFFFFF).tolist(), offsets, key_offsets)
+
+    connections = [0] * n
+    critical = [0] * n
+    ports = [set() for _ in range(n)]
+    keys = [set() for _ in range(n)]
+    critical_ports = set(CRITICAL_PORTS)
+    for ip_id, port, remote_port in zip(snapshot.ip_ids, snapshot.local_ports, snapshot.remote_ports):
+        connections[ip_id] += 1
+        ports[ip_id].add(port)
+        keys[ip_id].add(port << 16 | remote_port)
+        if port in critical_ports:
+            critical[ip_id] += 1
+    return DeviceFeatures(snapshot.ips, connections, [len(p) for p in ports], critical, ports, keys)
+
+
+def score_devices(features, rates):
+    """Threat score per device from the pattern rules (windowed rates aligned with ips)"""
+    if NUMPY_AVAILABLE:
+        recent = np.asarray(rates, dtype=np.int64)
+        return ((features.unique_ports > PORT_SCAN_PORTS[0]) * PORT_SCAN_PORTS[1]
+                + (features.connections > SERIALIZATION_ATTEMPTS[0]) * SERIALIZATION_ATTEMPTS[1]
+                + (features.critical > CRITICAL_TARGETING[0]) * CRITICAL_TARGETING[1]
+                + (recent > HIGH_ACTIVITY[0]) * HIGH_ACTIVITY[1])
+    return [
+        (unique > PORT_SCAN_PORTS[0]) * PORT_SCAN_PORTS[1]
+        + (conns > SERIALIZATION_ATTEMPTS[0]) * SERIALIZATION_ATTEMPTS[1]
+        + (crit > CRITICAL_TARGETING[0]) * CRITICAL_TARGETING[1]
+        + (rate > HIGH_ACTIVITY[0]) * HIGH_ACTIVITY[1]
+        for unique, conns, crit, rate in zip(features.unique_ports, features.connections,
+                                              features.critical, rates)
+    ]
+
+
+def flagged(scores, threshold=WARN_SCORE):
+    """Indices of devices scoring at least threshold"""
+    if NUMPY_AVAILABLE:
+        return np.flatnonzero(np.asarray(scores) >= threshold).tolist()
+    return [i for i, score in enumerate(scores) if score >= threshold]
+
+
+def threat_reasons(features, i, rate):
+    """Human-readable reasons for device i (only built for flagged devices)"""
+    unique = int(features.unique_ports[i])
+    conns = int(features.connections[i])
+    reasons = []
+    if unique > PORT_SCAN_PORTS[0]:
+        reasons.append(f"🔍 Port scanning: {unique} ports")
+    if conns > SERIALIZATION_ATTEMPTS[0]:
+        reasons.append(f"⚡ Serialization attack: {conns} attempts")
+    if features.critical[i] > CRITICAL_TARGETING[0]:
+        reasons.append("🎯 Critical service targeting")
+    if rate > HIGH_ACTIVITY[0]:
+        reasons.append(f"📊 High activity: {rate} new connections in {RATE_WINDOW // 60} min")
+    return reasons
+
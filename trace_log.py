@@ -0,0 +1,228 @@
+"""
+NetworkBuster - Persistent Trace Log
+Append-only, rotated JSON-lines segments with a sparse time index
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+
+DEFAULT_DIRECTORY = 'trace_logs'
+SEGMENT_SECONDS = 3600  # Rotate hourly...
+SEGMENT_BYTES = 16 * 1024 * 1024  # ...or at 16 MB, whichever comes first
+RETENTION_DAYS = 7
+INDEX_EVERY = 256  # One sparse index entry per this many lines
+
+
+def parse_time(value):
+    """Parse epoch seconds or an ISO-8601 string into epoch seconds"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(value).timestamp()
+
+
+class _Segment:
+    """One segment file plus its sparse (timestamp, byte offset) index"""
+
+    def __init__(self, directory, start):
+        self.start = start
+        base = os.path.join(directory, f"traces-{int(start * 1000)}")
+        self.path = base + '.jsonl'
+        self.index_path = base + '.idx'
+        self.index_ts = []
+        self.index_offsets = []
+        self.size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        self.lines = 0
+
+    def load_index(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r') as f:
+                for line in f:
+                    ts, offset = line.split()
+                    self.index_ts.append(float(ts))
+                    self.index_offsets.append(int(offset))
+        if not self.index_ts:
+            self.index_ts.append(self.start)
+            self.index_offsets.append(0)
+
+    def offset_for(self, since):
+        """Byte offset of the last indexed line at or before `since`"""
+        if since is None:
+            return 0
+        i = bisect_right(self.index_ts, since) - 1
+        return self.index_offsets[i] if i >= 0 else 0
+
+
+class TraceLog:
+    """Disk-backed trace history that survives restarts and stays off the heap
+
+    Each line is "<epoch seconds>\\t<trace json>", so time filtering never
+    has to decode JSON for lines outside the requested range.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, segment_seconds=SEGMENT_SECONDS,
+                 segment_bytes=SEGMENT_BYTES, retention_days=RETENTION_DAYS,
+                 index_every=INDEX_EVERY):
+        self.directory = directory
+        self.segment_seconds = segment_seconds
+        self.segment_bytes = segment_bytes
+        self.retention_seconds = retention_days * 86400
+        self.index_every = index_every
+        self._lock = threading.Lock()
+        self._segments = []
+        self._file = None
+        self._index_file = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_segments()
+
+    def _load_segments(self):
+        for path in glob.glob(os.path.join(self.directory, 'traces-*.jsonl')):
+            name = os.path.basename(path)
+            try:
+                start = int(name[len('traces-'):-len('.jsonl')]) / 1000
+            except ValueError:
+                continue
+            segment = _Segment(self.directory, start)
+            segment.load_index()
+            self._segments.append(segment)
+        self._segments.sort(key=lambda s: s.start)
+
+    def _open_segment(self, now):
+        self._close_files()
+        segment = _Segment(self.directory, now)
+        self._segments.append(segment)
+        self._file = open(segment.path, 'ab')
+        self._index_file = open(segment.index_path, 'a')
+        self._apply_retention(now)
+        return segment
+
+    def _close_files(self):
+        if self._file:
+            self._file.close()
+            self._index_file.close()
+            self._file = None
+            self._index_file = None
+
+    def _apply_retention(self, now):
+        """Delete segments whose newest possible entry is past retention"""
+        cutoff = now - self.retention_seconds
+        while len(self._segments) > 1 and self._segments[1].start < cutoff:
+            expired = self._segments.pop(0)
+            for path in (expired.path, expired.index_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def append(self, trace, ts=None):
+        """Append one trace to the active segment, rotating when due"""
+        payload = json.dumps(trace, separators=(',', ':'))
+
+        with self._lock:
+            # Stamped under the lock so lines are always in time order
+            ts = time.time() if ts is None else ts
+            line = f"{ts:.6f}\t{payload}\n".encode('utf-8')
+            segment = self._segments[-1] if self._file else None
+            if (segment is None
+                    or ts - segment.start >= self.segment_seconds
+                    or segment.size >= self.segment_bytes):
+                segment = self._open_segment(ts)
+
+            if segment.lines % self.index_every == 0:
+                segment.index_ts.append(ts)
+                segment.index_offsets.append(segment.size)
+                self._index_file.write(f"{ts:.6f} {segment.size}\n")
+
+            self._file.write(line)
+            segment.size += len(line)
+            segment.lines += 1
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+                self._index_file.flush()
+
+    def query(self, since=None, until=None, service=None, limit=1000):
+        """Traces between since and until (epoch seconds), oldest first
+
+        With a since bound the first `limit` matches after it are returned;
+        without one, the newest `limit` matches (segments are read newest
+        first, so old history is not scanned to answer a recent query).
+        """
+        if limit is not None and limit <= 0:
+            return []
+        with self._lock:
+            if self._file:
+                self._file.flush()
+            segments = list(self._segments)
+
+        if since is None and limit is not None:
+            newest = []
+            for segment in reversed(segments):
+                if until is not None and segment.start > until:
+                    continue
+                matches = deque(self._read(segment, None, until, service), maxlen=limit - len(newest))
+                newest[:0] = matches
+                if len(newest) >= limit:
+                    break
+            return newest
+
+        # Jump straight to the last segment that starts at or before `since`
+        first = 0
+        if since is not None:
+            first = max(0, bisect_right([s.start for s in segments], since) - 1)
+
+        results = []
+        for segment in segments[first:]:
+            if until is not None and segment.start > until:
+                break
+            for trace in self._read(segment, since, until, service):
+                results.append(trace)
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+    @staticmethod
+    def _read(segment, since, until, service):
+        """Matching traces from one segment, in time order"""
+        if not os.path.exists(segment.path):
+            return
+        with open(segment.path, 'rb') as f:
+            f.seek(segment.offset_for(since))
+            for line in f:
+                ts_text, _, payload = line.partition(b'\t')
+                try:
+                    ts = float(ts_text)
+                except ValueError:
+                    continue  # Torn write from a crash
+                if since is not None and ts < since:
+                    continue
+                if until is not None and ts > until:
+                    return
+                try:
+                    trace = json.loads(payload)
+                except ValueError:
+                    continue
+                if service is not None and trace.get('service') != service:
+                    continue
+                yield trace
+
+    def segment_info(self):
+        """Start time and size of each segment on disk"""
+        with self._lock:
+            return [
+                {'start': datetime.fromtimestamp(s.start).isoformat(), 'bytes': s.size, 'path': s.path}
+                for s in self._segments
+            ]
+
+    def close(self):
+        with self._lock:
+            self._close_files()
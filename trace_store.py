@@ -0,0 +1,134 @@
+"""
+NetworkBuster - Trace Store
+Fixed-capacity ring buffer of API traces with a per-service index
+"""
+
+import threading
+from collections import deque
+from itertools import islice
+
+DEFAULT_CAPACITY = 10000
+
+
+class TraceStore:
+    """Ring buffer of traces with O(1) eviction and O(k) per-service lookups
+
+    Every trace gets a monotonically increasing sequence number. The ring
+    slot for a trace is seq % capacity, and each service keeps a deque of
+    its live sequence numbers. Because sequence numbers only grow, the
+    trace being evicted is always the leftmost entry in its service deque.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._ring = [None] * capacity
+        self._next_seq = 0
+        self._first_seq = 0
+        self._by_service = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def __len__(self):
+        return self._next_seq - self.oldest_seq
+
+    @property
+    def oldest_seq(self):
+        """Sequence number of the oldest trace still held"""
+        return max(self._first_seq, self._next_seq - self.capacity)
+
+    @property
+    def next_seq(self):
+        """Sequence number the next appended trace will get"""
+        return self._next_seq
+
+    def append(self, trace):
+        """Store a trace, evicting the oldest one when full. Returns its seq."""
+        with self._lock:
+            seq = self._next_seq
+            slot = seq % self.capacity
+
+            evicted = self._ring[slot]
+            if evicted is not None:
+                service_seqs = self._by_service[evicted['service']]
+                service_seqs.popleft()
+                if not service_seqs:
+                    del self._by_service[evicted['service']]
+
+            self._ring[slot] = trace
+            self._by_service.setdefault(trace['service'], deque()).append(seq)
+            self._next_seq = seq + 1
+            self._changed.notify_all()
+            return seq
+
+    def _get(self, seq):
+        return self._ring[seq % self.capacity]
+
+    def tail(self, limit=None):
+        """Most recent traces, oldest first, plus the cursor for the next delta"""
+        with self._lock:
+            end = self._next_seq
+            start = self.oldest_seq
+            if limit is not None:
+                start = max(start, end - limit)
+            return [self._get(seq) for seq in range(start, end)], end
+
+    def recent(self, limit=None):
+        """Most recent traces, oldest first"""
+        return self.tail(limit)[0]
+
+    def _since(self, cursor, limit):
+        oldest = self.oldest_seq
+        # A cursor behind the ring (evicted/cleared) or ahead of it (server
+        # restarted) can't be resumed; the caller starts over from the oldest
+        reset = cursor < oldest or cursor > self._next_seq
+        start = oldest if reset else cursor
+        end = self._next_seq
+        if limit is not None:
+            end = min(end, start + max(limit, 0))
+        return [self._get(seq) for seq in range(start, end)], end, reset
+
+    def since(self, cursor, limit=None):
+        """Traces with seq >= cursor, oldest first
+
+        Returns (traces, next_cursor, reset).
+        """
+        with self._lock:
+            return self._since(cursor, limit)
+
+    def wait_since(self, cursor, timeout=None, limit=None):
+        """Like since(), but block up to timeout seconds for a new trace"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._next_seq != cursor, timeout)
+            return self._since(cursor, limit)
+
+    def recent_for_service(self, service, limit=None):
+        """Most recent traces for one service, oldest first"""
+        with self._lock:
+            service_seqs = self._by_service.get(service)
+            if not service_seqs:
+                return []
+            if limit is None:
+                return [self._get(seq) for seq in service_seqs]
+            newest = [self._get(seq) for seq in islice(reversed(service_seqs), max(limit, 0))]
+            newest.reverse()
+            return newest
+
+    def count_for_service(self, service):
+        """Number of stored traces for a service"""
+        service_seqs = self._by_service.get(service)
+        return len(service_seqs) if service_seqs else 0
+
+    def services(self):
+        """Services with at least one stored trace"""
+        with self._lock:
+            return list(self._by_service)
+
+    def clear(self):
+        """Drop all traces (sequence numbers keep counting up)"""
+        with self._lock:
+            self._ring = [None] * self.capacity
+            self._by_service = {}
+            self._first_seq = self._next_seq
+            self._changed.notify_all()
@@ -0,0 +1,144 @@
+"""
+NetworkBuster - Tracer Metrics
+Per-thread sharded call counters merged on read, plus one latency histogram per endpoint
+"""
+
+import threading
+import time
+
+from latency_histogram import WindowedLatency
+
+
+class _Shard:
+    """Counters owned by one writer thread
+
+    counters maps key -> (calls, success, failure, total_time). Only the
+    owning thread writes, and it replaces whole tuples, so a reader copying
+    the dict always sees each key's fields from the same update.
+    """
+
+    __slots__ = ('epoch', 'counters')
+
+    def __init__(self, epoch):
+        self.epoch = epoch
+        self.counters = {}
+
+
+class _KeyLatency:
+    """One endpoint's latency windows, shared by every writer thread"""
+
+    __slots__ = ('lock', 'windowed')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.windowed = WindowedLatency()
+
+
+class TracerMetrics:
+    """Per-endpoint call stats that probe threads update without a shared lock
+
+    Each writer thread gets its own shard of counter tuples on first use.
+    Readers copy every shard and merge, so neither side ever waits on the
+    other. Latency windows are far larger than counters, so each key has
+    one set shared by all threads behind a per-key lock: memory and the
+    cost of a snapshot grow with keys, not keys x threads. reset() bumps
+    an epoch; shards from an older epoch are ignored by readers and wiped
+    by their owner on its next write.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._latency = {}  # key -> _KeyLatency
+        self._registry_lock = threading.Lock()  # Only taken when a thread or key first records
+        self._epoch = 0
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard(self._epoch)
+            self._local.shard = shard
+            with self._registry_lock:
+                self._shards.append(shard)
+        epoch = self._epoch
+        if shard.epoch != epoch:
+            # Replace the data before publishing the new epoch
+            shard.counters = {}
+            shard.epoch = epoch
+        return shard
+
+    def _key_latency(self, key):
+        latency = self._latency.get(key)
+        if latency is None:
+            with self._registry_lock:
+                latency = self._latency.get(key)
+                if latency is None:
+                    latency = self._latency[key] = _KeyLatency()
+        return latency
+
+    def record(self, key, success, response_time=None, now=None):
+        """Count one probe of key; response_time in ms feeds the latency windows"""
+        shard = self._shard()
+        calls, ok, failed, total_time = shard.counters.get(key, (0, 0, 0, 0.0))
+        if success:
+            ok += 1
+        else:
+            failed += 1
+        if response_time is not None:
+            total_time += response_time
+            latency = self._key_latency(key)
+            with latency.lock:
+                latency.windowed.record(response_time, now)
+        shard.counters[key] = (calls + 1, ok, failed, total_time)
+
+    def _live_shards(self):
+        epoch = self._epoch
+        with self._registry_lock:
+            shards = list(self._shards)
+        return [s for s in shards if s.epoch == epoch]
+
+    def snapshot(self, now=None):
+        """Merged {key: {calls, success, failure, avg_time, total_time, latency}}"""
+        now = time.time() if now is None else now
+        totals = {}
+        for shard in self._live_shards():
+            for key, (calls, ok, failed, total_time) in shard.counters.copy().items():
+                merged = totals.get(key, (0, 0, 0, 0.0))
+                totals[key] = (merged[0] + calls, merged[1] + ok, merged[2] + failed, merged[3] + total_time)
+        latencies = self._latency.copy()
+
+        snapshot = {}
+        for key, (calls, ok, failed, total_time) in totals.items():
+            snapshot[key] = {
+                'calls': calls,
+                'success': ok,
+                'failure': failed,
+                'avg_time': round(total_time / calls, 2) if calls else 0,
+                'total_time': total_time
+            }
+            latency = latencies.get(key)
+            if latency is not None:
+                with latency.lock:
+                    snapshot[key]['latency'] = latency.windowed.summary(now)
+        return snapshot
+
+    def reset(self):
+        """Drop all counts; writers start fresh shards on their next record"""
+        with self._registry_lock:
+            self._epoch += 1
+            self._latency = {}
+
+    def shard_count(self):
+        return len(self._live_shards())
+
+
+def rollup(snapshot, group_of):
+    """Sum a snapshot's call counts by group_of(key), e.g. per host or per service"""
+    groups = {}
+    for key, values in snapshot.items():
+        group = groups.setdefault(group_of(key), {'calls': 0, 'success': 0, 'failure': 0, 'total_time': 0.0})
+        for field in ('calls', 'success', 'failure', 'total_time'):
+            group[field] += values[field]
+    for group in groups.values():
+        group['avg_time'] = round(group['total_time'] / group['calls'], 2) if group['calls'] else 0
+    return groups
@@ -0,0 +1,112 @@
+"""
+NetworkBuster - TTL Cache
+Per-key expiry with single-flight misses and optional stale-while-revalidate
+"""
+
+import threading
+import time
+
+DEFAULT_TTL = 5.0
+
+
+class _Entry:
+    __slots__ = ('value', 'expires', 'stale_until')
+
+    def __init__(self, value, expires, stale_until):
+        self.value = value
+        self.expires = expires
+        self.stale_until = stale_until
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on"""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """Small thread-safe cache for expensive, shared lookups
+
+    Each key has its own expiry. When several threads miss the same key at
+    once, only the first computes and the rest wait for its result. With a
+    stale_ttl, an expired value is still served for that long while one
+    background thread refreshes it.
+    """
+
+    def __init__(self, default_ttl=DEFAULT_TTL):
+        self.default_ttl = default_ttl
+        self._entries = {}
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stale_hits': 0, 'coalesced': 0, 'errors': 0}
+
+    def get(self, key, compute, ttl=None, stale_ttl=0):
+        """Cached value for key, calling compute() at most once per expiry"""
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.monotonic()
+        leader = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires:
+                self._counters['hits'] += 1
+                return entry.value
+            flight = self._flights.get(key)
+            if entry is not None and now < entry.stale_until:
+                # Serve stale; start one background refresh unless one is running
+                self._counters['stale_hits'] += 1
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    threading.Thread(target=self._fill, args=(key, flight, compute, ttl, stale_ttl),
+                                     daemon=True, name=f'cache-refresh-{key}').start()
+                return entry.value
+            if flight is None:
+                self._counters['misses'] += 1
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                self._counters['coalesced'] += 1
+
+        if leader:
+            self._fill(key, flight, compute, ttl, stale_ttl)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _fill(self, key, flight, compute, ttl, stale_ttl):
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+        with self._lock:
+            if flight.error is None:
+                now = time.monotonic()
+                self._entries[key] = _Entry(flight.value, now + ttl, now + ttl + stale_ttl)
+            else:
+                self._counters['errors'] += 1
+            del self._flights[key]
+        flight.done.set()
+
+    def invalidate(self, key=None):
+        """Drop one key (or everything); in-flight computations still complete"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Hit/miss counters and the keys currently cached"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['keys'] = len(self._entries)
+            stats['in_flight'] = len(self._flights)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_rate'] = round((stats['hits'] + stats['stale_hits']) / lookups, 3) if lookups else 0.0
+        return stats
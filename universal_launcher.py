@@ -3,13 +3,16 @@ NetworkBuster - Universal Tool Launcher
 Unix-style dashboard for all services and tools
 """
 
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, jsonify
 import subprocess
-import psutil
 import socket
 from datetime import datetime
+from port_snapshot import port_snapshot
+from route_manifest import register_route_manifest
+from static_assets import StaticAsset
 
 app = Flask(__name__)
+register_route_manifest(app, 'universal_launcher')
 
 # Define all tools and services
 TOOLS = {
@@ -44,10 +47,7 @@ TOOLS = {
 
 def check_port(port):
     """Check if a port is listening"""
-    for conn in psutil.net_connections():
-        if conn.laddr.port == port and conn.status == 'LISTEN':
-            return True
-    return False
+    return port_snapshot.is_listening(port)
 
 def get_all_statuses():
     """Get status of all services"""
@@ -659,9 +659,11 @@ DASHBOARD_HTML = """
 </html>
 """
 
+DASHBOARD_PAGE = StaticAsset(DASHBOARD_HTML)
+
 @app.route('/')
 def index():
-    return render_template_string(DASHBOARD_HTML)
+    return DASHBOARD_PAGE.response()
 
 @app.route('/api/status')
 def api_status():